@@ -1,4 +1,5 @@
 import json
+import logging
 import os
 import subprocess
 import sys
@@ -11,9 +12,15 @@ from typing_extensions import Any
 import evaluation.evaluation
 import evaluation.extract_gt_methods
 import evaluation.pdb_parser
+import evaluation.pdb_reader
+import evaluation.procedure_index
 import evaluation.results.generate_result_tables
 from parseconfig import Config, Isa, parseconfig
+from postgame.demangle import Demangler
+from postgame.live_traces import BATCH_SIZE, replay
+from postgame.merge_traces import merge_traces
 from postgame.postgame import Postgame
+from postgame.query_service import QueryService, serve
 
 APP = Typer(pretty_exceptions_show_locals=False)
 SCRIPT_PATH = Path(__file__).parent.absolute()
@@ -115,43 +122,90 @@ def game():
 
 
 @APP.command()
-def postgame():
+def postgame(incremental: bool = False, live: Path | None = None):
+    """
+    Analyze the object traces. If --incremental, fold them into the traces of
+    earlier runs saved in postgame_state_path and analyze all of them. If
+    --live, read the traces from a FIFO or Unix socket while the game runs. The
+    pintool can only write to a FIFO, passed as its -object-traces.
+    """
     assert cfg is not None
 
-    Postgame(cfg).main()
+    Postgame(cfg).main(incremental, live)
     evaluation.evaluation.main(cfg)
 
 
 @APP.command()
-def demangle_all_names():
+def merge_runs(runs: list[Path], output: Path | None = None):
+    """
+    Merge the object traces and name maps of several game runs into --output
+    (object_traces_path by default), deduplicating traces across runs.
+    """
     assert cfg is not None
+    merge_traces(runs, output or cfg.object_traces_path)
+
 
-    demangled_method_candidates: dict[str, str] = dict()
+@APP.command()
+def replay_traces(
+    target: Path,
+    traces: Path | None = None,
+    delay: float = 0.0,
+    batch_size: int = BATCH_SIZE,
+):
+    """
+    Replay recorded object traces (object_traces_path by default) into the FIFO
+    or Unix socket of a live postgame, --delay seconds apart, then rewrite
+    blacklisted_methods_path as the pintool does when the game exits.
+    """
+    assert cfg is not None
+    replay(
+        traces or cfg.object_traces_path,
+        target,
+        cfg.blacklisted_methods_path,
+        delay,
+        batch_size,
+    )
+
+
+@APP.command()
+def serve_queries(socket: Path):
+    """
+    Answer queries about the results of the configured analyses on a Unix
+    socket (see postgame.query_service). Analyses are named after their base
+    directories.
+    """
+    configs = [cfg] if cfg is not None else cfgs
+    service = QueryService({x.base_directory.name: x.results_json for x in configs})
+    serve(socket, service)
+
+
+@APP.command()
+def demangle_all_names():
+    assert cfg is not None
 
     ot_name_map_path = cfg.object_traces_path.with_name(
         cfg.object_traces_path.name + "-name-map"
     )
 
+    entries: list[tuple[str, str]] = []
     for line in ot_name_map_path.open():
-        line = line.split(" ", 2)
-        try:
-            res = subprocess.run(["undname", line[1].strip()], capture_output=True)
-            stdout = str(res.stdout, "UTF-8")
-            undecorated = stdout.splitlines()[4].split(":-", 2)[1][2:-1]
-            demangled_method_candidates[line[0].strip()] = undecorated
-        except FileNotFoundError:
-            print("undname failed")
-            return
+        addr, name = line.strip().split(" ", 1)
+        entries.append((addr, name))
+
+    demangler = Demangler()
+    demangled = demangler.demangle_all(name for _, name in entries)
+    demangler.save()
 
     with ot_name_map_path.open("w") as f:
-        for addr, method in demangled_method_candidates.items():
-            f.write(addr + " " + method + "\n")
+        for addr, name in entries:
+            f.write(addr + " " + demangled[name] + "\n")
 
 
 @APP.command()
-def eval():
+def eval(reference: bool = False):
+    """Evaluate the results, using the reference evaluation if --reference."""
     assert cfg is not None
-    evaluation.evaluation.main(cfg)
+    evaluation.evaluation.main(cfg, reference)
 
 
 @APP.command()
@@ -166,9 +220,63 @@ def independent_evaluation(
 
 
 @APP.command()
-def pdb_parser():
+def pdb_parser(workers: int = 1, cache: bool = True):
+    """
+    Generate the ground truth, parsing type records in --workers processes.
+    Unless --no-cache, the parsed dump is cached in pdb_cache_dir.
+    """
     assert cfg is not None
-    evaluation.pdb_parser.main(cfg.dump_file, cfg.gt_results_json)
+    evaluation.pdb_parser.main(
+        cfg.dump_file,
+        cfg.gt_results_json,
+        workers,
+        cfg.pdb_cache_dir if cache else None,
+    )
+
+
+@APP.command()
+def pdb_reader(cache: bool = True):
+    """
+    Generate the ground truth by reading the PDB directly, without cvdump.
+    Unless --no-cache, the parsed PDB is cached in pdb_cache_dir.
+    """
+    assert cfg is not None
+    evaluation.pdb_reader.main(
+        cfg.pdb_file,
+        cfg.gt_results_json,
+        cfg.pdb_cache_dir if cache else None,
+    )
+
+
+@APP.command()
+def annotate_traces(from_pdb: bool = False, output: Path | None = None):
+    """
+    Annotate object-traces addresses with the names of the PDB procedures
+    containing them, reading the dump or, if --from-pdb, the PDB itself. Writes
+    to --output or stdout.
+    """
+    assert cfg is not None
+
+    dump_file = cfg.dump_file
+    pdb_file = cfg.pdb_file
+    if from_pdb:
+        parser = evaluation.pdb_parser.load_pdb_parser(
+            pdb_file,
+            lambda: evaluation.pdb_reader.read_pdb(pdb_file),
+            cfg.pdb_cache_dir,
+        )
+    else:
+        parser = evaluation.pdb_parser.load_pdb_parser(
+            dump_file,
+            lambda: evaluation.pdb_parser.PdbParser.model_validate_dumpfile(dump_file),
+            cfg.pdb_cache_dir,
+        )
+
+    if output is None:
+        evaluation.procedure_index.main(parser, cfg.object_traces_path, sys.stdout)
+    else:
+        with output.open("w") as f:
+            evaluation.procedure_index.main(parser, cfg.object_traces_path, f)
 
 
 @APP.command()
@@ -222,6 +330,8 @@ def run_pipeline_after_game():
 @APP.callback()
 def main(config: Path, test: str = ""):
     global cfg
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     if test != "":
         cfg = parseconfig(config, test)
     else:
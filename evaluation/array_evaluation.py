@@ -0,0 +1,299 @@
+"""
+Evaluation metrics computed over integer arrays.
+
+AnalysisResults are converted once into a MethodTable (one row per class
+method holding the method's address, class id and type code) and every metric
+in evaluation.py is computed from NumPy set operations over those arrays. The
+pydantic-based functions in evaluation.py remain the reference implementation;
+both produce identical EvaluationResults.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import numpy.typing as npt
+
+from evaluation.evaluation_data import EvaluationResult, EvaluationResults
+from postgame import analysis_results as ar
+from postgame.analysis_results import MethodType
+
+TYPE_CODES: dict[str, int] = {t: i for i, t in enumerate(MethodType)}
+
+IntArray = npt.NDArray[np.int64]
+
+
+@dataclass
+class MethodTable:
+    """
+    AnalysisResults flattened into parallel arrays with one row per distinct
+    (class, method address) pair. Classes are identified by their position in
+    the structures dict; classes without methods have no rows but still have
+    an id so parent lookups by name work.
+    """
+
+    addrs: IntArray
+    cls_ids: IntArray
+    types: IntArray
+    cls_names: list[str]
+    cls_demangled_names: list[str]
+    cls_parents: list[list[str]]
+
+    @classmethod
+    def from_analysis_results(cls, analysis_results: ar.AnalysisResults) -> MethodTable:
+        addrs: list[int] = []
+        cls_ids: list[int] = []
+        types: list[int] = []
+        cls_names: list[str] = []
+        cls_demangled_names: list[str] = []
+        cls_parents: list[list[str]] = []
+
+        for cls_id, structure in enumerate(analysis_results.structures.values()):
+            cls_names.append(structure.name)
+            cls_demangled_names.append(structure.demangled_name)
+            cls_parents.append(
+                [x.struc for x in structure.members.values() if x.parent]
+            )
+            for method in structure.methods.values():
+                addrs.append(int(method.ea, 16))
+                cls_ids.append(cls_id)
+                types.append(TYPE_CODES[method.type])
+
+        return cls(
+            np.array(addrs, dtype=np.int64),
+            np.array(cls_ids, dtype=np.int64),
+            np.array(types, dtype=np.int64),
+            cls_names,
+            cls_demangled_names,
+            cls_parents,
+        ).deduplicated()
+
+    def deduplicated(self) -> MethodTable:
+        """Drop rows repeating a (class, address) pair, keeping the first."""
+        if len(self.addrs) == 0:
+            return self
+        order = np.lexsort((self.addrs, self.cls_ids))
+        cls_ids = self.cls_ids[order]
+        addrs = self.addrs[order]
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = (cls_ids[1:] != cls_ids[:-1]) | (addrs[1:] != addrs[:-1])
+        keep = np.sort(order[first])
+        return self.select(keep)
+
+    def select(
+        self, rows: npt.NDArray[np.int64] | npt.NDArray[np.bool_]
+    ) -> MethodTable:
+        """A table containing only the given rows (indices or boolean mask)."""
+        return MethodTable(
+            self.addrs[rows],
+            self.cls_ids[rows],
+            self.types[rows],
+            self.cls_names,
+            self.cls_demangled_names,
+            self.cls_parents,
+        )
+
+    def restricted_to(self, addrs: IntArray) -> MethodTable:
+        """
+        View of the table containing only methods whose address is in addrs.
+        Classes left without methods count as empty, the same as
+        evaluation.get_gt_analysis_results_instrumented removing them.
+        """
+        return self.select(np.isin(self.addrs, addrs))
+
+    def method_addrs(self, type_to_match: str | None = None) -> IntArray:
+        """Sorted unique addresses of methods with the given type (or all)."""
+        if type_to_match is None:
+            return np.unique(self.addrs)
+        return np.unique(self.addrs[self.types == TYPE_CODES[type_to_match]])
+
+    def class_sizes(self) -> IntArray:
+        """Number of distinct methods of each class, indexed by class id."""
+        return np.bincount(self.cls_ids, minlength=len(self.cls_names))
+
+    def nonempty_class_ids(self) -> IntArray:
+        return np.flatnonzero(self.class_sizes())
+
+
+def get_gt_methods_instrumented_array(
+    gt_methods_instrumented_path: Path,
+    base_addr: int,
+) -> IntArray:
+    """
+    Same as evaluation.get_gt_methods_instrumented_set, as a sorted array of
+    absolute addresses.
+    """
+    with gt_methods_instrumented_path.open() as f:
+        addrs = [int(line, 16) + base_addr for line in f if line.strip() != ""]
+    return np.unique(np.array(addrs, dtype=np.int64))
+
+
+def _result(tp: int, gt_size: int, gen_size: int) -> EvaluationResult:
+    return EvaluationResult(
+        true_positives=int(tp),
+        false_positives=int(gen_size - tp),
+        false_negatives=int(gt_size - tp),
+    )
+
+
+def _intersection_size(a: IntArray, b: IntArray) -> int:
+    return len(np.intersect1d(a, b, assume_unique=True))
+
+
+class ArrayEvaluation:
+    """
+    All metrics comparing one ground truth table with one generated table. The
+    gen <-> gt class matching is computed once and shared by every metric.
+    """
+
+    def __init__(self, gt: MethodTable, gen: MethodTable):
+        self.gt = gt
+        self.gen = gen
+
+        self.gt_class_sizes = gt.class_sizes()
+        self.gen_class_sizes = gen.class_sizes()
+
+        self.matched_classes, self.matched_intersections = self.__match_classes()
+
+    def __class_order(self, table: MethodTable) -> list[int]:
+        # Same order as match_gen_to_gt_classes: reverse demangled name, ties
+        # in structure order.
+        return sorted(
+            table.nonempty_class_ids().tolist(),
+            key=lambda x: table.cls_demangled_names[x],
+            reverse=True,
+        )
+
+    def __match_classes(self) -> tuple[list[tuple[int, int]], list[int]]:
+        """
+        Greedy matching of evaluation.match_gen_to_gt_classes. Returns the
+        matched (gen class id, gt class id) pairs and their method set
+        intersection sizes.
+        """
+        gt_order = self.__class_order(self.gt)
+        gen_order = self.__class_order(self.gen)
+
+        gt_rank = np.zeros(len(self.gt.cls_names), dtype=np.int64)
+        gt_rank[gt_order] = np.arange(len(gt_order))
+        gen_rank = np.zeros(len(self.gen.cls_names), dtype=np.int64)
+        gen_rank[gen_order] = np.arange(len(gen_order))
+
+        # Join gen rows with gt rows of the same address, producing one
+        # (gen rank, gt rank) pair per shared method.
+        gt_sort = np.argsort(self.gt.addrs, kind="stable")
+        gt_addrs = self.gt.addrs[gt_sort]
+        gt_ranks = gt_rank[self.gt.cls_ids[gt_sort]]
+
+        lo = np.searchsorted(gt_addrs, self.gen.addrs, side="left")
+        hi = np.searchsorted(gt_addrs, self.gen.addrs, side="right")
+        counts = hi - lo
+        total = int(counts.sum())
+        starts = np.repeat(lo - (np.cumsum(counts) - counts), counts)
+        gt_rows = starts + np.arange(total)
+
+        pair_gen = np.repeat(gen_rank[self.gen.cls_ids], counts)
+        pair_gt = gt_ranks[gt_rows]
+
+        # Intersection size of every (gen, gt) class pair sharing methods.
+        n_gt = max(len(gt_order), 1)
+        pairs, sizes = np.unique(pair_gen * n_gt + pair_gt, return_counts=True)
+        pair_gen = pairs // n_gt
+        pair_gt = pairs % n_gt
+
+        # Candidates of each gen class, best first: largest intersection, then
+        # first gt class in sorted order.
+        order = np.lexsort((pair_gt, -sizes, pair_gen))
+        pair_gen = pair_gen[order].tolist()
+        pair_gt = pair_gt[order].tolist()
+        sizes = sizes[order].tolist()
+
+        matched: list[tuple[int, int]] = []
+        intersections: list[int] = []
+        referenced: set[int] = set()
+
+        i = 0
+        while i < len(pair_gen):
+            gen = pair_gen[i]
+            while i < len(pair_gen) and pair_gen[i] == gen:
+                if pair_gt[i] not in referenced:
+                    referenced.add(pair_gt[i])
+                    matched.append((gen_order[gen], gt_order[pair_gt[i]]))
+                    intersections.append(sizes[i])
+                    break
+                i += 1
+            while i < len(pair_gen) and pair_gen[i] == gen:
+                i += 1
+
+        return matched, intersections
+
+    def methods_assigned_correct_class(self) -> EvaluationResult:
+        tp = sum(self.matched_intersections)
+        gen_size = sum(self.gen_class_sizes[x].item() for x, _ in self.matched_classes)
+        gt_size = sum(self.gt_class_sizes[x].item() for _, x in self.matched_classes)
+        return _result(tp, gt_size, gen_size)
+
+    def classes(self) -> EvaluationResult:
+        return _result(
+            len(self.matched_classes),
+            np.count_nonzero(self.gt_class_sizes),
+            np.count_nonzero(self.gen_class_sizes),
+        )
+
+    def methods(self, type_to_match: str | None = None) -> EvaluationResult:
+        gt_addrs = self.gt.method_addrs(type_to_match)
+        gen_addrs = self.gen.method_addrs(type_to_match)
+        return _result(
+            _intersection_size(gt_addrs, gen_addrs),
+            len(gt_addrs),
+            len(gen_addrs),
+        )
+
+    def class_graph_edges(self) -> EvaluationResult:
+        # Only names looked up as parents must have a single matched class.
+        gen_name_to_gt_names: dict[str, list[str]] = defaultdict(list)
+        for gen_cls, gt_cls in self.matched_classes:
+            gen_name = self.gen.cls_names[gen_cls]
+            gen_name_to_gt_names[gen_name].append(self.gt.cls_names[gt_cls])
+
+        tp = 0
+        gt_size = 0
+        gen_size = 0
+
+        for gen_cls, gt_cls in self.matched_classes:
+            gen_cls_parents = self.gen.cls_parents[gen_cls]
+            gt_cls_parents = self.gt.cls_parents[gt_cls]
+
+            if gen_cls_parents == [] and gt_cls_parents == []:
+                tp += 1
+                gen_size += 1
+                gt_size += 1
+            else:
+                gt_cls_parents_set = set(gt_cls_parents)
+                for gen_parent_name in gen_cls_parents:
+                    gt_names = gen_name_to_gt_names.get(gen_parent_name, [])
+                    if len(gt_names) > 1:
+                        msg = f"Multiple gen gt pairs associated with gen class {gen_parent_name}"
+                        raise RuntimeError(msg)
+                    if gt_names != [] and gt_names[0] in gt_cls_parents_set:
+                        tp += 1
+
+                gen_size += len(gen_cls_parents)
+                gt_size += len(gt_cls_parents)
+
+        return _result(tp, gt_size, gen_size)
+
+    def run_all_tests(self) -> EvaluationResults:
+        """Same metrics, names and order as evaluation.run_evaluation."""
+        results = EvaluationResults()
+        results.result_mapping["Methods Assigned to Correct Class"] = (
+            self.methods_assigned_correct_class()
+        )
+        results.result_mapping["Individual Classes"] = self.classes()
+        results.result_mapping["Constructors"] = self.methods(MethodType.ctor)
+        results.result_mapping["Destructors"] = self.methods(MethodType.dtor)
+        results.result_mapping["Methods"] = self.methods()
+        results.result_mapping["Class Graph Edges"] = self.class_graph_edges()
+        return results
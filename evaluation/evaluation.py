@@ -1,12 +1,17 @@
 from __future__ import annotations
 
-import copy
 import json
 import logging
 from collections import defaultdict
+from functools import cached_property
 from pathlib import Path
 from typing import Any, Callable
 
+from evaluation.array_evaluation import (
+    ArrayEvaluation,
+    MethodTable,
+    get_gt_methods_instrumented_array,
+)
 from evaluation.evaluation_data import EvaluationResult, EvaluationResults
 from parseconfig import Config
 from postgame import analysis_results as ar
@@ -24,26 +29,25 @@ def get_gt_analysis_results_instrumented(
     """
     Return an AnalysisResults model containing only methods in gt_methods_instrumented.
     Empty classes are removed from the results.
+
+    The returned model is a view: its structures are shallow copies with
+    filtered method dicts, and the methods and members are shared with
+    gt_analysis_results, so neither should be modified afterwards.
     """
-    gt_analysis_results_instrumented = gt_analysis_results.model_copy(deep=True)
+    structures: dict[str, ar.Structure] = {}
 
-    for cls_name, cls in gt_analysis_results_instrumented.structures.items():
+    for cls_name, cls in gt_analysis_results.structures.items():
         instrumented_methods = {
             method_name: method
             for method_name, method in cls.methods.items()
             if method.ea in gt_methods_instrumented
         }
-        cls.methods.clear()
-        cls.methods.update(instrumented_methods)
-        gt_analysis_results_instrumented.structures[cls_name] = cls
-
-    gt_analysis_results_instrumented.structures = {
-        name: cls
-        for name, cls in gt_analysis_results_instrumented.structures.items()
-        if len(cls.methods) > 0
-    }
+        if len(instrumented_methods) > 0:
+            structures[cls_name] = cls.model_copy(
+                update={"methods": instrumented_methods}
+            )
 
-    return gt_analysis_results_instrumented
+    return gt_analysis_results.model_copy(update={"structures": structures})
 
 
 def get_method_ea_set_by_type(
@@ -154,9 +158,123 @@ def nonempty_classes(analysis_results: ar.AnalysisResults) -> list[ar.Structure]
     return [x for x in analysis_results.structures.values() if len(x.methods) != 0]
 
 
+class AnalysisResultsIndex:
+    """
+    Method ea sets and class lookups of a single AnalysisResults, computed on
+    first use and cached. The AnalysisResults must not be modified while the
+    index is in use.
+    """
+
+    def __init__(self, analysis_results: ar.AnalysisResults):
+        self.analysis_results = analysis_results
+        self.__cls_method_eas: dict[int, set[str]] = {}
+        self.__cls_ancestors: dict[int, frozenset[str]] = {}
+
+    @cached_property
+    def nonempty_classes(self) -> list[ar.Structure]:
+        return nonempty_classes(self.analysis_results)
+
+    @cached_property
+    def _method_eas_by_type(self) -> dict[str | None, set[str]]:
+        method_eas_by_type: dict[str | None, set[str]] = defaultdict(set)
+        for cls in self.analysis_results.structures.values():
+            for method in cls.methods.values():
+                method_eas_by_type[None].add(method.ea)
+                method_eas_by_type[method.type].add(method.ea)
+        return method_eas_by_type
+
+    def method_eas(self, type_to_match: str | None) -> set[str]:
+        """
+        Same as get_method_ea_set_by_type. The returned set must not be
+        modified.
+        """
+        return self._method_eas_by_type.get(type_to_match, set())
+
+    def cls_method_eas(self, cls: ar.Structure) -> set[str]:
+        """The set of method eas of a class. The returned set must not be modified."""
+        if id(cls) not in self.__cls_method_eas:
+            self.__cls_method_eas[id(cls)] = set(
+                map(lambda x: x.ea, cls.methods.values())
+            )
+        return self.__cls_method_eas[id(cls)]
+
+    @cached_property
+    def classes_by_name(self) -> dict[str, ar.Structure]:
+        """
+        Map from structure name to structure. As in get_cls_from_data, the first
+        structure with a given name wins.
+        """
+        classes_by_name: dict[str, ar.Structure] = {}
+        for cls in self.analysis_results.structures.values():
+            classes_by_name.setdefault(cls.name, cls)
+        return classes_by_name
+
+    @staticmethod
+    def parents(structure: ar.Structure) -> list[str]:
+        """Names of the parent structures of a class."""
+        return [x.struc for x in structure.members.values() if x.parent]
+
+    def ancestors(self, cls: ar.Structure) -> frozenset[str]:
+        """
+        Names of the ancestors of a class as the ancestor metric has always
+        found them: the classes named by the structures of its parent members,
+        then from each class found, those named by its parent members' names.
+        The returned set must not be modified.
+        """
+        if id(cls) not in self.__cls_ancestors:
+            ancestors: set[str] = set()
+            worklist = self.parents(cls)
+            while worklist:
+                parent = self.classes_by_name.get(worklist.pop())
+                if parent is not None and parent.name not in ancestors:
+                    ancestors.add(parent.name)
+                    worklist.extend(x.name for x in parent.members.values() if x.parent)
+            self.__cls_ancestors[id(cls)] = frozenset(ancestors)
+        return self.__cls_ancestors[id(cls)]
+
+
+class EvaluationContext:
+    """
+    Data shared by every metric that compares one ground truth with one set of
+    generated results, so that the gen <-> gt class matching and the method ea
+    sets are only computed once. The generated results index may be shared by
+    contexts comparing the same generated results to different ground truths.
+    """
+
+    def __init__(
+        self,
+        gt_analysis_results: ar.AnalysisResults,
+        gen_analysis_results: ar.AnalysisResults,
+        gen_index: AnalysisResultsIndex | None = None,
+    ):
+        self.gt = AnalysisResultsIndex(gt_analysis_results)
+        self.gen = gen_index or AnalysisResultsIndex(gen_analysis_results)
+        assert self.gen.analysis_results is gen_analysis_results
+
+    @cached_property
+    def matched_classes(self) -> list[tuple[ar.Structure, ar.Structure]]:
+        return match_gen_to_gt_classes(
+            self.gt.analysis_results,
+            self.gen.analysis_results,
+            self,
+        )
+
+    @cached_property
+    def gen_name_to_gt_classes(self) -> dict[str, list[ar.Structure]]:
+        """
+        Map from generated class name to its matched ground truth classes. The
+        metrics only expect one, and check that when they look a name up.
+        """
+        gen_name_to_gt_classes: dict[str, list[ar.Structure]] = defaultdict(list)
+        for gen_cls, gt_cls in self.matched_classes:
+            gen_name_to_gt_classes[gen_cls.name].append(gt_cls)
+        return dict(gen_name_to_gt_classes)
+
+
 def evaluate_classes(
     gt_analysis_results: ar.AnalysisResults,
     gen_analysis_results: ar.AnalysisResults,
+    ctx: EvaluationContext | None = None,
 ) -> EvaluationResult:
     """
     Computes and returns the precision and recall, comparing the ground
@@ -166,11 +284,12 @@ def evaluate_classes(
     empty. Exclude classes without methods. Ground truth classes can't be
     double counted as a match for multiple generated classes.
     """
-    matched_classes = match_gen_to_gt_classes(gt_analysis_results, gen_analysis_results)
-    tp = len(matched_classes)
+    ctx = ctx or EvaluationContext(gt_analysis_results, gen_analysis_results)
 
-    ground_truth_excluding_empty = nonempty_classes(gt_analysis_results)
-    generated_data_excluding_empty = nonempty_classes(gen_analysis_results)
+    tp = len(ctx.matched_classes)
+
+    ground_truth_excluding_empty = ctx.gt.nonempty_classes
+    generated_data_excluding_empty = ctx.gen.nonempty_classes
 
     fn = false_negatives(ground_truth_excluding_empty, tp)
     fp = false_positives(generated_data_excluding_empty, tp)
@@ -181,6 +300,7 @@ def evaluate_classes(
 def evaluate_methods(
     gt_analysis_results: ar.AnalysisResults,
     gen_analysis_results: ar.AnalysisResults,
+    ctx: EvaluationContext | None = None,
 ) -> EvaluationResult:
     """
     Computes and returns precision and recall of the methods in the
@@ -188,8 +308,10 @@ def evaluate_methods(
 
     Methods are equal if their address is equal.
     """
-    gt_methods = set(get_method_ea_set_by_type(gt_analysis_results, None))
-    gen_methods = set(get_method_ea_set_by_type(gen_analysis_results, None))
+    ctx = ctx or EvaluationContext(gt_analysis_results, gen_analysis_results)
+
+    gt_methods = ctx.gt.method_eas(None)
+    gen_methods = ctx.gen.method_eas(None)
 
     tp = intersection_size(
         gen_methods,
@@ -206,13 +328,16 @@ def evaluate_specific_type(
     gt_analysis_results: ar.AnalysisResults,
     gen_analysis_results: ar.AnalysisResults,
     t: MethodType,
+    ctx: EvaluationContext | None = None,
 ) -> EvaluationResult:
     """
     Compares the set of methods that have the same type (t),
     returning the precision and recall.
     """
-    ground_truth_type = get_method_ea_set_by_type(gt_analysis_results, t)
-    generated_data_type = get_method_ea_set_by_type(gen_analysis_results, t)
+    ctx = ctx or EvaluationContext(gt_analysis_results, gen_analysis_results)
+
+    ground_truth_type = ctx.gt.method_eas(t)
+    generated_data_type = ctx.gen.method_eas(t)
 
     tp = intersection_size(generated_data_type, ground_truth_type)
 
@@ -225,28 +350,33 @@ def evaluate_specific_type(
 def evaluate_constructors(
     gt_analysis_results: ar.AnalysisResults,
     gen_analysis_results: ar.AnalysisResults,
+    ctx: EvaluationContext | None = None,
 ) -> EvaluationResult:
     return evaluate_specific_type(
         gt_analysis_results,
         gen_analysis_results,
         MethodType.ctor,
+        ctx,
     )
 
 
 def evaluate_destructors(
     gt_analysis_results: ar.AnalysisResults,
     gen_analysis_results: ar.AnalysisResults,
+    ctx: EvaluationContext | None = None,
 ) -> EvaluationResult:
     return evaluate_specific_type(
         gt_analysis_results,
         gen_analysis_results,
         MethodType.dtor,
+        ctx,
     )
 
 
 def evaluate_methods_assigned_correct_class(
     gt_analysis_results: ar.AnalysisResults,
     gen_analysis_results: ar.AnalysisResults,
+    ctx: EvaluationContext | None = None,
 ) -> EvaluationResult:
     """
     Computes the precision and recall, where for each generated class, compare
@@ -258,17 +388,13 @@ def evaluate_methods_assigned_correct_class(
     weighted sum of the scores for each generated class (weighted by generated
     class method set size).
     """
-
-    gen_to_gt_classes = match_gen_to_gt_classes(
-        gt_analysis_results,
-        gen_analysis_results,
-    )
+    ctx = ctx or EvaluationContext(gt_analysis_results, gen_analysis_results)
 
     results: list[EvaluationResult] = []
 
-    for gen_cls, gt_cls in gen_to_gt_classes:
-        gen_cls_addrs = set(map(lambda x: x.ea, gen_cls.methods.values()))
-        gt_cls_addrs = set(map(lambda x: x.ea, gt_cls.methods.values()))
+    for gen_cls, gt_cls in ctx.matched_classes:
+        gen_cls_addrs = ctx.gen.cls_method_eas(gen_cls)
+        gt_cls_addrs = ctx.gt.cls_method_eas(gt_cls)
 
         true_positives = len(gen_cls_addrs.intersection(gt_cls_addrs))
         false_positives = len(gen_cls_addrs) - true_positives
@@ -303,6 +429,7 @@ def get_cls_from_data(
 def evaluate_class_graph_ancestors(
     gt_analysis_results: ar.AnalysisResults,
     gen_analysis_results: ar.AnalysisResults,
+    ctx: EvaluationContext | None = None,
 ) -> EvaluationResult:
     """
     Computes the precision and recall, comparing class ancestors in the class
@@ -311,24 +438,16 @@ def evaluate_class_graph_ancestors(
     is a true positive.
     """
 
-    def get_gen_cls(gen_cls_mangled_name: str) -> ar.Structure | None:
-        """Get ClassInfo object with associated mangled name from generated data."""
-        return get_cls_from_data(gen_analysis_results, gen_cls_mangled_name)
-
-    matched_classes = match_gen_to_gt_classes(gt_analysis_results, gen_analysis_results)
+    ctx = ctx or EvaluationContext(gt_analysis_results, gen_analysis_results)
 
     tp = 0
     fp = 0
     gen_size = 0
     gt_size = 0
 
-    for gen_cls, gt_cls in matched_classes:
-        gen_parents = [
-            x.struc for x in list(filter(lambda x: x.parent, gen_cls.members.values()))
-        ]
-        gt_parents = [
-            x.struc for x in list(filter(lambda x: x.parent, gt_cls.members.values()))
-        ]
+    for gen_cls, gt_cls in ctx.matched_classes:
+        gen_parents = ctx.gen.parents(gen_cls)
+        gt_parents = ctx.gt.parents(gt_cls)
 
         if len(gen_parents) == 0 and len(gt_parents) == 0:
             # Both gen and ground truth share the "root" i.e. there are no
@@ -337,49 +456,24 @@ def evaluate_class_graph_ancestors(
             gen_size += 1
             gt_size += 1
         else:
-            gen_ancestors: set[str] = set()
-
-            # List of ancestors that will be systematically removed from this
-            # worklist and whose associated ClassInfo will be added to the set
-            # of ancestors.
-            worklist = copy.deepcopy(gen_parents)
-
-            # Find all ancestors of gen class
-            while len(worklist) != 0:
-                parent_cls_name = worklist.pop()
-
-                parent_cls = get_gen_cls(parent_cls_name)
-
-                if parent_cls is not None and parent_cls.name not in gen_ancestors:
-                    gen_ancestors.add(parent_cls.name)
-                    worklist.extend(
-                        [
-                            x.name
-                            for x in list(
-                                filter(lambda x: x.parent, parent_cls.members.values())
-                            )
-                        ]
-                    )
+            gen_ancestors = ctx.gen.ancestors(gen_cls)
 
             # Check if any of the ancestors match the gt
             for gen_ancestor in gen_ancestors:
                 # Find the ground truth class associated with the ancestor.
-                gen_gt_pairs = list(
-                    filter(lambda x: x[0].name == gen_ancestor, matched_classes)
-                )
+                gt_classes = ctx.gen_name_to_gt_classes.get(gen_ancestor, [])
 
-                if len(gen_gt_pairs) > 1:
+                if len(gt_classes) > 1:
                     msg = f"Multiple gen gt pairs associated with gen ancestor {gen_ancestor}"
                     raise RuntimeError(msg)
 
-                if gen_gt_pairs == []:
+                if gt_classes == []:
                     LOGGER.error(
                         "Failed to find gt class that matches gen class %s",
                         gen_ancestor,
                     )
                 else:
-                    if gen_gt_pairs != []:
-                        tp += 1
+                    tp += 1
 
             gen_size += len(gen_ancestors)
             gt_size += len(gt_parents)
@@ -393,6 +487,7 @@ def evaluate_class_graph_ancestors(
 def evaluate_class_graph_edges(
     gt_analysis_results: ar.AnalysisResults,
     gen_analysis_results: ar.AnalysisResults,
+    ctx: EvaluationContext | None = None,
 ) -> EvaluationResult:
     """
     Similar to PrecisionAndRecallClassGraphAncestors, except instead of
@@ -400,13 +495,13 @@ def evaluate_class_graph_edges(
     A true positive is if the generated and ground truth class graphs have a
     matching edge between two of the same classes.
     """
-    matched_classes = match_gen_to_gt_classes(gt_analysis_results, gen_analysis_results)
+    ctx = ctx or EvaluationContext(gt_analysis_results, gen_analysis_results)
 
     tp = 0
     gt_size = 0
     gen_size = 0
 
-    for gen_cls, gt_cls in matched_classes:
+    for gen_cls, gt_cls in ctx.matched_classes:
         # Count number of parents that the two classes share. The "ground truth"
         # for this measure is the total number of inheritance relationships. A true
         # positive would be when the generated and ground truth class share the
@@ -415,8 +510,8 @@ def evaluate_class_graph_edges(
         # Note: we don't expect parent names to be the same - instead we expect the
         # paired classes to be the same.
 
-        gen_cls_parents = [x.struc for x in gen_cls.members.values() if x.parent]
-        gt_cls_parents = [x.struc for x in gt_cls.members.values() if x.parent]
+        gen_cls_parents = ctx.gen.parents(gen_cls)
+        gt_cls_parents = ctx.gt.parents(gt_cls)
 
         if gen_cls_parents == [] and gt_cls_parents == []:
             # Both gen and ground truth share the "root" i.e. there are no
@@ -426,28 +521,24 @@ def evaluate_class_graph_edges(
             gen_size += 1
             gt_size += 1
         else:
+            gt_cls_parents_set = set(gt_cls_parents)
+
             for gen_parent_name in gen_cls_parents:
-                gen_gt_pairs = list(
-                    filter(lambda x: x[0].name == gen_parent_name, matched_classes)
-                )
+                gt_classes = ctx.gen_name_to_gt_classes.get(gen_parent_name, [])
 
-                if len(gen_gt_pairs) > 1:
-                    msg = f"multiple matching gen gt pairs: {gen_gt_pairs}"
+                if len(gt_classes) > 1:
+                    msg = f"multiple matching gen gt pairs for {gen_parent_name}: {[x.name for x in gt_classes]}"
                     raise RuntimeError(msg)
 
-                if gen_gt_pairs == []:
-                    # If gen_gt_pair is None, this indicates a failure to find
-                    # the class associated with the parent in the ground truth
-                    # data.
+                if gt_classes == []:
+                    # This indicates a failure to find the class associated with
+                    # the parent in the ground truth data.
                     LOGGER.error(
                         "Failed to find parent in generated data called %s because no ground truth class associated with the parent class.",
                         gen_parent_name,
                     )
-                else:
-                    # Find gt cls mangled name from gen_gt_pair in gt_cls.parent_mangled_names
-                    gt_name = gen_gt_pairs[0][1].name
-                    if list(filter(lambda x: x == gt_name, gt_cls_parents)) != []:
-                        tp += 1
+                elif gt_classes[0].name in gt_cls_parents_set:
+                    tp += 1
 
             gen_size += len(gen_cls_parents)
             gt_size += len(gt_cls_parents)
@@ -465,6 +556,7 @@ def evaluate_class_graph_edges(
 def match_gen_to_gt_classes(
     gt_analysis_results: ar.AnalysisResults,
     gen_analysis_results: ar.AnalysisResults,
+    ctx: EvaluationContext | None = None,
 ) -> list[tuple[ar.Structure, ar.Structure]]:
     """
     Helper method that attempts to match ground truth and generated classes.
@@ -474,51 +566,52 @@ def match_gen_to_gt_classes(
     If multiple ground truth classes exist with methods in a single ground truth
     method set, the ground truth class with more matching methods in its method
     set is chosen as the matched class.
+
+    Use EvaluationContext.matched_classes to reuse the matching across metrics.
     """
+    ctx = ctx or EvaluationContext(gt_analysis_results, gen_analysis_results)
+
     gt_nonempty_classes = sorted(
-        nonempty_classes(gt_analysis_results),
+        ctx.gt.nonempty_classes,
         key=lambda x: x.demangled_name,
         reverse=True,
     )
     gen_nonempty_classes = sorted(
-        nonempty_classes(gen_analysis_results),
+        ctx.gen.nonempty_classes,
         key=lambda x: x.demangled_name,
         reverse=True,
     )
 
+    # Inverted index from method ea to the (sorted) indices of the ground truth
+    # classes containing a method with that ea.
+    ea_to_gt_classes: dict[str, list[int]] = defaultdict(list)
+    for i, gt_cls in enumerate(gt_nonempty_classes):
+        for ea in ctx.gt.cls_method_eas(gt_cls):
+            ea_to_gt_classes[ea].append(i)
+
     matched_classes: list[tuple[ar.Structure, ar.Structure]] = []
 
     gt_classes_referenced: set[int] = set()
 
     for gen_cls in gen_nonempty_classes:
-        # Find ground truth classes that have method sets
-        # intersecting with the current generated class.
-        # For each ground truth class that does have a nonzero
-        # method set intersection size, record the size.
-        gen_gt_intersection_sizes: dict[int, list[ar.Structure]] = defaultdict(list)
-
-        gen_cls_method_set = set(map(lambda x: x.ea, gen_cls.methods.values()))
-
-        for gt_cls in gt_nonempty_classes:
-            if hash(gt_cls) in gt_classes_referenced:
-                continue
-
-            gt_cls_method_set = set(map(lambda x: x.ea, gt_cls.methods.values()))
-            intersect_size = intersection_size(gen_cls_method_set, gt_cls_method_set)
-            if intersect_size != 0:
-                gen_gt_intersection_sizes[intersect_size].append(gt_cls)
-
-        # Get largest method set intersection.
-        intersection_sizes = list(
-            sorted(gen_gt_intersection_sizes.keys(), reverse=True)
-        )
-        if intersection_sizes != []:
-            gt_cls = gen_gt_intersection_sizes[intersection_sizes[0]][0]
-            gt_classes_referenced.add(hash(gt_cls))
-            matched_classes.append((gen_cls, gt_cls))
-        else:
-            # print("hello")
-            pass
+        # Count, for each ground truth class that hasn't been matched yet, the
+        # number of methods it shares with the current generated class.
+        gen_gt_intersection_sizes: dict[int, int] = defaultdict(int)
+
+        for ea in ctx.gen.cls_method_eas(gen_cls):
+            for i in ea_to_gt_classes.get(ea, []):
+                if i not in gt_classes_referenced:
+                    gen_gt_intersection_sizes[i] += 1
+
+        # Get largest method set intersection. Ties go to the ground truth class
+        # that comes first in sorted order.
+        if gen_gt_intersection_sizes:
+            gt_idx = min(
+                gen_gt_intersection_sizes,
+                key=lambda i: (-gen_gt_intersection_sizes[i], i),
+            )
+            gt_classes_referenced.add(gt_idx)
+            matched_classes.append((gen_cls, gt_nonempty_classes[gt_idx]))
 
     return matched_classes
 
@@ -529,28 +622,44 @@ def run_evaluation(
     results_path: Path,
     results_instrumented_path: Path | None,
     gt_methods_instrumented_path: Path | None,
+    reference: bool = False,
 ):
-    with gt_class_info_path.open() as f:
-        gt_analysis_results = ar.AnalysisResults(**json.load(f))
-    with gen_class_info_path.open() as f:
-        gen_analysis_results = ar.AnalysisResults(**json.load(f))
+    """
+    Compare the generated results to the ground truth (and, if given, to the
+    instrumented part of the ground truth). Metrics are computed by
+    array_evaluation unless reference is set, in which case the pydantic-based
+    evaluate_* functions in this module are used.
+    """
+    gt_analysis_results = ar.load_analysis_results(gt_class_info_path)
+    gen_analysis_results = ar.load_analysis_results(gen_class_info_path)
+
+    # The generated results are compared to both the full and the instrumented
+    # ground truth, so their method sets are shared by both comparisons.
+    gen_index = AnalysisResultsIndex(gen_analysis_results)
+    gt_table: MethodTable | None = None
+    gen_table: MethodTable | None = None
+    if not reference:
+        gt_table = MethodTable.from_analysis_results(gt_analysis_results)
+        gen_table = MethodTable.from_analysis_results(gen_analysis_results)
 
     def run_all_tests(gt_analysis_results: ar.AnalysisResults) -> EvaluationResults:
         """
-        Runs all tests and writes results to the given file.
+        Runs all tests using the reference evaluate_* functions.
         """
         results = EvaluationResults()
+        ctx = EvaluationContext(gt_analysis_results, gen_analysis_results, gen_index)
 
         def run_test(
             name: str,
             test: Callable[
-                [ar.AnalysisResults, ar.AnalysisResults],
+                [ar.AnalysisResults, ar.AnalysisResults, EvaluationContext],
                 EvaluationResult,
             ],
         ):
             results.result_mapping[name] = test(
                 gt_analysis_results,
                 gen_analysis_results,
+                ctx,
             )
 
         run_test(
@@ -565,16 +674,18 @@ def run_evaluation(
 
         return results
 
+    if gt_table is not None and gen_table is not None:
+        results = ArrayEvaluation(gt_table, gen_table).run_all_tests()
+    else:
+        results = run_all_tests(gt_analysis_results)
+
     with results_path.open("w") as gt_out:
-        gt_out.write(
-            json.dumps(run_all_tests(gt_analysis_results).model_dump(), indent=4)
-        )
+        gt_out.write(json.dumps(results.model_dump(), indent=4))
 
     if gt_methods_instrumented_path and results_instrumented_path:
-        with gt_methods_instrumented_path.open() as f:
-            gt_methods_instrumented = get_gt_methods_instrumented_set(
-                gt_methods_instrumented_path,
-            )
+        gt_methods_instrumented = get_gt_methods_instrumented_set(
+            gt_methods_instrumented_path,
+        )
 
         load_and_record_gt_method_stats(
             gt_methods_instrumented,
@@ -584,25 +695,33 @@ def run_evaluation(
             ),
         )
 
-        gt_instrumented_analysis_results = get_gt_analysis_results_instrumented(
-            gt_methods_instrumented,
-            gt_analysis_results,
-        )
-
-        with open(results_instrumented_path, "w") as gt_out_instrumented:
-            gt_out_instrumented.write(
-                json.dumps(
-                    run_all_tests(gt_instrumented_analysis_results).model_dump(),
-                    indent=4,
+        if gt_table is not None and gen_table is not None:
+            # Only a mask over the ground truth rows, nothing is copied.
+            gt_instrumented_table = gt_table.restricted_to(
+                get_gt_methods_instrumented_array(
+                    gt_methods_instrumented_path,
+                    BASE_ADDR,
                 )
             )
+            results = ArrayEvaluation(gt_instrumented_table, gen_table).run_all_tests()
+        else:
+            results = run_all_tests(
+                get_gt_analysis_results_instrumented(
+                    gt_methods_instrumented,
+                    gt_analysis_results,
+                )
+            )
+
+        with open(results_instrumented_path, "w") as gt_out_instrumented:
+            gt_out_instrumented.write(json.dumps(results.model_dump(), indent=4))
 
 
-def main(cfg: Config):
+def main(cfg: Config, reference: bool = False):
     run_evaluation(
         cfg.gt_results_json,
         cfg.results_json,
         cfg.results_path,
         cfg.results_instrumented_path,
         cfg.gt_methods_instrumented_path,
+        reference,
     )
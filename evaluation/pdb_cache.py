@@ -0,0 +1,97 @@
+"""
+On-disk cache of parsed PDBs and of the ground truth generated from them.
+
+Entries are keyed by the digest of the PDB or dump file they were parsed from,
+so a cache directory can be shared by every project and entries never need to
+be invalidated: a changed file has a different digest. The parsed PdbParser is
+stored as a gzipped pickle (its type map holds TypeData subclasses, which JSON
+would not round trip) and the ground truth as gzipped JSON text.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import logging
+import os
+import pickle
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from evaluation.pdb_parser import PdbParser
+
+LOGGER = logging.getLogger(__name__)
+
+# Bumped whenever the parsed model or the generated ground truth changes, so
+# entries written by older code are not used.
+CACHE_VERSION = 2
+
+# Entries are written once and read many times, but are small enough that
+# better compression isn't worth the time.
+COMPRESS_LEVEL = 1
+
+
+def file_digest(path: Path) -> str:
+    with path.open("rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+class PdbCache:
+    """The cache entries of one PDB or dump file."""
+
+    def __init__(self, cache_dir: Path, source: Path):
+        self.cache_dir = cache_dir
+        self.key = f"{file_digest(source)}-v{CACHE_VERSION}"
+
+    @property
+    def parser_path(self) -> Path:
+        return self.cache_dir / f"{self.key}.parser.pkl.gz"
+
+    @property
+    def ground_truth_path(self) -> Path:
+        return self.cache_dir / f"{self.key}.gt.json.gz"
+
+    def load_parser(self) -> PdbParser | None:
+        data = self.__read(self.parser_path)
+        if data is None:
+            return None
+
+        try:
+            return pickle.loads(data)
+        # Unpickling garbage can raise almost any exception.
+        except Exception:
+            LOGGER.warning("ignoring corrupt cache entry %s", self.parser_path)
+            return None
+
+    def store_parser(self, parser: PdbParser) -> None:
+        self.__write(
+            self.parser_path, pickle.dumps(parser, protocol=pickle.HIGHEST_PROTOCOL)
+        )
+
+    def load_ground_truth(self) -> str | None:
+        data = self.__read(self.ground_truth_path)
+        return data.decode() if data is not None else None
+
+    def store_ground_truth(self, ground_truth: str) -> None:
+        self.__write(self.ground_truth_path, ground_truth.encode())
+
+    @staticmethod
+    def __read(path: Path) -> bytes | None:
+        if not path.exists():
+            return None
+
+        try:
+            return gzip.decompress(path.read_bytes())
+        except (OSError, EOFError):
+            LOGGER.warning("ignoring corrupt cache entry %s", path)
+            return None
+
+    def __write(self, path: Path, data: bytes) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        # Write to a temporary file first so a concurrent or interrupted run
+        # never sees a partial entry.
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp_path.write_bytes(gzip.compress(data, compresslevel=COMPRESS_LEVEL))
+        os.replace(tmp_path, path)
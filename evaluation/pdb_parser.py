@@ -1,16 +1,68 @@
-from collections import defaultdict
+import io
+import mmap
+import re
+from collections import defaultdict, deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from enum import Enum, auto
 from pathlib import Path
-from typing import cast
+from typing import Callable, Generator, Iterable, TextIO, cast
 
 from pydantic import BaseModel, Field
 from typing_extensions import Any, Self
 
 import evaluation.utils as utils
 import postgame.analysis_results as ar
+from evaluation.pdb_cache import PdbCache
 
 BASE_ADDR = 0x400000
 
+# Names of the cvdump sections ("*** NAME" header lines) that are parsed.
+TYPES_SECTION = "TYPES"
+SYMBOLS_SECTION = "SYMBOLS"
+SECTION_HEADERS_SECTION = "SECTION HEADERS"
+
+# Sections whose records are blocks of lines separated by blank lines. Records
+# of the symbols section are single lines.
+BLOCK_SECTIONS = {TYPES_SECTION, SECTION_HEADERS_SECTION}
+
+
+# Patterns of the lines of type records. Type indices are matched in full since
+# they are not limited to 4 hex digits in large PDBs.
+HEX = r"(0x[0-9A-Fa-f]+)"
+TYPE_HEADER_RE = re.compile(r"(\S+) : Length = (\d+), Leaf = " + HEX + " ")
+UNION_RE = re.compile(
+    r"# members = (\d+),  field list type "
+    + HEX
+    + r", .*Size = (\d+)\t,class name = (.*?), unique name = (.*?)(?:, UDT\(.*)?$"
+)
+CLASS_MEMBERS_RE = re.compile(r"# members = (\d+),  field list type " + HEX + "(.*)")
+CLASS_DERIVATION_RE = re.compile(
+    r"Derivation list type " + HEX + ", VT shape type " + HEX
+)
+CLASS_NAME_RE = re.compile(
+    r"Size = (\d+), class name = (.*?), unique name = (.*?)(?:, UDT\(.*)?$"
+)
+BASE_CLASS_RE = re.compile(r"= LF_BCLASS, [^,\n]*, type = " + HEX)
+MFUNCTION_THIS_RE = re.compile(
+    r"Return type = (.*?), Class type = "
+    + HEX
+    + r", This type = (?:"
+    + HEX
+    + r"|(T_NOTYPE\(0000\))), "
+)
+MFUNCTION_CALL_RE = re.compile(r"Call type = ([^,]*), Func attr =(.*)")
+MFUNCTION_PARMS_RE = re.compile(
+    r"Parms = (\d+), Arg list type = " + HEX + r", This adjust = (\d+)"
+)
+
+
+def match_line(pattern: re.Pattern[str], line: str) -> re.Match[str]:
+    match = pattern.search(line)
+    if match is None:
+        msg = f"failed to parse type record line {line!r}"
+        raise ValueError(msg)
+    return match
+
 
 class TypeData(BaseModel):
     type: int
@@ -19,20 +71,17 @@ class TypeData(BaseModel):
 
     @classmethod
     def parse_first_line(cls, line: str) -> dict[str, int]:
+        match = match_line(TYPE_HEADER_RE, line)
         return {
-            "type": int(line.split()[0], 16),
-            "length": utils.get_dec_btwn(line, "Length = ", ","),
-            "leaf": utils.get_hex_btwn(line, "Leaf = ", " "),
+            "type": int(match[1], 16),
+            "length": int(match[2]),
+            "leaf": int(match[3], 16),
         }
 
-
-class UnionTypeData(TypeData):
-    members: int
-    field_list_type: int
-    size: int
-    class_name: str
-    unique_name: str
-    forward_ref: bool
+    @classmethod
+    def parse_lines(cls, lines: list[str]) -> dict[str, Any]:
+        """The field values of a type record, given its (collapsed) lines."""
+        return cls.parse_first_line(lines[0])
 
     @classmethod
     def model_validate_lines(
@@ -43,38 +92,36 @@ class UnionTypeData(TypeData):
         from_attributes: bool | None = None,
         context: dict[str, Any] | None = None,
     ) -> Self:
-        members = cast("dict[str, Any]", TypeData.parse_first_line(lines[0]))
-        members["members"] = utils.get_dec_btwn(lines[1], "members = ", ",  ")
-        members["field_list_type"] = utils.get_hex_btwn(
-            lines[1],
-            "field list type ",
-            ", ",
-        )
-        members["size"] = utils.get_dec_btwn(
-            lines[1],
-            "Size = ",
-            "\t,",
-        )
-        members["class_name"] = utils.get_str_btwn(
-            lines[1],
-            "class name = ",
-            ", unique name",
-        )
-        members["unique_name"] = utils.get_str_btwn(
-            lines[1],
-            "unique name = ",
-            ", UDT",
-        )
-        members["forward_ref"] = "FORWARD REF" in lines[1]
-
-        return super().model_validate(
-            members,
+        return cls.model_validate(
+            cls.parse_lines(lines),
             strict=strict,
             from_attributes=from_attributes,
             context=context,
         )
 
 
+class UnionTypeData(TypeData):
+    members: int
+    field_list_type: int
+    size: int
+    class_name: str
+    unique_name: str
+    forward_ref: bool
+
+    @classmethod
+    def parse_lines(cls, lines: list[str]) -> dict[str, Any]:
+        members = cast("dict[str, Any]", TypeData.parse_first_line(lines[0]))
+        match = match_line(UNION_RE, lines[1])
+        members["members"] = int(match[1])
+        members["field_list_type"] = int(match[2], 16)
+        members["size"] = int(match[3])
+        members["class_name"] = match[4]
+        members["unique_name"] = match[5]
+        members["forward_ref"] = "FORWARD REF" in lines[1]
+
+        return members
+
+
 class ClassTypeData(TypeData):
     members: int
     field_list_type: int
@@ -86,89 +133,41 @@ class ClassTypeData(TypeData):
     forward_ref: bool = False
 
     @classmethod
-    def model_validate_lines(
-        cls: type[Self],
-        lines: list[str],
-        *,
-        strict: bool | None = None,
-        from_attributes: bool | None = None,
-        context: dict[str, Any] | None = None,
-    ) -> Self:
+    def parse_lines(cls, lines: list[str]) -> dict[str, Any]:
         members = cast("dict[str, Any]", TypeData.parse_first_line(lines[0]))
-        members["members"] = utils.get_dec_btwn(lines[1], "members = ", ",  ")
-        members["field_list_type"] = utils.get_hex_after(lines[1], "field list type ")
-        members["derivation_list_type"] = utils.get_hex_after(
-            lines[2], "Derivation list type "
-        )
-        members["vt_shape_type"] = utils.get_hex_after(lines[2], "VT shape type ")
-        members["size"] = utils.get_dec_btwn(lines[3], "Size = ", ",")
-        members["class_name"] = utils.get_str_btwn(
-            lines[3],
-            ", class name = ",
-            ", unique name",
-        )
-        members["unique_name"] = utils.get_str_btwn(
-            lines[3],
-            ", unique name = ",
-            ", UDT(",
-        )
-        members["forward_ref"] = "FORWARD REF" in utils.get_str_after(
-            lines[1],
-            "field list type ",
-        )
+        match = match_line(CLASS_MEMBERS_RE, lines[1])
+        members["members"] = int(match[1])
+        members["field_list_type"] = int(match[2], 16)
+        members["forward_ref"] = "FORWARD REF" in match[3]
+        match = match_line(CLASS_DERIVATION_RE, lines[2])
+        members["derivation_list_type"] = int(match[1], 16)
+        members["vt_shape_type"] = int(match[2], 16)
+        match = match_line(CLASS_NAME_RE, lines[3])
+        members["size"] = int(match[1])
+        members["class_name"] = match[2]
+        members["unique_name"] = match[3]
 
-        return super().model_validate(
-            members,
-            strict=strict,
-            from_attributes=from_attributes,
-            context=context,
-        )
+        return members
 
 
 class FieldListTypeData(TypeData):
     base_classes: set[int]
 
     @classmethod
-    def model_validate_lines(
-        cls: type[Self],
-        lines: list[str],
-        *,
-        strict: bool | None = None,
-        from_attributes: bool | None = None,
-        context: dict[str, Any] | None = None,
-    ) -> Self:
+    def parse_lines(cls, lines: list[str]) -> dict[str, Any]:
         members = cast("dict[str, Any]", TypeData.parse_first_line(lines[0]))
-        members["base_classes"] = set()
+        members["base_classes"] = {
+            int(match[1], 16) for match in BASE_CLASS_RE.finditer("\n".join(lines[1:]))
+        }
 
-        for line in lines:
-            line_split = line.split(",")
-            identifier = line_split[0].split("=")[1].strip()
-            if identifier == "LF_BCLASS":
-                type = utils.get_hex_after(line_split[2], "type = ")
-                cast("set[int]", members["base_classes"]).add(type)
-
-            identifier = utils.get_nth_str(line, 2)
-
-        return super().model_validate(
-            members,
-            strict=strict,
-            from_attributes=from_attributes,
-            context=context,
-        )
+        return members
 
 
 class MethodListTypeData(TypeData):
     method_list: set[int]
 
     @classmethod
-    def model_validate_lines(
-        cls: type[Self],
-        lines: list[str],
-        *,
-        strict: bool | None = None,
-        from_attributes: bool | None = None,
-        context: dict[str, Any] | None = None,
-    ) -> Self:
+    def parse_lines(cls, lines: list[str]) -> dict[str, Any]:
         members = cast("dict[str, Any]", TypeData.parse_first_line(lines[0]))
         members["method_list"] = []
 
@@ -201,34 +200,17 @@ class MethodListTypeData(TypeData):
 
             cast("list[int]", members["method_list"]).append(method_type_id)
 
-        return super().model_validate(
-            members,
-            strict=strict,
-            from_attributes=from_attributes,
-            context=context,
-        )
+        return members
 
 
 class ProcedureTypeData(TypeData):
     @classmethod
-    def model_validate_lines(
-        cls: type[Self],
-        lines: list[str],
-        *,
-        strict: bool | None = None,
-        from_attributes: bool | None = None,
-        context: dict[str, Any] | None = None,
-    ) -> Self:
+    def parse_lines(cls, lines: list[str]) -> dict[str, Any]:
         members = TypeData.parse_first_line(lines[0])
 
         # TODO
 
-        return super().model_validate(
-            members,
-            strict=strict,
-            from_attributes=from_attributes,
-            context=context,
-        )
+        return members
 
 
 class FuncAttr(Enum):
@@ -264,42 +246,27 @@ class MethodTypeData(TypeData):
     this_adjust: int
 
     @classmethod
-    def model_validate_lines(
-        cls: type[Self],
-        lines: list[str],
-        *,
-        strict: bool | None = None,
-        from_attributes: bool | None = None,
-        context: dict[str, Any] | None = None,
-    ) -> Self:
+    def parse_lines(cls, lines: list[str]) -> dict[str, Any]:
         members = cast("dict[str, Any]", TypeData.parse_first_line(lines[0]))
 
-        members["return_type"] = utils.get_str_btwn(lines[1], "Return type = ", ", ")
-        members["class_type_ref"] = utils.get_hex_btwn(lines[1], "Class type = ", ",")
-
-        try:
-            members["this_type"] = utils.get_hex_btwn(lines[1], "This type = ", ",")
-        except ValueError:
-            if utils.get_str_after(lines[1], "This type = ") != "T_NOTYPE(0000), ":
-                msg = "failed to find this type and not T_NOTYPE"
-                raise RuntimeError(msg)
+        match = MFUNCTION_THIS_RE.search(lines[1])
+        if match is None:
+            msg = "failed to find this type and not T_NOTYPE"
+            raise RuntimeError(msg)
+        members["return_type"] = match[1]
+        members["class_type_ref"] = int(match[2], 16)
+        members["this_type"] = int(match[3], 16) if match[3] else None
 
-            members["this_type"] = None
+        match = match_line(MFUNCTION_CALL_RE, lines[2])
+        members["call_type"] = match[1]
+        members["func_attr"] = FuncAttr.from_str(match[2])
 
-        members["call_type"] = utils.get_str_btwn(lines[2], "Call type = ", ",")
-        members["func_attr"] = FuncAttr.from_str(
-            utils.get_nth_str(utils.get_nth_str(lines[2], 1, ", "), 1, "=")
-        )
-        members["params"] = utils.get_dec_btwn(lines[3], "Parms = ", ",")
-        members["arg_list_type"] = utils.get_hex_btwn(lines[3], "Arg list type = ", ",")
-        members["this_adjust"] = utils.get_dec_after(lines[3], "This adjust = ")
+        match = match_line(MFUNCTION_PARMS_RE, lines[3])
+        members["params"] = int(match[1])
+        members["arg_list_type"] = int(match[2], 16)
+        members["this_adjust"] = int(match[3])
 
-        return super().model_validate(
-            members,
-            strict=strict,
-            from_attributes=from_attributes,
-            context=context,
-        )
+        return members
 
 
 class TypeId(Enum):
@@ -320,11 +287,18 @@ class TypeId(Enum):
 
     @classmethod
     def from_str(cls, s: str) -> Self:
-        for type_id in cls.__members__.values():
-            if s in cast("Self", type_id).value[1]:
-                return type_id
-        msg = f"failed to convert string {s} to a type id"
-        raise ValueError(msg)
+        if s not in LEAF_NAME_TO_TYPE_ID:
+            msg = f"failed to convert string {s} to a type id"
+            raise ValueError(msg)
+        return cast("Self", LEAF_NAME_TO_TYPE_ID[s])
+
+
+# Leaf name (e.g. LF_CLASS) -> type id. Where a leaf name is listed by more than
+# one type id, the first one wins.
+LEAF_NAME_TO_TYPE_ID: dict[str, TypeId] = {}
+for type_id in TypeId:
+    for leaf_name in type_id.value[1]:
+        LEAF_NAME_TO_TYPE_ID.setdefault(leaf_name, type_id)
 
 
 class SectionHeaderInfo(BaseModel):
@@ -356,6 +330,7 @@ class ProcedureSymbolData(BaseModel):
     section_header: int
     relative_addr: int
     name: str
+    length: int = 0
 
 
 class PdbParser(BaseModel):
@@ -368,18 +343,26 @@ class PdbParser(BaseModel):
         cls: type[Self],
         dumpfile: Path,
         *,
+        workers: int = 1,
         strict: bool | None = None,
         from_attributes: bool | None = None,
         context: dict[str, Any] | None = None,
     ) -> Self:
-        with dumpfile.open() as f:
-            contents = f.read()
-
-        obj: dict[str, Any] = {
-            "section_header_map": PdbParser.parse_section_headers(contents),
-            "procedure_list": PdbParser.parse_symbols(contents),
-            "type_to_typedata_map": PdbParser.parse_types(contents),
-        }
+        """
+        Parse a cvdump dump file in a single pass, reading one record at a time
+        rather than the whole file. If workers is greater than 1, that many
+        worker processes read and parse byte ranges of the types section while
+        this process parses the other sections.
+        """
+        types_range = None
+        if workers > 1:
+            types_range = dump_section_range(dumpfile, TYPES_SECTION)
+
+        if types_range is not None:
+            obj = PdbParser.__parse_dumpfile_parallel(dumpfile, types_range, workers)
+        else:
+            with dumpfile.open() as f:
+                obj = PdbParser.__parse_records(iter_dump_records(f))
 
         return super().model_validate(
             obj,
@@ -389,128 +372,295 @@ class PdbParser(BaseModel):
         )
 
     @staticmethod
-    def parse_types(contents: str) -> dict[int, TypeData]:
-        type_id_to_type_data_map: dict[int, TypeData] = {}
-
-        types = PdbParser.__get_types(contents)[1:]
-
-        types = types.split("\n\n")
-        type_lines = [x.splitlines() for x in types]
-        type_lines = [x for x in type_lines if x != [""]]
-
-        for lines in type_lines:
-            collapsed_lines: list[str] = []
-            for line in lines:
-                if line.startswith("\t\t"):
-                    collapsed_lines[-1] += line
-                else:
-                    collapsed_lines.append(line)
-            lines = collapsed_lines
-
-            type_id = TypeId.from_str(utils.get_nth_str(lines[0], 8))
-
-            type_data = None
-            if type_id.value[2] is not None:
-                type_data = type_id.value[2].model_validate_lines(lines)
+    def __parse_dumpfile_parallel(
+        dumpfile: Path,
+        types_range: tuple[int, int],
+        workers: int,
+    ) -> dict[str, Any]:
+        ranges = split_type_records(dumpfile, *types_range, TYPE_BYTES_PER_CHUNK)
+
+        with ProcessPoolExecutor(workers) as pool, dumpfile.open() as f:
+            # Limit the number of ranges waiting to be merged so memory use
+            # doesn't grow with the size of the dump.
+            pending: deque[Future[list[CompactTypeData]]] = deque()
+
+            def submit() -> None:
+                while ranges and len(pending) < 2 * workers:
+                    start, end = ranges.pop(0)
+                    pending.append(
+                        pool.submit(parse_type_records_range, dumpfile, start, end)
+                    )
+
+            submit()
+            obj = PdbParser.__parse_records(
+                iter_dump_records(skip_section(f, TYPES_SECTION, types_range[1]))
+            )
 
-            if type_data is not None:
-                type_id_to_type_data_map[type_data.type] = type_data
+            # Ranges are merged in order, so the map is the same as when
+            # parsing sequentially.
+            type_to_typedata_map = obj["type_to_typedata_map"]
+            while pending:
+                compact = pending.popleft().result()
+                submit()
+                for type_data in type_data_from_compact(compact):
+                    type_to_typedata_map[type_data.type] = type_data
 
-        return type_id_to_type_data_map
+        return obj
 
     @staticmethod
-    def parse_section_headers(contents: str) -> dict[int, SectionHeaderInfo]:
+    def __parse_records(records: Iterable[tuple[str, list[str]]]) -> dict[str, Any]:
         section_header_map: dict[int, SectionHeaderInfo] = {}
-
-        section_headers = PdbParser.__get_section_headers(contents)
-
-        sections = section_headers.split("\n\n")
-
-        for sec in sections:
-            lines: list[str] = sec.splitlines()
-
-            if len(lines) == 0:
-                continue
-
-            section_info = SectionHeaderInfo.model_validate_lines(lines)
-            section_header_map[section_info.header_num] = section_info
-
-        return section_header_map
-
-    @staticmethod
-    def parse_symbols(contents: str):
         procedure_list: list[ProcedureSymbolData] = []
+        type_to_typedata_map: dict[int, TypeData] = {}
+
+        for section, lines in records:
+            if section == TYPES_SECTION:
+                type_data = PdbParser.parse_type_record(lines)
+                if type_data is not None:
+                    type_to_typedata_map[type_data.type] = type_data
+            elif section == SYMBOLS_SECTION:
+                procedure = PdbParser.parse_symbol_line(lines[0])
+                if procedure is not None:
+                    procedure_list.append(procedure)
+            elif section == SECTION_HEADERS_SECTION:
+                section_info = SectionHeaderInfo.model_validate_lines(lines)
+                section_header_map[section_info.header_num] = section_info
 
-        symbols = PdbParser.__get_symbols(contents)
-
-        lines = symbols.splitlines()
-        lines = [x for x in lines if "** Module:" not in x and x != ""]
-
-        symbol_iter = iter(lines)
-        try:
-            while True:
-                next_symbol = next(symbol_iter)
-                while not next_symbol.startswith("("):
-                    next_symbol = next(symbol_iter)
-
-                if "S_GPROC32" in next_symbol or "S_LPROC32" in next_symbol:
-                    addr_str = utils.get_str_btwn(next_symbol, "[", "]")
-
-                    section_header = utils.get_hex_btwn(addr_str, "", ":")
-                    relative_addr = utils.get_hex_after(addr_str, ":", 8)
+        return {
+            "section_header_map": section_header_map,
+            "procedure_list": procedure_list,
+            "type_to_typedata_map": type_to_typedata_map,
+        }
 
-                    type_str = utils.get_str_btwn(next_symbol, "Type:", ", ")
+    @staticmethod
+    def __parse_section(contents: str, section: str) -> dict[str, Any]:
+        records = iter_dump_records(contents.splitlines())
+        return PdbParser.__parse_records(x for x in records if x[0] == section)
 
-                    if "T_NOTYPE(0000)" not in type_str:
-                        type = int(type_str, 16)
-                        name = utils.get_str_after(next_symbol, type_str + ", ")
+    @staticmethod
+    def parse_types(contents: str) -> dict[int, TypeData]:
+        return PdbParser.__parse_section(contents, TYPES_SECTION)[
+            "type_to_typedata_map"
+        ]
 
-                        procedure_list.append(
-                            ProcedureSymbolData(
-                                type_id=type,
-                                section_header=section_header,
-                                relative_addr=relative_addr,
-                                name=name,
-                            )
-                        )
-        except StopIteration:
-            pass
+    @staticmethod
+    def parse_section_headers(contents: str) -> dict[int, SectionHeaderInfo]:
+        return PdbParser.__parse_section(contents, SECTION_HEADERS_SECTION)[
+            "section_header_map"
+        ]
 
-        return procedure_list
+    @staticmethod
+    def parse_symbols(contents: str) -> list[ProcedureSymbolData]:
+        return PdbParser.__parse_section(contents, SYMBOLS_SECTION)["procedure_list"]
 
     @staticmethod
-    def __get_types(dumpfile_contents: str):
-        return PdbParser.__get_data_between_section_headers(
-            "*** TYPES\n",
-            "*** TYPES Mismatch Warnings",
-            dumpfile_contents,
-        )
+    def parse_type_record(lines: list[str]) -> TypeData | None:
+        """
+        Parse the lines of one record of the types section. Returns None for
+        types that are not needed to generate the ground truth.
+        """
+        parsed = parse_type_record_fields(lines)
+        if parsed is None:
+            return None
+
+        type_data_cls, fields = parsed
+        return type_data_cls.model_validate(fields)
 
     @staticmethod
-    def __get_symbols(dumpfile_contents: str):
-        return PdbParser.__get_data_between_section_headers(
-            "*** SYMBOLS\n",
-            "*** GLOBALS",
-            dumpfile_contents,
+    def parse_symbol_line(line: str) -> ProcedureSymbolData | None:
+        """
+        Parse one line of the symbols section. Returns None for lines that are
+        not procedures with a type.
+        """
+        if "S_GPROC32" not in line and "S_LPROC32" not in line:
+            return None
+
+        addr_str = utils.get_str_btwn(line, "[", "]")
+
+        section_header = utils.get_hex_btwn(addr_str, "", ":")
+        relative_addr = utils.get_hex_after(addr_str, ":", 8)
+
+        length = utils.get_hex_btwn(line, "Cb: ", ",")
+        type_str = utils.get_str_btwn(line, "Type:", ", ")
+
+        if "T_NOTYPE(0000)" in type_str:
+            return None
+
+        type = int(type_str, 16)
+        name = utils.get_str_after(line, type_str + ", ")
+
+        return ProcedureSymbolData(
+            type_id=type,
+            section_header=section_header,
+            relative_addr=relative_addr,
+            name=name,
+            length=length,
         )
 
-    @staticmethod
-    def __get_section_headers(dumpfile_contents: str):
-        return PdbParser.__get_data_between_section_headers(
-            "*** SECTION HEADERS\n",
-            "*** ORIGINAL SECTION HEADERS",
-            dumpfile_contents,
+
+def parse_type_record_fields(
+    lines: list[str],
+) -> tuple[type[TypeData], dict[str, Any]] | None:
+    """
+    The TypeData subclass and field values of one record of the types section,
+    or None for types that are not needed to generate the ground truth.
+    """
+    type_data_cls = TypeId.from_str(utils.get_nth_str(lines[0], 8)).value[2]
+    if type_data_cls is None:
+        return None
+
+    # Lines starting with two tabs continue the previous line.
+    collapsed_lines = "\n".join(lines).replace("\n\t\t", "\t\t").split("\n")
+
+    return type_data_cls, type_data_cls.parse_lines(collapsed_lines)
+
+
+# A parsed type record as sent back by worker processes: the index of its
+# class in TYPE_DATA_CLASSES and its field values in declaration order.
+CompactTypeData = tuple[int, tuple[Any, ...]]
+
+TYPE_DATA_CLASSES: list[type[TypeData]] = list(
+    dict.fromkeys(x.value[2] for x in TypeId if x.value[2] is not None)
+)
+TYPE_DATA_FIELDS: list[tuple[str, ...]] = [
+    tuple(x.model_fields) for x in TYPE_DATA_CLASSES
+]
+
+# Bytes of the types section read and parsed by a worker process at a time.
+TYPE_BYTES_PER_CHUNK = 1 << 22
+
+
+def parse_type_records_compact(records: list[list[str]]) -> list[CompactTypeData]:
+    """Parse type records into compact tuples, run in worker processes."""
+    compact: list[CompactTypeData] = []
+    for lines in records:
+        parsed = parse_type_record_fields(lines)
+        if parsed is not None:
+            type_data_cls, fields = parsed
+            index = TYPE_DATA_CLASSES.index(type_data_cls)
+            compact.append((index, tuple(fields[x] for x in TYPE_DATA_FIELDS[index])))
+    return compact
+
+
+def parse_type_records_range(
+    dumpfile: Path, start: int, end: int
+) -> list[CompactTypeData]:
+    """Read and parse the type records between byte offsets of a dump file."""
+    with dumpfile.open("rb") as f:
+        f.seek(start)
+        lines = io.TextIOWrapper(io.BytesIO(f.read(end - start)))
+        records = iter_dump_records(lines, TYPES_SECTION)
+        return parse_type_records_compact([x for _, x in records])
+
+
+def type_data_from_compact(compact: list[CompactTypeData]) -> Iterable[TypeData]:
+    """Validate the type records parsed by a worker process."""
+    for index, values in compact:
+        yield TYPE_DATA_CLASSES[index].model_validate(
+            dict(zip(TYPE_DATA_FIELDS[index], values))
         )
 
-    @staticmethod
-    def __get_data_between_section_headers(
-        h1: str,
-        h2: str,
-        dumpfile_contents: str,
-    ) -> str:
-        start = dumpfile_contents.find(h1) + len(h1)
-        end = dumpfile_contents.find(h2)
-        return dumpfile_contents[start:end]
+
+def _header_offsets(mm: mmap.mmap) -> Generator[int, None, None]:
+    """Byte offsets of the section header lines of a dump file."""
+    if mm[:4] == b"*** ":
+        yield 0
+    pos = mm.find(b"\n*** ")
+    while pos != -1:
+        yield pos + 1
+        pos = mm.find(b"\n*** ", pos + 1)
+
+
+def dump_section_range(dumpfile: Path, section: str) -> tuple[int, int] | None:
+    """
+    The byte offsets of the records of a section of a dump file, from after its
+    header line to the next one, or None if the dump has no such section.
+    """
+    header = f"*** {section}".encode()
+    with (
+        dumpfile.open("rb") as f,
+        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+    ):
+        offsets = [*_header_offsets(mm), len(mm)]
+        for pos, next_pos in zip(offsets, offsets[1:]):
+            eol = mm.find(b"\n", pos, next_pos)
+            line_end = next_pos if eol == -1 else eol + 1
+            if mm[pos:line_end].rstrip(b"\r\n") == header:
+                return line_end, next_pos
+    return None
+
+
+def split_type_records(
+    dumpfile: Path, start: int, end: int, size: int
+) -> list[tuple[int, int]]:
+    """
+    Split a byte range of type records into ranges of about size bytes, each
+    starting at a blank line so no record is cut.
+    """
+    ranges: list[tuple[int, int]] = []
+    with (
+        dumpfile.open("rb") as f,
+        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+    ):
+        while start < end:
+            split = min(start + size, end)
+            while split < end:
+                eol = mm.find(b"\n", split, end)
+                split = end if eol == -1 else eol + 1
+                if mm[split : split + 1] in (b"\n", b"\r"):
+                    break
+
+            ranges.append((start, split))
+            start = split
+    return ranges
+
+
+def skip_section(f: TextIO, section: str, end: int) -> Generator[str, None, None]:
+    """
+    The lines of f, jumping from the header line of a section to byte offset
+    end. Dump files are decoded without state carried between lines, so a
+    byte offset is a valid position to seek to.
+    """
+    header = f"*** {section}\n"
+    skipped = False
+    for line in f:
+        yield line
+        if not skipped and line == header:
+            f.seek(end)
+            skipped = True
+
+
+def iter_dump_records(
+    lines: Iterable[str],
+    section: str = "",
+) -> Generator[tuple[str, list[str]], None, None]:
+    """
+    Split the lines of a cvdump dump file into records of the parsed sections,
+    yielding (section name, record lines) pairs one record at a time. Records
+    of other sections are skipped. Lines before the first section header
+    belong to section.
+    """
+    record: list[str] = []
+
+    for line in lines:
+        line = line.rstrip("\n")
+
+        if line.startswith("*** "):
+            if record:
+                yield section, record
+                record = []
+            section = line[4:]
+        elif section in BLOCK_SECTIONS:
+            if line != "":
+                record.append(line)
+            elif record:
+                yield section, record
+                record = []
+        elif section == SYMBOLS_SECTION and line.startswith("("):
+            yield section, [line]
+
+    if record:
+        yield section, record
 
 
 def get_name_namespace_removed(name: str) -> str:
@@ -545,9 +695,21 @@ def get_name_namespace_removed(name: str) -> str:
     return name_no_namespace
 
 
-def main(pdb_file: Path, results_file: Path):
-    parser = PdbParser.model_validate_dumpfile(pdb_file)
+def procedure_addr(
+    parser: PdbParser,
+    procedure: ProcedureSymbolData,
+    base_addr: int = BASE_ADDR,
+) -> int:
+    """Absolute address of a procedure in the image loaded at base_addr."""
+    return (
+        parser.section_header_map[procedure.section_header].virtual_addr
+        + procedure.relative_addr
+        + base_addr
+    )
+
 
+def generate_ground_truth(parser: PdbParser) -> ar.AnalysisResults:
+    """The ground truth classes and methods of a parsed PDB."""
     class_to_procedure_list_map: dict[int, list[ProcedureSymbolData]] = defaultdict(
         list
     )
@@ -626,11 +788,7 @@ def main(pdb_file: Path, results_file: Path):
 
         # methods
         for method in methods:
-            ea = (
-                parser.section_header_map[method.section_header].virtual_addr
-                + method.relative_addr
-                + BASE_ADDR
-            )
+            ea = procedure_addr(parser, method)
 
             class_name_no_namespace = get_name_namespace_removed(forward_ref.class_name)
             method_name_no_namespace = get_name_namespace_removed(method.name)
@@ -651,5 +809,71 @@ def main(pdb_file: Path, results_file: Path):
 
         results.structures[forward_ref.unique_name] = structure
 
+    return results
+
+
+def write_ground_truth(parser: PdbParser, results_file: Path):
+    results = generate_ground_truth(parser)
+
     with results_file.open("w") as f:
         f.write(results.model_dump_json(indent=4))
+
+
+def load_pdb_parser(
+    source: Path,
+    parse: Callable[[], PdbParser],
+    cache_dir: Path | None = None,
+) -> PdbParser:
+    """
+    The parsed PDB of the source PDB or dump file. If cache_dir is given, the
+    parser cached for the source's digest is used, or parse's result is cached.
+    """
+    if cache_dir is None:
+        return parse()
+
+    cache = PdbCache(cache_dir, source)
+    parser = cache.load_parser()
+    if parser is None:
+        parser = parse()
+        cache.store_parser(parser)
+    return parser
+
+
+def write_ground_truth_cached(
+    source: Path,
+    results_file: Path,
+    parse: Callable[[], PdbParser],
+    cache_dir: Path | None = None,
+):
+    """
+    Write the ground truth of the source PDB or dump file. If cache_dir is
+    given, the ground truth cached for the source's digest is written without
+    parsing the source, otherwise the ground truth (and parser) are cached.
+    """
+    if cache_dir is None:
+        write_ground_truth(parse(), results_file)
+        return
+
+    cache = PdbCache(cache_dir, source)
+    ground_truth = cache.load_ground_truth()
+    if ground_truth is None:
+        parser = load_pdb_parser(source, parse, cache_dir)
+        ground_truth = generate_ground_truth(parser).model_dump_json(indent=4)
+        cache.store_ground_truth(ground_truth)
+
+    with results_file.open("w") as f:
+        f.write(ground_truth)
+
+
+def main(
+    pdb_file: Path,
+    results_file: Path,
+    workers: int = 1,
+    cache_dir: Path | None = None,
+):
+    write_ground_truth_cached(
+        pdb_file,
+        results_file,
+        lambda: PdbParser.model_validate_dumpfile(pdb_file, workers=workers),
+        cache_dir,
+    )
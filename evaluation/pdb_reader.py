@@ -0,0 +1,588 @@
+"""
+Reader of PDB files that parses the MSF container and its streams directly,
+without dumping the PDB to text with cvdump first.
+
+Only the records needed to generate the ground truth are read: the class,
+union, field list, member function and procedure records of the TPI stream,
+the procedure symbols of the module symbol streams and the section headers.
+The result is the same PdbParser as parsing the cvdump dump of the PDB.
+"""
+
+import mmap
+import struct
+from pathlib import Path
+from typing import Any, Callable, Generator
+
+from evaluation.pdb_parser import (
+    ClassTypeData,
+    FieldListTypeData,
+    FuncAttr,
+    MethodTypeData,
+    PdbParser,
+    ProcedureSymbolData,
+    ProcedureTypeData,
+    SectionHeaderInfo,
+    TypeData,
+    UnionTypeData,
+    write_ground_truth_cached,
+)
+
+MSF_MAGIC = b"Microsoft C/C++ MSF 7.00\r\n\x1aDS\0\0\0"
+
+# magic, block size, free block map block, number of blocks, number of
+# directory bytes, unknown, block map address
+SUPERBLOCK = struct.Struct("<32s6I")
+
+NIL_STREAM_SIZE = 0xFFFFFFFF
+NIL_STREAM_INDEX = 0xFFFF
+
+# Fixed stream indices.
+TPI_STREAM = 2
+DBI_STREAM = 3
+
+# Index of the section header stream in the DBI optional debug header.
+SECTION_HEADER_DBG_STREAM = 5
+
+U16 = struct.Struct("<H")
+U32 = struct.Struct("<I")
+
+# version, header size, first type index, end type index, type record bytes
+TPI_HEADER = struct.Struct("<5I")
+
+# The DBI header, and the indices of the sizes of the substreams following it
+# (module info, section contributions, section map, source info and type
+# server map, EC, optional debug header).
+DBI_HEADER = struct.Struct("<iIIHHHHHHiiiiiIiiHHI")
+DBI_MODULE_INFO_SIZE = 9
+DBI_SUBSTREAM_SIZES = slice(10, 14)
+DBI_OPTIONAL_DBG_HEADER_SIZE = 15
+DBI_EC_SUBSTREAM_SIZE = 16
+
+# Fixed size part of a module info record, and the offsets of its symbol
+# stream index and symbol byte size.
+MODULE_INFO_SIZE = 64
+MODULE_INFO_SYM_STREAM = struct.Struct("<HI")
+MODULE_INFO_SYM_STREAM_OFFSET = 34
+
+# name, virtual size, virtual address, ...
+IMAGE_SECTION_HEADER = struct.Struct("<8sIIIIIIHHI")
+
+# Type record leaves.
+LF_PROCEDURE = 0x1008
+LF_MFUNCTION = 0x1009
+LF_FIELDLIST = 0x1203
+LF_CLASS = 0x1504
+LF_STRUCTURE = 0x1505
+LF_UNION = 0x1506
+
+# Field list member leaves.
+LF_BCLASS = 0x1400
+LF_VBCLASS = 0x1401
+LF_IVBCLASS = 0x1402
+LF_INDEX = 0x1404
+LF_VFUNCTAB = 0x1409
+LF_BINTERFACE = 0x151A
+LF_ENUMERATE = 0x1502
+LF_MEMBER = 0x150D
+LF_STMEMBER = 0x150E
+LF_METHOD = 0x150F
+LF_NESTTYPE = 0x1510
+LF_ONEMETHOD = 0x1511
+
+# Field list members are padded to 4 bytes with LF_PAD1 to LF_PAD15, whose low
+# nibble is the number of bytes to skip.
+LF_PAD1 = 0xF1
+
+# Numeric leaves: values below LF_NUMERIC are stored in the leaf itself.
+LF_NUMERIC = 0x8000
+NUMERIC_LEAVES: dict[int, struct.Struct] = {
+    0x8000: struct.Struct("<b"),
+    0x8001: struct.Struct("<h"),
+    0x8002: struct.Struct("<H"),
+    0x8003: struct.Struct("<l"),
+    0x8004: struct.Struct("<L"),
+    0x8009: struct.Struct("<q"),
+    0x800A: struct.Struct("<Q"),
+}
+
+# Class property flags.
+CV_PROP_FWDREF = 0x80
+CV_PROP_HASUNIQUENAME = 0x200
+
+# count, property, field list, derivation list, vtable shape
+CLASS_RECORD = struct.Struct("<HHIII")
+# count, property, field list
+UNION_RECORD = struct.Struct("<HHI")
+# return type, class type, this type, call type, func attributes, parameter
+# count, argument list, this adjust
+MFUNCTION_RECORD = struct.Struct("<IIIBBHIi")
+
+# Function attributes, in the order cvdump checks them.
+FUNC_ATTR_RETURN_UDT = 0x1
+FUNC_ATTR_CONSTRUCTOR = 0x2
+
+# Calling conventions as named by cvdump, indexed by CV_call_e value.
+CALL_TYPES = [
+    "C Near",
+    "C Far",
+    "Pascal Near",
+    "Pascal Far",
+    "Fast Near",
+    "Fast Far",
+    "SKIPPED",
+    "STD Near",
+    "STD Far",
+    "SYS Near",
+    "SYS Far",
+    "ThisCall",
+    "MIPS CALL",
+    "Generic",
+    "Alpha Call",
+    "PPC Call",
+    "SH Call",
+    "ARM Call",
+    "AM33 Call",
+    "TriCore Call",
+    "SH5 Call",
+    "M32R Call",
+    "CLR Call",
+    "Inline",
+    "Near Vector",
+]
+
+# Primitive types as named by cvdump, by the low byte of the type index. The
+# mode (pointer kind) is in bits 8-10.
+PRIMITIVE_TYPES: dict[int, str] = {
+    0x00: "NOTYPE",
+    0x03: "VOID",
+    0x08: "HRESULT",
+    0x10: "CHAR",
+    0x11: "SHORT",
+    0x12: "LONG",
+    0x13: "QUAD",
+    0x14: "OCT",
+    0x20: "UCHAR",
+    0x21: "USHORT",
+    0x22: "ULONG",
+    0x23: "UQUAD",
+    0x24: "UOCT",
+    0x30: "BOOL08",
+    0x31: "BOOL16",
+    0x32: "BOOL32",
+    0x33: "BOOL64",
+    0x40: "REAL32",
+    0x41: "REAL64",
+    0x42: "REAL80",
+    0x46: "REAL16",
+    0x68: "INT1",
+    0x69: "UINT1",
+    0x70: "RCHAR",
+    0x71: "WCHAR",
+    0x72: "INT2",
+    0x73: "UINT2",
+    0x74: "INT4",
+    0x75: "UINT4",
+    0x76: "INT8",
+    0x77: "UINT8",
+    0x7A: "CHAR16",
+    0x7B: "CHAR32",
+    0x7C: "CHAR8",
+}
+PRIMITIVE_MODES: dict[int, str] = {
+    0: "",
+    1: "P",
+    2: "FP",
+    3: "HP",
+    4: "32P",
+    5: "32FP",
+    6: "64P",
+}
+
+# Procedure symbol kinds: S_LPROC32, S_GPROC32 and their _ID and _DPC variants,
+# all of which share the same layout.
+PROCEDURE_SYMBOLS = {0x110F, 0x1110, 0x1146, 0x1147, 0x1155, 0x1156}
+# parent, end, next, length, debug start, debug end, type, offset, segment,
+# flags
+PROCEDURE_SYMBOL = struct.Struct("<7IIHB")
+
+# Signature at the start of module symbol streams.
+CV_SIGNATURE_SIZE = 4
+
+
+class MsfFile:
+    """
+    A memory mapped MSF container, the file format of PDBs. A stream is the
+    concatenation of its (not necessarily contiguous) blocks.
+    """
+
+    def __init__(self, path: Path):
+        with path.open("rb") as f:
+            self.__mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (
+            magic,
+            self.__block_size,
+            _,
+            _,
+            directory_size,
+            _,
+            block_map_addr,
+        ) = SUPERBLOCK.unpack_from(self.__mmap)
+        if magic != MSF_MAGIC:
+            self.close()
+            msg = f"{path} is not a PDB (MSF 7.00) file"
+            raise ValueError(msg)
+
+        directory_blocks = self.__u32_array(
+            self.__block_bytes([block_map_addr]),
+            0,
+            self.__block_count(directory_size),
+        )
+        directory = self.__block_bytes(directory_blocks)[:directory_size]
+
+        (num_streams,) = U32.unpack_from(directory)
+        self.__stream_sizes = [
+            0 if x == NIL_STREAM_SIZE else x
+            for x in self.__u32_array(directory, U32.size, num_streams)
+        ]
+
+        self.__stream_blocks: list[list[int]] = []
+        offset = U32.size * (1 + num_streams)
+        for size in self.__stream_sizes:
+            count = self.__block_count(size)
+            self.__stream_blocks.append(self.__u32_array(directory, offset, count))
+            offset += U32.size * count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args: Any):
+        self.close()
+
+    def close(self) -> None:
+        self.__mmap.close()
+
+    @property
+    def num_streams(self) -> int:
+        return len(self.__stream_sizes)
+
+    def stream(self, index: int) -> bytes:
+        """The contents of the stream with the given index."""
+        if index >= self.num_streams:
+            msg = f"stream {index} does not exist, there are {self.num_streams}"
+            raise ValueError(msg)
+        return self.__block_bytes(self.__stream_blocks[index])[
+            : self.__stream_sizes[index]
+        ]
+
+    def __block_count(self, size: int) -> int:
+        return (size + self.__block_size - 1) // self.__block_size
+
+    def __block_bytes(self, blocks: list[int]) -> bytes:
+        bs = self.__block_size
+        return b"".join(self.__mmap[x * bs : (x + 1) * bs] for x in blocks)
+
+    @staticmethod
+    def __u32_array(data: bytes, offset: int, count: int) -> list[int]:
+        return list(struct.unpack_from(f"<{count}I", data, offset))
+
+
+def read_numeric(data: bytes, offset: int) -> tuple[int, int]:
+    """Read a numeric leaf, returning its value and the offset following it."""
+    (value,) = U16.unpack_from(data, offset)
+    offset += U16.size
+    if value < LF_NUMERIC:
+        return value, offset
+
+    if value not in NUMERIC_LEAVES:
+        msg = f"unsupported numeric leaf {value:#x}"
+        raise ValueError(msg)
+    fmt = NUMERIC_LEAVES[value]
+    return fmt.unpack_from(data, offset)[0], offset + fmt.size
+
+
+def read_cstring(data: bytes, offset: int) -> tuple[str, int]:
+    """Read a null terminated string, returning it and the offset following it."""
+    end = data.index(b"\0", offset)
+    return data[offset:end].decode("utf-8", errors="replace"), end + 1
+
+
+def primitive_type_name(type_index: int) -> str:
+    """Name of a type index as printed by cvdump, e.g. T_INT4(0074) or 0x1001."""
+    if type_index >= 0x1000:
+        return f"0x{type_index:04X}"
+
+    base = PRIMITIVE_TYPES.get(type_index & 0xFF)
+    mode = PRIMITIVE_MODES.get((type_index >> 8) & 0x7)
+    if base is None or mode is None:
+        return f"???({type_index:04X})"
+    return f"T_{mode}{base}({type_index:04X})"
+
+
+def read_class(data: bytes) -> dict[str, Any]:
+    members, prop, field_list, derivation_list, vt_shape = CLASS_RECORD.unpack_from(
+        data
+    )
+    size, offset = read_numeric(data, CLASS_RECORD.size)
+    class_name, offset = read_cstring(data, offset)
+    unique_name = ""
+    if prop & CV_PROP_HASUNIQUENAME:
+        unique_name, _ = read_cstring(data, offset)
+
+    return {
+        "members": members,
+        "field_list_type": field_list,
+        "derivation_list_type": derivation_list,
+        "vt_shape_type": vt_shape,
+        "size": size,
+        "class_name": class_name,
+        "unique_name": unique_name,
+        "forward_ref": bool(prop & CV_PROP_FWDREF),
+    }
+
+
+def read_union(data: bytes) -> dict[str, Any]:
+    members, prop, field_list = UNION_RECORD.unpack_from(data)
+    size, offset = read_numeric(data, UNION_RECORD.size)
+    class_name, offset = read_cstring(data, offset)
+    unique_name = ""
+    if prop & CV_PROP_HASUNIQUENAME:
+        unique_name, _ = read_cstring(data, offset)
+
+    return {
+        "members": members,
+        "field_list_type": field_list,
+        "size": size,
+        "class_name": class_name,
+        "unique_name": unique_name,
+        "forward_ref": bool(prop & CV_PROP_FWDREF),
+    }
+
+
+def read_field_list(data: bytes) -> dict[str, Any]:
+    base_classes: set[int] = set()
+
+    offset = 0
+    while offset < len(data):
+        if data[offset] >= LF_PAD1:
+            offset += data[offset] & 0x0F
+            continue
+
+        (leaf,) = U16.unpack_from(data, offset)
+        offset += U16.size
+
+        # Every member except LF_ENUMERATE starts with 2 bytes of attributes or
+        # padding and a type index.
+        if leaf == LF_BCLASS or leaf == LF_BINTERFACE:
+            (type_index,) = U32.unpack_from(data, offset + 2)
+            _, offset = read_numeric(data, offset + 6)
+            if leaf == LF_BCLASS:
+                base_classes.add(type_index)
+        elif leaf == LF_VBCLASS or leaf == LF_IVBCLASS:
+            _, offset = read_numeric(data, offset + 10)
+            _, offset = read_numeric(data, offset)
+        elif leaf == LF_MEMBER:
+            _, offset = read_numeric(data, offset + 6)
+            _, offset = read_cstring(data, offset)
+        elif leaf in (LF_STMEMBER, LF_METHOD, LF_NESTTYPE):
+            _, offset = read_cstring(data, offset + 6)
+        elif leaf == LF_ONEMETHOD:
+            (attr,) = U16.unpack_from(data, offset)
+            offset += 6
+            # Introducing virtual methods are followed by their vtable offset.
+            if (attr >> 2) & 0x7 in (4, 6):
+                offset += U32.size
+            _, offset = read_cstring(data, offset)
+        elif leaf == LF_ENUMERATE:
+            _, offset = read_numeric(data, offset + 2)
+            _, offset = read_cstring(data, offset)
+        elif leaf == LF_VFUNCTAB or leaf == LF_INDEX:
+            offset += 6
+        else:
+            msg = f"unsupported field list member leaf {leaf:#x}"
+            raise ValueError(msg)
+
+    return {"base_classes": base_classes}
+
+
+def read_member_function(data: bytes) -> dict[str, Any]:
+    (
+        return_type,
+        class_type,
+        this_type,
+        call_type,
+        func_attr,
+        params,
+        arg_list,
+        this_adjust,
+    ) = MFUNCTION_RECORD.unpack_from(data)
+
+    if func_attr == 0:
+        attr = FuncAttr.NONE
+    elif func_attr & FUNC_ATTR_RETURN_UDT:
+        attr = FuncAttr.RETURN_UDT
+    elif func_attr & FUNC_ATTR_CONSTRUCTOR:
+        attr = FuncAttr.INSTANCE_CONSTRUCTOR
+    else:
+        attr = FuncAttr.UNUSED_NONZERO
+
+    return {
+        "return_type": primitive_type_name(return_type),
+        "class_type_ref": class_type,
+        "this_type": this_type if this_type != 0 else None,
+        "call_type": (CALL_TYPES[call_type] if call_type < len(CALL_TYPES) else "???"),
+        "func_attr": attr,
+        "params": params,
+        "arg_list_type": arg_list,
+        "this_adjust": this_adjust,
+    }
+
+
+def read_procedure(data: bytes) -> dict[str, Any]:
+    return {}
+
+
+# Leaf -> TypeData subclass and the reader of its fields, for the types that
+# are needed to generate the ground truth.
+TYPE_RECORD_READERS: dict[
+    int, tuple[type[TypeData], Callable[[bytes], dict[str, Any]]]
+] = {
+    LF_MFUNCTION: (MethodTypeData, read_member_function),
+    LF_CLASS: (ClassTypeData, read_class),
+    LF_STRUCTURE: (ClassTypeData, read_class),
+    LF_FIELDLIST: (FieldListTypeData, read_field_list),
+    LF_UNION: (UnionTypeData, read_union),
+    LF_PROCEDURE: (ProcedureTypeData, read_procedure),
+}
+
+
+def iter_records(
+    data: bytes, offset: int, end: int
+) -> Generator[tuple[int, int, bytes], None, None]:
+    """
+    Yield the (length, leaf or symbol kind, contents) of the records between
+    offset and end. Length is the record length field, which excludes itself.
+    """
+    while offset + 4 <= end:
+        length, kind = struct.unpack_from("<HH", data, offset)
+        yield length, kind, data[offset + 4 : offset + 2 + length]
+        offset += 2 + length
+
+
+def read_types(tpi: bytes) -> dict[int, TypeData]:
+    """Read the type records of the TPI stream that are needed."""
+    _, header_size, type_index, _, record_bytes = TPI_HEADER.unpack_from(tpi)
+
+    type_to_typedata_map: dict[int, TypeData] = {}
+    for length, leaf, data in iter_records(
+        tpi, header_size, header_size + record_bytes
+    ):
+        if leaf in TYPE_RECORD_READERS:
+            type_data_cls, reader = TYPE_RECORD_READERS[leaf]
+            fields = reader(data)
+            fields["type"] = type_index
+            fields["length"] = length
+            fields["leaf"] = leaf
+            type_to_typedata_map[type_index] = type_data_cls.model_validate(fields)
+        type_index += 1
+
+    return type_to_typedata_map
+
+
+def read_module_symbols(
+    symbols: bytes, symbols_size: int
+) -> Generator[ProcedureSymbolData, None, None]:
+    """Read the procedures with a type from a module symbol stream."""
+    for _, kind, data in iter_records(symbols, CV_SIGNATURE_SIZE, symbols_size):
+        if kind not in PROCEDURE_SYMBOLS:
+            continue
+
+        *_, length, _, _, type_id, relative_addr, section_header, _ = (
+            PROCEDURE_SYMBOL.unpack_from(data)
+        )
+        if type_id == 0:
+            continue
+
+        name, _ = read_cstring(data, PROCEDURE_SYMBOL.size)
+        yield ProcedureSymbolData(
+            type_id=type_id,
+            section_header=section_header,
+            relative_addr=relative_addr,
+            name=name,
+            length=length,
+        )
+
+
+def read_symbols(msf: MsfFile, dbi: bytes) -> list[ProcedureSymbolData]:
+    """Read the procedure symbols of every module, in module order."""
+    module_info_size = DBI_HEADER.unpack_from(dbi)[DBI_MODULE_INFO_SIZE]
+
+    procedure_list: list[ProcedureSymbolData] = []
+
+    offset = DBI_HEADER.size
+    end = offset + module_info_size
+    while offset < end:
+        stream_index, symbols_size = MODULE_INFO_SYM_STREAM.unpack_from(
+            dbi, offset + MODULE_INFO_SYM_STREAM_OFFSET
+        )
+        if stream_index != NIL_STREAM_INDEX:
+            procedure_list.extend(
+                read_module_symbols(msf.stream(stream_index), symbols_size)
+            )
+
+        # Module name and object file name, then padding to 4 bytes.
+        _, name_end = read_cstring(dbi, offset + MODULE_INFO_SIZE)
+        _, name_end = read_cstring(dbi, name_end)
+        offset += (name_end - offset + 3) & ~3
+
+    return procedure_list
+
+
+def read_section_headers(msf: MsfFile, dbi: bytes) -> dict[int, SectionHeaderInfo]:
+    """Read the section headers from the stream named by the DBI debug header."""
+    header = DBI_HEADER.unpack_from(dbi)
+    offset = (
+        DBI_HEADER.size
+        + header[DBI_MODULE_INFO_SIZE]
+        + sum(header[DBI_SUBSTREAM_SIZES])
+        + header[DBI_EC_SUBSTREAM_SIZE]
+    )
+    if header[DBI_OPTIONAL_DBG_HEADER_SIZE] < U16.size * (
+        SECTION_HEADER_DBG_STREAM + 1
+    ):
+        return {}
+
+    (stream_index,) = U16.unpack_from(
+        dbi, offset + U16.size * SECTION_HEADER_DBG_STREAM
+    )
+    if stream_index == NIL_STREAM_INDEX:
+        return {}
+
+    section_header_map: dict[int, SectionHeaderInfo] = {}
+    for i, fields in enumerate(
+        IMAGE_SECTION_HEADER.iter_unpack(msf.stream(stream_index))
+    ):
+        section_header_map[i + 1] = SectionHeaderInfo(
+            header_num=i + 1,
+            virtual_size=fields[1],
+            virtual_addr=fields[2],
+        )
+
+    return section_header_map
+
+
+def read_pdb(pdb_file: Path) -> PdbParser:
+    """Read the types, procedures and section headers of a PDB file."""
+    with MsfFile(pdb_file) as msf:
+        dbi = msf.stream(DBI_STREAM)
+        return PdbParser(
+            section_header_map=read_section_headers(msf, dbi),
+            procedure_list=read_symbols(msf, dbi),
+            type_to_typedata_map=read_types(msf.stream(TPI_STREAM)),
+        )
+
+
+def main(pdb_file: Path, results_file: Path, cache_dir: Path | None = None):
+    write_ground_truth_cached(
+        pdb_file, results_file, lambda: read_pdb(pdb_file), cache_dir
+    )
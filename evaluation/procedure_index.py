@@ -0,0 +1,119 @@
+"""
+Index of PDB procedures sorted by absolute address, to resolve arbitrary
+addresses (e.g. those of object traces) to the procedures containing them.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Generator, Iterable, TextIO
+
+from evaluation.pdb_parser import (
+    BASE_ADDR,
+    PdbParser,
+    ProcedureSymbolData,
+    procedure_addr,
+)
+
+
+@dataclass(frozen=True)
+class IndexedProcedure:
+    addr: int
+    symbol: ProcedureSymbolData
+
+    @property
+    def end(self) -> int:
+        """Address following the procedure. Procedures have at least one byte."""
+        return self.addr + max(self.symbol.length, 1)
+
+    @property
+    def name(self) -> str:
+        return self.symbol.name
+
+
+class ProcedureIndex:
+    """
+    Procedures of a PDB sorted by absolute address, with O(log n) lookups of the
+    procedure at or containing an address and of the procedures in a range.
+    """
+
+    def __init__(self, procedures: Iterable[IndexedProcedure]):
+        self.procedures = sorted(procedures, key=lambda x: x.addr)
+        self.__addrs = [x.addr for x in self.procedures]
+
+    @classmethod
+    def from_parser(cls, parser: PdbParser, base_addr: int = BASE_ADDR):
+        return cls(
+            IndexedProcedure(procedure_addr(parser, x, base_addr), x)
+            for x in parser.procedure_list
+        )
+
+    def __len__(self) -> int:
+        return len(self.procedures)
+
+    def at(self, addr: int) -> IndexedProcedure | None:
+        """The procedure starting at addr."""
+        i = bisect_left(self.__addrs, addr)
+        if i < len(self.__addrs) and self.__addrs[i] == addr:
+            return self.procedures[i]
+        return None
+
+    def containing(self, addr: int) -> IndexedProcedure | None:
+        """
+        The procedure containing addr. Where procedures overlap, the one starting
+        last before addr.
+        """
+        i = bisect_right(self.__addrs, addr) - 1
+        if i >= 0 and addr < self.procedures[i].end:
+            return self.procedures[i]
+        return None
+
+    def in_range(self, start: int, end: int) -> list[IndexedProcedure]:
+        """The procedures starting in [start, end), in address order."""
+        return self.procedures[
+            bisect_left(self.__addrs, start) : bisect_left(self.__addrs, end)
+        ]
+
+
+def describe_addr(index: ProcedureIndex, addr: int) -> str:
+    """name, name+0xoffset or ? if no procedure contains addr."""
+    procedure = index.containing(addr)
+    if procedure is None:
+        return "?"
+    if procedure.addr == addr:
+        return procedure.name
+    return f"{procedure.name}+{addr - procedure.addr:#x}"
+
+
+def annotate_object_traces(
+    lines: Iterable[str],
+    index: ProcedureIndex,
+    base_addr: int = BASE_ADDR,
+) -> Generator[str, None, None]:
+    """
+    Append the name of the containing procedure to every entry of an
+    object-traces file, whose addresses are relative to base_addr. Blank lines
+    separating traces are kept.
+    """
+    for line in lines:
+        line = line.rstrip("\n")
+        if line == "":
+            yield line
+            continue
+
+        addr = int(line.split(" ", 1)[0], 16) + base_addr
+        yield f"{line}\t{describe_addr(index, addr)}"
+
+
+def main(
+    parser: PdbParser,
+    object_traces_path: Path,
+    output: TextIO,
+    base_addr: int = BASE_ADDR,
+):
+    index = ProcedureIndex.from_parser(parser, base_addr)
+    with object_traces_path.open() as f:
+        for line in annotate_object_traces(f, index, base_addr):
+            output.write(line + "\n")
@@ -1,16 +1,19 @@
 """List methods from the given name map."""
 
+from pathlib import Path
+
 from typer import Typer
 
+from postgame.name_map import NameMap
+
 APP = Typer()
 
 
 @APP.command()
-def main(name_map: str, addrs: list[str]):
-    with open(name_map, "r") as f:
-        for line in f.readlines():
-            if line.split()[0] in addrs:
-                print(line, end="")
+def main(name_map: Path, addrs: list[str]):
+    with NameMap(name_map) as names:
+        for line in names.lines(int(x, 16) for x in addrs):
+            print(line)
 
 
 if __name__ == "__main__":
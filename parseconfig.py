@@ -42,11 +42,26 @@ class Config(BaseModel):
     base_offset_path: Path = Path("base-address")
     static_traces_path: Path = Path("static-traces")
     object_traces_path: Path = Path("object-traces")
+    # Object traces of separate game runs, merged into object_traces_path
+    # before the postgame if given (see postgame.merge_traces).
+    object_trace_runs: list[Path] = []
     results_json: Path = Path("results.json")
     dump_file: Path = Path("project.dump")
+    pdb_cache_dir: Path = Path("pdb-cache")
 
     debug_function: int | None = None
 
+    # Worker processes computing the swim passes of the postgame.
+    postgame_workers: int = 1
+
+    # State the postgame folds the traces of each run into when incremental.
+    postgame_state_path: Path = Path("postgame-state.pkl.gz")
+
+    # Postgame subsystems to trace (see postgame.tracing) -> logging level name,
+    # and an optional JSON lines file the trace events are also written to.
+    trace: dict[str, str] = {}
+    trace_file: Path | None = None
+
     pin_root: Path | None = None
 
     isa: Isa = Isa.X86
@@ -70,8 +85,13 @@ class Config(BaseModel):
         self.base_offset_path = path_rel_base(self.base_offset_path)
         self.static_traces_path = path_rel_base(self.static_traces_path)
         self.object_traces_path = path_rel_base(self.object_traces_path)
+        self.object_trace_runs = [path_rel_base(x) for x in self.object_trace_runs]
         self.results_json = path_rel_base(self.results_json)
         self.dump_file = path_rel_base(self.dump_file)
+        self.pdb_cache_dir = path_rel_base(self.pdb_cache_dir)
+        self.postgame_state_path = path_rel_base(self.postgame_state_path)
+        if self.trace_file is not None:
+            self.trace_file = path_rel_base(self.trace_file)
 
         self.gt_results_json = path_rel_base(self.gt_results_json)
         self.pdb_file = path_rel_base(self.pdb_file)
@@ -3,8 +3,10 @@
 from __future__ import annotations
 
 import itertools
+import json
 from enum import StrEnum, auto
-from typing import Any
+from pathlib import Path
+from typing import IO, Any, Iterable
 
 from pydantic import BaseModel, Field
 from typing_extensions import Self
@@ -64,3 +66,57 @@ class AnalysisResults(BaseModel):
     def get_methods(self) -> list[Method]:
         meths = [x.methods.values() for x in self.structures.values()]
         return list(itertools.chain.from_iterable(meths))
+
+
+def load_analysis_results(path: Path) -> AnalysisResults:
+    """
+    Load a results json file. The file is parsed and validated by pydantic
+    straight from its bytes, without building a dict of the whole file first.
+    """
+    return AnalysisResults.model_validate_json(path.read_bytes())
+
+
+def _dump_json(model: BaseModel, level: int) -> str:
+    """
+    json.dumps(model.model_dump(), indent=4) nested at the given indentation
+    level. model_dump_json is much faster but does not escape non-ASCII
+    characters, so json.dumps is only used when those are present.
+    """
+    dump = model.model_dump_json(indent=4)
+    if not dump.isascii() or "\x7f" in dump:
+        dump = json.dumps(model.model_dump(), indent=4)
+    return dump.replace("\n", "\n" + "    " * level)
+
+
+def write_analysis_results(
+    f: IO[str],
+    analysis_results: AnalysisResults,
+    structures: Iterable[tuple[str, Structure]] | None = None,
+) -> None:
+    """
+    Write analysis results in the same format as
+    json.dumps(analysis_results.model_dump(), indent=4), one structure at a
+    time. If given, structures (which must have unique names) are written
+    instead of analysis_results.structures, so they can be generated lazily.
+    """
+    if structures is None:
+        structures = analysis_results.structures.items()
+
+    fields = analysis_results.model_dump(exclude={"structures"})
+
+    f.write("{")
+    for i, field in enumerate(AnalysisResults.model_fields):
+        f.write(",\n    " if i > 0 else "\n    ")
+        f.write(json.dumps(field) + ": ")
+
+        if field != "structures":
+            f.write(json.dumps(fields[field], indent=4).replace("\n", "\n    "))
+            continue
+
+        empty = True
+        for name, structure in structures:
+            f.write(",\n        " if not empty else "{\n        ")
+            f.write(json.dumps(name) + ": " + _dump_json(structure, 2))
+            empty = False
+        f.write("{}" if empty else "\n    }")
+    f.write("\n}")
@@ -0,0 +1,757 @@
+"""
+Demangling of MSVC decorated names, producing the same text as undname.
+
+demangle() is a pure Python demangler covering the names that appear in our
+name maps: functions, methods, operators, special members and variables,
+including template instantiations and back references. Demangler wraps it
+with an on-disk cache shared between projects and, for the names it cannot
+demangle, a fallback to a single undname process per batch of names (when
+undname is available, i.e. on Windows).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+LOGGER = logging.getLogger(__name__)
+
+# Bumped whenever demangle() output changes, so cached names demangled by older
+# code are not used.
+DEMANGLER_VERSION = 1
+
+DEFAULT_CACHE_PATH = (
+    Path(os.environ.get("KREO_CACHE_DIR", Path.home() / ".cache" / "kreo"))
+    / f"demangle-v{DEMANGLER_VERSION}.tsv"
+)
+
+# Names passed to one undname process, keeping the command line short.
+UNDNAME_BATCH_SIZE = 100
+
+
+class DemangleError(ValueError):
+    pass
+
+
+PRIMITIVE_TYPES = {
+    "C": "signed char",
+    "D": "char",
+    "E": "unsigned char",
+    "F": "short",
+    "G": "unsigned short",
+    "H": "int",
+    "I": "unsigned int",
+    "J": "long",
+    "K": "unsigned long",
+    "M": "float",
+    "N": "double",
+    "O": "long double",
+    "X": "void",
+}
+
+EXTENDED_TYPES = {
+    "D": "__int8",
+    "E": "unsigned __int8",
+    "F": "__int16",
+    "G": "unsigned __int16",
+    "H": "__int32",
+    "I": "unsigned __int32",
+    "J": "__int64",
+    "K": "unsigned __int64",
+    "L": "__int128",
+    "M": "unsigned __int128",
+    "N": "bool",
+    "Q": "char8_t",
+    "S": "char16_t",
+    "U": "char32_t",
+    "W": "wchar_t",
+}
+
+CLASS_KINDS = {"T": "union", "U": "struct", "V": "class"}
+
+CALLING_CONVENTIONS = {
+    "A": "__cdecl",
+    "B": "__cdecl",
+    "C": "__pascal",
+    "D": "__pascal",
+    "E": "__thiscall",
+    "F": "__thiscall",
+    "G": "__stdcall",
+    "H": "__stdcall",
+    "I": "__fastcall",
+    "J": "__fastcall",
+    "M": "__clrcall",
+    "Q": "__vectorcall",
+}
+
+# cv qualifier codes of pointees, this and variables.
+CV_QUALIFIERS = {
+    "A": "",
+    "B": "const",
+    "C": "volatile",
+    "D": "const volatile",
+}
+
+# Function access and kind codes: access, kind.
+FUNCTION_CLASSES = {
+    "A": ("private: ", "member"),
+    "B": ("private: ", "member"),
+    "C": ("private: ", "static"),
+    "D": ("private: ", "static"),
+    "E": ("private: ", "virtual"),
+    "F": ("private: ", "virtual"),
+    "G": ("private: ", "thunk"),
+    "H": ("private: ", "thunk"),
+    "I": ("protected: ", "member"),
+    "J": ("protected: ", "member"),
+    "K": ("protected: ", "static"),
+    "L": ("protected: ", "static"),
+    "M": ("protected: ", "virtual"),
+    "N": ("protected: ", "virtual"),
+    "O": ("protected: ", "thunk"),
+    "P": ("protected: ", "thunk"),
+    "Q": ("public: ", "member"),
+    "R": ("public: ", "member"),
+    "S": ("public: ", "static"),
+    "T": ("public: ", "static"),
+    "U": ("public: ", "virtual"),
+    "V": ("public: ", "virtual"),
+    "W": ("public: ", "thunk"),
+    "X": ("public: ", "thunk"),
+    "Y": ("", "global"),
+    "Z": ("", "global"),
+}
+
+# Variable storage codes.
+VARIABLE_ACCESS = {
+    "0": "private: static ",
+    "1": "protected: static ",
+    "2": "public: static ",
+    "3": "",
+    "4": "",
+}
+
+OPERATORS = {
+    "2": "operator new",
+    "3": "operator delete",
+    "4": "operator=",
+    "5": "operator>>",
+    "6": "operator<<",
+    "7": "operator!",
+    "8": "operator==",
+    "9": "operator!=",
+    "A": "operator[]",
+    "C": "operator->",
+    "D": "operator*",
+    "E": "operator++",
+    "F": "operator--",
+    "G": "operator-",
+    "H": "operator+",
+    "I": "operator&",
+    "J": "operator->*",
+    "K": "operator/",
+    "L": "operator%",
+    "M": "operator<",
+    "N": "operator<=",
+    "O": "operator>",
+    "P": "operator>=",
+    "Q": "operator,",
+    "R": "operator()",
+    "S": "operator~",
+    "T": "operator^",
+    "U": "operator|",
+    "V": "operator&&",
+    "W": "operator||",
+    "X": "operator*=",
+    "Y": "operator+=",
+    "Z": "operator-=",
+    "_0": "operator/=",
+    "_1": "operator%=",
+    "_2": "operator>>=",
+    "_3": "operator<<=",
+    "_4": "operator&=",
+    "_5": "operator|=",
+    "_6": "operator^=",
+    "_7": "`vftable'",
+    "_8": "`vbtable'",
+    "_9": "`vcall'",
+    "_A": "`typeof'",
+    "_B": "`local static guard'",
+    "_C": "`string'",
+    "_D": "`vbase destructor'",
+    "_E": "`vector deleting destructor'",
+    "_F": "`default constructor closure'",
+    "_G": "`scalar deleting destructor'",
+    "_H": "`vector constructor iterator'",
+    "_I": "`vector destructor iterator'",
+    "_J": "`vector vbase constructor iterator'",
+    "_K": "`virtual displacement map'",
+    "_L": "`eh vector constructor iterator'",
+    "_M": "`eh vector destructor iterator'",
+    "_N": "`eh vector vbase constructor iterator'",
+    "_O": "`copy constructor closure'",
+    "_S": "`local vftable'",
+    "_T": "`local vftable constructor closure'",
+    "_U": "operator new[]",
+    "_V": "operator delete[]",
+    "_X": "`placement delete closure'",
+    "_Y": "`placement delete[] closure'",
+    "__L": "operator co_await",
+    "__M": "operator<=>",
+}
+
+# Special names followed by the name of the variable they refer to.
+INIT_FINI_STUBS = {
+    "__E": "dynamic initializer",
+    "__F": "dynamic atexit destructor",
+}
+
+CONSTRUCTOR = "?0"
+DESTRUCTOR = "?1"
+CONVERSION_OPERATOR = "?B"
+
+MAX_BACK_REFERENCES = 10
+
+
+@dataclass
+class _Type:
+    """
+    A demangled type. Declarators of function pointers wrap what they declare,
+    which goes between left and right.
+    """
+
+    left: str
+    right: str = ""
+
+    def __str__(self) -> str:
+        return self.left + self.right
+
+
+def _template_name(name: str, args: list[str]) -> str:
+    joined = ",".join(args)
+    return f"{name}<{joined}{' ' if joined.endswith('>') else ''}>"
+
+
+class _Parser:
+    def __init__(self, mangled: str):
+        self.s = mangled
+        self.i = 0
+        self.names: list[str] = []
+        self.params: list[_Type] = []
+
+    def error(self, what: str) -> DemangleError:
+        return DemangleError(f"{what} at offset {self.i} of {self.s!r}")
+
+    def peek(self, n: int = 1) -> str:
+        return self.s[self.i : self.i + n]
+
+    def consume(self, prefix: str) -> bool:
+        if self.s.startswith(prefix, self.i):
+            self.i += len(prefix)
+            return True
+        return False
+
+    def next(self) -> str:
+        if self.i >= len(self.s):
+            raise self.error("unexpected end")
+        c = self.s[self.i]
+        self.i += 1
+        return c
+
+    def expect(self, c: str) -> None:
+        if not self.consume(c):
+            raise self.error(f"expected {c!r}")
+
+    # -------------------------------------------------------------------------
+    # Numbers and names
+
+    def number(self) -> int:
+        negative = self.consume("?")
+        c = self.next()
+        if c.isdigit():
+            value = int(c) + 1
+        else:
+            value = 0
+            while c != "@":
+                if not "A" <= c <= "P":
+                    raise self.error("bad number")
+                value = value * 16 + ord(c) - ord("A")
+                c = self.next()
+        return -value if negative else value
+
+    def memorize_name(self, name: str) -> None:
+        if len(self.names) < MAX_BACK_REFERENCES and name not in self.names:
+            self.names.append(name)
+
+    def simple_name(self, memorize: bool) -> str:
+        end = self.s.find("@", self.i)
+        if end <= self.i:
+            raise self.error("bad name")
+        name = self.s[self.i : end]
+        self.i = end + 1
+        if memorize:
+            self.memorize_name(name)
+        return name
+
+    def back_reference_name(self) -> str:
+        index = int(self.next())
+        if index >= len(self.names):
+            raise self.error("bad name back reference")
+        return self.names[index]
+
+    def operator_name(self) -> str:
+        """Name of an operator or special member, after its leading ?."""
+        for code in (self.peek(3), self.peek(2), self.peek(1)):
+            if code in OPERATORS:
+                self.i += len(code)
+                return OPERATORS[code]
+        raise self.error("unsupported operator")
+
+    def template_name(self, memorize: bool) -> str:
+        """A template instantiation name, after its leading ?$."""
+        outer_names, outer_params = self.names, self.params
+        self.names, self.params = [], []
+
+        if self.consume("?"):
+            if self.peek() in ("0", "1", "B"):
+                raise self.error("unsupported template special member")
+            name = self.operator_name()
+        else:
+            name = self.simple_name(memorize=True)
+        args = self.template_args()
+
+        self.names, self.params = outer_names, outer_params
+
+        name = _template_name(name, args)
+        if memorize:
+            self.memorize_name(name)
+        return name
+
+    def special_member_template_args(self) -> str:
+        """Template arguments of a constructor or destructor template."""
+        outer_names, outer_params = self.names, self.params
+        self.names, self.params = [], []
+        args = self.template_args()
+        self.names, self.params = outer_names, outer_params
+        return _template_name("", args)
+
+    def template_args(self) -> list[str]:
+        args: list[str] = []
+        while not self.consume("@"):
+            if self.consume("$0"):
+                args.append(str(self.number()))
+            elif self.consume("$$V") or self.consume("$$Z") or self.consume("$S"):
+                pass
+            elif self.consume("$$C"):
+                args.append(str(self.qualified_type(self.next())))
+            elif self.peek().isdigit():
+                args.append(str(self.back_reference_param()))
+            elif self.peek() == "$" and self.peek(3) not in ("$$Q", "$$R", "$$T"):
+                raise self.error("unsupported template argument")
+            else:
+                args.append(str(self.param()))
+        return args
+
+    def scope_piece(self) -> str:
+        if self.peek().isdigit():
+            return self.back_reference_name()
+        if self.consume("?$"):
+            return self.template_name(memorize=True)
+        if self.consume("?A0x"):
+            self.simple_name(memorize=False)
+            return "`anonymous namespace'"
+        if self.peek() == "?":
+            raise self.error("unsupported nested name")
+        return self.simple_name(memorize=True)
+
+    def scope(self) -> list[str]:
+        """Enclosing scopes of a name, innermost first, up to the final @."""
+        pieces: list[str] = []
+        while not self.consume("@"):
+            pieces.append(self.scope_piece())
+        return pieces
+
+    def type_name(self) -> str:
+        """Fully qualified name of a class, struct, union or enum."""
+        if self.peek().isdigit():
+            pieces = [self.back_reference_name()]
+        elif self.consume("?$"):
+            pieces = [self.template_name(memorize=True)]
+        else:
+            pieces = [self.simple_name(memorize=True)]
+        pieces += self.scope()
+        return "::".join(reversed(pieces))
+
+    # -------------------------------------------------------------------------
+    # Types
+
+    def cv(self) -> str:
+        c = self.next()
+        if c not in CV_QUALIFIERS:
+            raise self.error("bad cv qualifier")
+        return CV_QUALIFIERS[c]
+
+    def pointer_modifiers(self) -> str:
+        modifiers = ""
+        while True:
+            if self.consume("E"):
+                modifiers += " __ptr64"
+            elif self.consume("I"):
+                modifiers += " __restrict"
+            elif self.consume("F"):
+                modifiers += " __unaligned"
+            else:
+                return modifiers
+
+    def function_type(self, declarator: str, this_cv: bool) -> _Type:
+        """
+        Calling convention, return and parameter types of a function pointer
+        type, after its pointer code.
+        """
+        suffix = ""
+        if this_cv:
+            suffix = self.function_qualifiers()
+        cc = self.calling_convention()
+        ret = self.return_type()
+        params = self.params_list()
+        self.throw_spec()
+
+        return _Type(f"{ret} ({cc}{declarator}", f")({params}){suffix}")
+
+    def pointer(self, symbol: str, own_cv: str) -> _Type:
+        if self.consume("6"):
+            return self.function_type(symbol + own_cv, this_cv=False)
+        if self.consume("8"):
+            cls = self.type_name()
+            return self.function_type(f" {cls}::{symbol}{own_cv}", this_cv=True)
+
+        modifiers = self.pointer_modifiers()
+        c = self.next()
+        member_of = ""
+        if c in "QRST":
+            member_of = self.type_name() + "::"
+            c = "ABCD"["QRST".index(c)]
+        if c not in CV_QUALIFIERS:
+            raise self.error("bad pointee cv qualifier")
+        pointee_cv = CV_QUALIFIERS[c]
+
+        pointee = self.type()
+        left = pointee.left
+        if pointee_cv:
+            left += " " + pointee_cv
+        if pointee.right:
+            return _Type(f"{left}{member_of}{symbol}", pointee.right)
+        return _Type(f"{left} {member_of}{symbol}{own_cv}{modifiers}")
+
+    def type(self) -> _Type:
+        c = self.next()
+        if c in PRIMITIVE_TYPES:
+            return _Type(PRIMITIVE_TYPES[c])
+        if c == "_":
+            e = self.next()
+            if e not in EXTENDED_TYPES:
+                raise self.error("unsupported type")
+            return _Type(EXTENDED_TYPES[e])
+        if c in CLASS_KINDS:
+            return _Type(f"{CLASS_KINDS[c]} {self.type_name()}")
+        if c == "W":
+            self.expect("4")
+            return _Type(f"enum {self.type_name()}")
+        if c == "P":
+            return self.pointer("*", "")
+        if c == "Q":
+            return self.pointer("*", " const")
+        if c == "R":
+            return self.pointer("*", " volatile")
+        if c == "S":
+            return self.pointer("*", " const volatile")
+        if c == "A":
+            return self.pointer("&", "")
+        if c == "B":
+            return self.pointer("&", " volatile")
+        if c == "$":
+            if self.consume("$Q"):
+                return self.pointer("&&", "")
+            if self.consume("$R"):
+                return self.pointer("&&", " volatile")
+            if self.consume("$T"):
+                return _Type("std::nullptr_t")
+            if self.consume("$C"):
+                return self.qualified_type(self.next())
+        if c == "?":
+            return self.qualified_type(self.next())
+        self.i -= 1
+        raise self.error("unsupported type")
+
+    def qualified_type(self, cv_code: str) -> _Type:
+        if cv_code not in CV_QUALIFIERS:
+            raise self.error("bad cv qualifier")
+        t = self.type()
+        cv = CV_QUALIFIERS[cv_code]
+        return _Type(f"{t.left} {cv}" if cv else t.left, t.right)
+
+    def back_reference_param(self) -> _Type:
+        index = int(self.next())
+        if index >= len(self.params):
+            raise self.error("bad type back reference")
+        return self.params[index]
+
+    def param(self) -> _Type:
+        if self.peek().isdigit():
+            return self.back_reference_param()
+        start = self.i
+        t = self.type()
+        if self.i - start > 1 and len(self.params) < MAX_BACK_REFERENCES:
+            self.params.append(t)
+        return t
+
+    def params_list(self) -> str:
+        if self.consume("X"):
+            return "void"
+        params: list[str] = []
+        while True:
+            if self.consume("@"):
+                break
+            if self.consume("Z"):
+                params.append("...")
+                break
+            params.append(str(self.param()))
+        return ",".join(params)
+
+    def return_type(self) -> str:
+        if self.consume("@"):
+            return ""
+        return str(self.type())
+
+    def calling_convention(self) -> str:
+        c = self.next()
+        if c not in CALLING_CONVENTIONS:
+            raise self.error("unsupported calling convention")
+        return CALLING_CONVENTIONS[c]
+
+    def function_qualifiers(self) -> str:
+        """Qualifiers of this of a member function, as printed after it."""
+        ptr64 = ""
+        while True:
+            if self.consume("E"):
+                ptr64 = "__ptr64"
+            elif self.consume("I") or self.consume("F"):
+                pass
+            else:
+                break
+        cv = self.cv()
+        suffix = "".join(f"{x} " for x in cv.split())
+        if ptr64:
+            suffix += ptr64 if suffix else " " + ptr64
+        return suffix
+
+    def throw_spec(self) -> None:
+        if not self.consume("Z") and not self.consume("_E"):
+            raise self.error("expected throw specification")
+
+    # -------------------------------------------------------------------------
+    # Symbols
+
+    def symbol(self) -> str:
+        self.expect("?")
+
+        if self.consume("?_C@"):
+            # String literals, named by their length, checksum and contents.
+            self.i = len(self.s)
+            return "`string'"
+
+        special: str | None = None
+        template_args = ""
+        if self.peek(4) in ("?$" + CONSTRUCTOR, "?$" + DESTRUCTOR):
+            # Constructor templates, named after their class like constructors.
+            self.i += 3
+            special = "?" + self.next()
+            template_args = self.special_member_template_args()
+            name = ""
+        elif self.consume("?$"):
+            name = self.template_name(memorize=False)
+        elif self.peek() == "?":
+            self.i += 1
+            code = self.peek(3)
+            if code in INIT_FINI_STUBS:
+                self.i += 3
+                variable = self.simple_name(memorize=False)
+                name = f"`{INIT_FINI_STUBS[code]} for '{variable}''"
+            elif self.peek() in ("0", "1", "B"):
+                special = "?" + self.next()
+                name = ""
+            else:
+                name = self.operator_name()
+        else:
+            name = self.simple_name(memorize=True)
+
+        scope = self.scope()
+        if special in (CONSTRUCTOR, DESTRUCTOR):
+            if not scope:
+                raise self.error("constructor outside of a class")
+            name = scope[0] if special == CONSTRUCTOR else "~" + scope[0]
+            name += template_args
+        qualified = "::".join(list(reversed(scope)) + [name])
+
+        return self.encoding(qualified, special)
+
+    def encoding(self, qualified: str, special: str | None) -> str:
+        c = self.next()
+
+        if c in VARIABLE_ACCESS:
+            t = self.type()
+            cv = self.cv()
+            if cv:
+                t = _Type(f"{t.left} {cv}", t.right)
+            return f"{VARIABLE_ACCESS[c]}{t.left} {qualified}{t.right}"
+
+        if c in "67":
+            cv = self.cv()
+            for_scopes: list[str] = []
+            while not self.consume("@"):
+                for_scopes.append(self.type_name())
+            suffix = "".join(f"{{for `{x}'}}" for x in for_scopes)
+            return f"{cv} {qualified}{suffix}" if cv else f"{qualified}{suffix}"
+
+        if c not in FUNCTION_CLASSES:
+            self.i -= 1
+            raise self.error("unsupported symbol kind")
+        access, kind = FUNCTION_CLASSES[c]
+
+        prefix = access
+        name_suffix = ""
+        if kind == "thunk":
+            prefix = "[thunk]:" + access + "virtual "
+            name_suffix = f"`adjustor{{{self.number()}}}' "
+        elif kind in ("static", "virtual"):
+            prefix += kind + " "
+
+        this = ""
+        if kind not in ("static", "global"):
+            this = self.function_qualifiers()
+
+        cc = self.calling_convention()
+        if self.consume("?"):
+            ret = str(self.qualified_type(self.next()))
+        else:
+            ret = self.return_type()
+        params = self.params_list()
+        self.throw_spec()
+
+        if special == CONVERSION_OPERATOR:
+            qualified += "operator " + ret
+            ret = ""
+
+        ret = ret + " " if ret else ""
+        return f"{prefix}{ret}{cc} {qualified}{name_suffix}({params}){this}"
+
+
+def demangle(name: str) -> str:
+    """
+    The undname undecoration of an MSVC decorated name. Names that aren't
+    decorated (not starting with ?) are returned unchanged. Raises
+    DemangleError for decorated names that aren't supported.
+    """
+    if not name.startswith("?"):
+        return name
+
+    parser = _Parser(name)
+    demangled = parser.symbol()
+    if parser.i != len(name):
+        raise parser.error("trailing characters")
+    return demangled
+
+
+def undname(names: list[str]) -> dict[str, str]:
+    """
+    Demangle names with undname, one process per UNDNAME_BATCH_SIZE names.
+    Returns the names undname demangled, which is none if it isn't available.
+    """
+    demangled: dict[str, str] = {}
+
+    for i in range(0, len(names), UNDNAME_BATCH_SIZE):
+        batch = names[i : i + UNDNAME_BATCH_SIZE]
+        try:
+            res = subprocess.run(["undname", *batch], capture_output=True)
+        except FileNotFoundError:
+            LOGGER.debug("undname is not available")
+            return demangled
+
+        undecorated = [
+            line[len('is :- "') : -1]
+            for line in str(res.stdout, "UTF-8").splitlines()
+            if line.startswith('is :- "')
+        ]
+        if len(undecorated) == len(batch):
+            demangled.update(zip(batch, undecorated))
+
+    return demangled
+
+
+class Demangler:
+    """
+    demangle() with an on-disk cache of decorated name -> undecoration, shared
+    between projects, falling back to undname for unsupported names. Names
+    neither can demangle are left unchanged.
+    """
+
+    def __init__(self, cache_path: Path | None = DEFAULT_CACHE_PATH):
+        self.__cache_path = cache_path
+        self.__cache: dict[str, str] = {}
+        self.__new: dict[str, str] = {}
+
+        if cache_path is not None and cache_path.exists():
+            with cache_path.open(encoding="utf-8") as f:
+                for line in f:
+                    mangled, sep, demangled = line.rstrip("\n").partition("\t")
+                    if sep:
+                        self.__cache[mangled] = demangled
+
+    def demangle_all(self, names: Iterable[str]) -> dict[str, str]:
+        """Demangle many names, with one undname batch for unsupported ones."""
+        demangled: dict[str, str] = {}
+        unsupported: list[str] = []
+
+        for name in names:
+            if name in demangled:
+                continue
+            if not name.startswith("?"):
+                demangled[name] = name
+                continue
+            if name in self.__cache:
+                demangled[name] = self.__cache[name]
+                continue
+            try:
+                demangled[name] = demangle(name)
+            except DemangleError as e:
+                LOGGER.debug("%s", e)
+                unsupported.append(name)
+                continue
+            self.__new[name] = demangled[name]
+
+        if unsupported:
+            undecorated = undname(unsupported)
+            self.__new.update(undecorated)
+            for name in unsupported:
+                demangled[name] = undecorated.get(name, name)
+
+        self.__cache.update(self.__new)
+        return demangled
+
+    def demangle(self, name: str) -> str:
+        return self.demangle_all([name])[name]
+
+    def save(self) -> None:
+        """Append the names demangled since loading or saving to the cache."""
+        if self.__cache_path is None or not self.__new:
+            return
+
+        self.__cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.__cache_path.open("a", encoding="utf-8") as f:
+            for mangled, demangled in self.__new.items():
+                f.write(f"{mangled}\t{demangled}\n")
+        self.__new = {}
@@ -0,0 +1,262 @@
+"""
+Saved postgame state, so the object traces of a new game run can be folded into
+an existing analysis without processing the traces of earlier runs again.
+
+The state holds what the dynamic passes derive from object traces up to the
+swim passes: the methods with their statistics and initializer/finalizer flags,
+the split traces seen so far by digest, the trace groups with their distinct
+head calls and heads and tails, and for each method the class moves construct_trie
+and the swim passes made. Ingesting traces only computes the moves of groups
+and patterns the new traces add, so only the groups they touch are swum.
+
+A full run handles traces in digest order (see Postgame.construct_trie), so
+groups, patterns and methods come in the order of the smallest digest of their
+traces. The state keeps these digests, which tell where new traces fall in that
+order, and ordered_methods and class_moves give the trie and the class sets the
+order of a full run over all the runs ingested so far.
+
+A full run splits all traces at initializers and finalizers identified in any
+run. When a run identifies new ones splitting traces of earlier runs, the
+stored traces are split again and all of them are ingested anew, as in a full
+run.
+
+The reorganization passes restructure the trie in place, so they run again on
+top of the state.
+"""
+
+from __future__ import annotations
+
+import gzip
+import logging
+import os
+import pickle
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable
+
+import postgame.swim as swim
+from parseconfig import AnalysisTool
+from postgame.method_store import MethodStore
+from postgame.object_trace import ObjectTrace, TraceEntry
+
+LOGGER = logging.getLogger(__name__)
+
+# Bumped whenever the saved state changes, so states written by older code are
+# rejected instead of silently misread.
+STATE_VERSION = 2
+
+COMPRESS_LEVEL = 1
+
+# Passes moving methods between classes, in the order a full run applies them.
+CONSTRUCT = 0
+DESTRUCTORS = 1
+CONSTRUCTORS = 2
+CTOR_DTOR_METHODS = 3
+
+# (pass, group, pattern index, delta index, class to remove the method from,
+# class to add it to). construct_trie doesn't remove methods from classes.
+Move = tuple[int, swim.Trace, int, int, swim.Trace, swim.Trace]
+
+# (number of head calls, head, tail)
+HeadTail = tuple[int, tuple[swim.Entry, ...], tuple[swim.Entry, ...]]
+
+
+@dataclass
+class GroupState:
+    """
+    The smallest digest of the traces of a group, of its traces calling each
+    method and of its traces with each pattern.
+    """
+
+    first: bytes
+    methods: dict[int, bytes] = field(default_factory=dict)
+    head_call_patterns: dict[swim.Trace, int] = field(default_factory=dict)
+    head_tail_patterns: dict[HeadTail, int] = field(default_factory=dict)
+    # Indexed by the patterns of both kinds.
+    pattern_firsts: list[bytes] = field(default_factory=list)
+
+    def add_pattern(self, patterns: dict, key: object, digest: bytes) -> int | None:
+        """Index of a new pattern, or None if the group already has it."""
+        pattern = patterns.get(key)
+        if pattern is not None:
+            self.pattern_firsts[pattern] = min(self.pattern_firsts[pattern], digest)
+            return None
+
+        pattern = len(self.pattern_firsts)
+        patterns[key] = pattern
+        self.pattern_firsts.append(digest)
+        return pattern
+
+
+class PostgameState:
+    def __init__(self, analysis_tool: AnalysisTool):
+        self.version = STATE_VERSION
+        self.analysis_tool = analysis_tool
+
+        self.method_store = MethodStore()
+        self.traces: dict[bytes, tuple[swim.Entry, ...]] = {}
+        self.groups: dict[swim.Trace, GroupState] = {}
+        self.moves: dict[int, list[Move]] = defaultdict(list)
+
+        # Method address -> smallest (digest, position in ObjectTrace.methods)
+        # of the traces calling it.
+        self.method_firsts: dict[int, tuple[bytes, int]] = {}
+
+    @staticmethod
+    def load(path: Path) -> PostgameState | None:
+        """Load the state saved at path, or None if there is none."""
+        if not path.exists():
+            return None
+
+        with gzip.open(path, "rb") as f:
+            state = pickle.load(f)
+
+        if not isinstance(state, PostgameState) or state.version != STATE_VERSION:
+            msg = f"{path} was saved by another version of the postgame"
+            raise ValueError(msg)
+
+        return state
+
+    def save(self, path: Path) -> None:
+        # Write to a temporary file first so an interrupted run never leaves a
+        # partial state behind.
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with gzip.open(tmp_path, "wb", compresslevel=COMPRESS_LEVEL) as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    def new_traces(self, traces: Iterable[ObjectTrace]) -> list[ObjectTrace]:
+        """The traces not seen before, which are now stored."""
+        new_traces: list[ObjectTrace] = []
+        for ot in traces:
+            digest = ot.digest()
+            if digest not in self.traces:
+                self.traces[digest] = swim.entries(ot.get_trace_entries())
+                new_traces.append(ot)
+        return new_traces
+
+    def split_traces(self) -> bool:
+        """
+        Split the stored traces at the initializers and finalizers flagged in
+        the method store. If any trace was split, the groups and moves are
+        cleared to ingest all the traces again, and True is returned.
+        """
+        split = False
+        for digest, entries in list(self.traces.items()):
+            split_trace = self.__object_trace(entries).split()
+            if split_trace:
+                split = True
+                del self.traces[digest]
+                self.new_traces(split_trace)
+
+        if split:
+            self.groups = {}
+            self.moves = defaultdict(list)
+            self.method_firsts = {}
+        return split
+
+    def object_traces(self) -> list[ObjectTrace]:
+        return [self.__object_trace(x) for x in self.traces.values()]
+
+    def __object_trace(self, entries: tuple[swim.Entry, ...]) -> ObjectTrace:
+        trace_entries: list[TraceEntry] = []
+        for addr, is_call in entries:
+            method = self.method_store.get_method(addr)
+            assert method is not None
+            trace_entries.append(TraceEntry(method, is_call))
+        return ObjectTrace(trace_entries)
+
+    def ingest(self, traces: Iterable[ObjectTrace]) -> int:
+        """
+        Add the groups, patterns and class moves of the traces, whose method
+        statistics must already be updated. Returns the number of new moves.
+        """
+        lego = self.analysis_tool == AnalysisTool.LEGO
+        count = 0
+
+        def add_moves(
+            pass_index: int,
+            fingerprint: swim.Trace,
+            pattern: int,
+            deltas: list[swim.Delta],
+        ) -> None:
+            nonlocal count
+            for i, (addr, remove_trace, add_trace) in enumerate(deltas):
+                self.moves[addr].append(
+                    (pass_index, fingerprint, pattern, i, remove_trace, add_trace)
+                )
+            count += len(deltas)
+
+        for ot in traces:
+            digest = ot.digest()
+            fingerprint = swim.addresses(ot.tail_returns())
+
+            group = self.groups.get(fingerprint)
+            if group is None:
+                group = GroupState(digest)
+                self.groups[fingerprint] = group
+                add_moves(
+                    DESTRUCTORS, fingerprint, 0, swim.destructor_deltas(fingerprint)
+                )
+            group.first = min(group.first, digest)
+
+            for position, method in enumerate(ot.methods()):
+                addr = method.address
+                self.method_firsts[addr] = min(
+                    self.method_firsts.get(addr, (digest, position)),
+                    (digest, position),
+                )
+                if addr not in group.methods:
+                    group.methods[addr] = digest
+                    add_moves(CONSTRUCT, fingerprint, 0, [(addr, (), fingerprint)])
+                group.methods[addr] = min(group.methods[addr], digest)
+
+            if lego:
+                continue
+
+            head_calls = swim.addresses(ot.head_calls())
+            pattern = group.add_pattern(group.head_call_patterns, head_calls, digest)
+            if pattern is not None:
+                add_moves(
+                    CONSTRUCTORS,
+                    fingerprint,
+                    pattern,
+                    swim.constructor_deltas(fingerprint, head_calls),
+                )
+
+            head, tail = swim.entries(ot.head()), swim.entries(ot.tail())
+            pattern = group.add_pattern(
+                group.head_tail_patterns, (len(head_calls), head, tail), digest
+            )
+            if pattern is not None:
+                add_moves(
+                    CTOR_DTOR_METHODS,
+                    fingerprint,
+                    pattern,
+                    swim.ctor_dtor_method_deltas(fingerprint, head_calls, head, tail),
+                )
+
+        return count
+
+    def ordered_groups(self) -> list[swim.Trace]:
+        """Fingerprints of the groups, in the order of a full run."""
+        return sorted(self.groups, key=lambda x: self.groups[x].first)
+
+    def ordered_methods(self) -> list[int]:
+        """Addresses of the methods in traces, in the order of a full run."""
+        return sorted(self.method_firsts, key=self.method_firsts.__getitem__)
+
+    def class_moves(self, addr: int) -> list[Move]:
+        """The moves of a method, in the order of a full run."""
+
+        def key(move: Move) -> tuple[int, bytes, bytes, int]:
+            pass_index, fingerprint, pattern, i, _, _ = move
+            group = self.groups[fingerprint]
+            if pass_index == CONSTRUCT:
+                return (pass_index, group.methods[addr], b"", i)
+            if pass_index == DESTRUCTORS:
+                return (pass_index, group.first, b"", i)
+            return (pass_index, group.first, group.pattern_firsts[pattern], i)
+
+        return sorted(self.moves[addr], key=key)
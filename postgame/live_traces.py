@@ -0,0 +1,202 @@
+"""
+Object traces read live from a named pipe or a Unix socket while the game runs,
+and a producer replaying recorded traces into one, standing in for the pintool.
+
+The pintool opens object-traces with an ofstream, truncating it at startup and
+appending each batch of about a thousand finished traces, so it can only write
+to a FIFO. The FIFO is read until the game exits, which the pintool signals by
+writing the blacklisted methods last, after the final traces. It is opened for
+reading and writing, so the pintool closing it between batches is no end of
+file and its next open never waits for a reader.
+
+Otherwise the reader listens on a Unix socket at the path and reads the first
+connection until the producer closes it. Traces are delimited by empty lines as
+in object-traces files, so they are parsed as they arrive.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import select
+import socket
+import stat
+import time
+from contextlib import contextmanager
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Generator, Iterable, TextIO
+
+from postgame.parse_object_trace import iter_trace_blocks
+
+LOGGER = logging.getLogger(__name__)
+
+# How long the producer waits for the reader to listen on a socket.
+CONNECT_TIMEOUT = 30.0
+
+# How often the FIFO reader checks whether the game exited while no traces come.
+POLL_INTERVAL = 0.1
+
+READ_SIZE = 1 << 16
+
+# Traces the pintool writes at once (FINISHED_OBJECT_TRACES_MAX_SIZE).
+BATCH_SIZE = 1000
+
+
+def _is_fifo(path: Path) -> bool:
+    return path.exists() and stat.S_ISFIFO(path.stat().st_mode)
+
+
+def _is_socket(path: Path) -> bool:
+    return path.exists() and stat.S_ISSOCK(path.stat().st_mode)
+
+
+def _written(path: Path) -> Callable[[], bool]:
+    """
+    Whether path was written since this was called, and hasn't changed since
+    the previous check, so it isn't read while still being written.
+    """
+
+    def file_stat() -> tuple[int, int, int] | None:
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return None
+        return st.st_ino, st.st_mtime_ns, st.st_size
+
+    before = last = file_stat()
+
+    def written() -> bool:
+        nonlocal last
+        current = file_stat()
+        stable = current == last
+        last = current
+        return current != before and stable
+
+    return written
+
+
+def _read_fifo(fd: int, done: Callable[[], bool]) -> Generator[str, None, None]:
+    """The lines read from fd, until done and nothing is left to read."""
+    poller = select.poll()
+    poller.register(fd, select.POLLIN)
+
+    finished = False
+    pending = b""
+    while True:
+        if poller.poll(POLL_INTERVAL * 1000):
+            lines = (pending + os.read(fd, READ_SIZE)).split(b"\n")
+            pending = lines.pop()
+            for line in lines:
+                yield line.decode() + "\n"
+        elif finished:
+            break
+        else:
+            # Drain what the game wrote before exiting first.
+            finished = done()
+
+    if pending:
+        yield pending.decode()
+
+
+@contextmanager
+def open_live(
+    path: Path, blacklisted_methods_path: Path
+) -> Generator[Iterable[str], None, None]:
+    """
+    The lines written to the FIFO or Unix socket at path, until the game writes
+    blacklisted_methods_path on exit or the socket is closed.
+    """
+    if _is_fifo(path):
+        # Only a blacklist written after the FIFO is opened ends the traces.
+        done = _written(blacklisted_methods_path)
+        LOGGER.info("waiting for traces on FIFO %s", path)
+        fd = os.open(path, os.O_RDWR)
+        try:
+            yield _read_fifo(fd, done)
+        finally:
+            os.close(fd)
+        return
+
+    if path.exists() and not _is_socket(path):
+        msg = f"{path} is neither a FIFO nor a Unix socket"
+        raise ValueError(msg)
+
+    # A socket left behind by an earlier reader.
+    path.unlink(missing_ok=True)
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(str(path))
+        try:
+            server.listen(1)
+            LOGGER.info("waiting for traces on socket %s", path)
+            conn, _ = server.accept()
+            with conn, conn.makefile("r") as f:
+                yield f
+        finally:
+            path.unlink(missing_ok=True)
+
+
+@contextmanager
+def _connect(target: Path) -> Generator[TextIO, None, None]:
+    deadline = time.monotonic() + CONNECT_TIMEOUT
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        while True:
+            try:
+                conn.connect(str(target))
+                break
+            except (FileNotFoundError, ConnectionRefusedError):
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.05)
+
+        with conn.makefile("w") as f:
+            yield f
+
+
+def _write(out: TextIO, blocks: Iterable[list[str]], delay: float) -> int:
+    count = 0
+    for block in blocks:
+        if not block[-1].endswith("\n"):
+            block[-1] += "\n"
+        out.write("".join(block) + "\n")
+        out.flush()
+
+        count += 1
+        if delay > 0:
+            time.sleep(delay)
+    return count
+
+
+def replay(
+    traces_path: Path,
+    target: Path,
+    blacklisted_methods_path: Path,
+    delay: float = 0.0,
+    batch_size: int = BATCH_SIZE,
+) -> int:
+    """
+    Write the traces recorded at traces_path to the FIFO or Unix socket at
+    target, one at a time and delay seconds apart, then rewrite
+    blacklisted_methods_path as the pintool does on exit. Like the pintool, a
+    FIFO is truncated first and opened again for each batch of batch_size
+    traces. Returns the number of traces.
+    """
+    count = 0
+    with traces_path.open() as f:
+        blocks = iter_trace_blocks(f)
+        if _is_fifo(target):
+            target.open("w").close()
+            while batch := list(islice(blocks, batch_size)):
+                with target.open("a") as out:
+                    count += _write(out, batch, delay)
+        else:
+            with _connect(target) as out:
+                count = _write(out, blocks, delay)
+
+    # A new file, so the reader sees it written even within its clock's tick.
+    path = blacklisted_methods_path
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_bytes(path.read_bytes())
+    os.replace(tmp_path, path)
+    return count
@@ -0,0 +1,178 @@
+"""
+Streaming merge of the object traces and name maps of several game runs.
+
+Each run's traces are read in chunks of at most chunk_traces distinct traces,
+which are counted, sorted by content digest and spilled to temporary files. The
+chunks of all the runs are then merged in digest order, so each distinct trace
+is written once along with its number of occurrences in each run, while at most
+one chunk is held in memory. Name maps are merged the same way in address order.
+Where runs disagree on the name of an address, the first run's name is kept.
+
+Given the runs' object traces paths, the merge writes:
+
+    <output>            the distinct traces, in digest order
+    <output>-name-map   the merged name maps, in address order
+    <output>-runs       a "<digest> <count in each run...>" line per trace
+"""
+
+from __future__ import annotations
+
+import heapq
+import logging
+import tempfile
+from collections import Counter
+from contextlib import ExitStack
+from itertools import groupby
+from pathlib import Path
+from typing import Generator, Iterable, TextIO
+
+from postgame.object_trace import trace_digest
+from postgame.parse_object_trace import iter_trace_blocks, parse_entry
+
+LOGGER = logging.getLogger(__name__)
+
+# Distinct traces, or name map lines, held in memory per run.
+CHUNK_TRACES = 100_000
+
+
+def name_map_path(object_traces_path: Path) -> Path:
+    return Path(f"{object_traces_path}-name-map")
+
+
+def runs_path(object_traces_path: Path) -> Path:
+    return Path(f"{object_traces_path}-runs")
+
+
+def _format_entry(addr: int, is_call: bool) -> str:
+    return f"{addr:x} 1" if is_call else f"{addr:x}"
+
+
+def _trace_chunks(
+    run: int,
+    lines: Iterable[str],
+    chunk_traces: int,
+) -> Generator[list[str], None, None]:
+    """
+    Sorted "<digest> <run> <count> <entries>" records of the distinct traces
+    of each chunk of a run, entries being the trace's lines joined by commas.
+    """
+    counts: Counter[tuple[tuple[int, bool], ...]] = Counter()
+
+    def records() -> list[str]:
+        return sorted(
+            f"{trace_digest(entries).hex()} {run} {count} "
+            f"{','.join(_format_entry(*x) for x in entries)}\n"
+            for entries, count in counts.items()
+        )
+
+    for block in iter_trace_blocks(lines):
+        counts[tuple(map(parse_entry, block))] += 1
+        if len(counts) >= chunk_traces:
+            yield records()
+            counts.clear()
+
+    if counts:
+        yield records()
+
+
+def _name_chunks(
+    run: int,
+    lines: Iterable[str],
+    chunk_lines: int,
+) -> Generator[list[str], None, None]:
+    """Sorted "<address> <run> <name>" records of each chunk of a name map."""
+    chunk: list[str] = []
+    for line in lines:
+        split_line = line.rstrip("\n").split(" ", 1)
+        if len(split_line) == 2:
+            # Fixed width fields sort in address, then run order.
+            chunk.append(f"{int(split_line[0], 16):016x} {run:06} {split_line[1]}\n")
+            if len(chunk) >= chunk_lines:
+                yield sorted(chunk)
+                chunk = []
+
+    if chunk:
+        yield sorted(chunk)
+
+
+class _Spill:
+    """Sorted chunks of records spilled to temporary files, merged back in order."""
+
+    def __init__(self, stack: ExitStack, tmp_dir: Path):
+        self.stack = stack
+        self.tmp_dir = tmp_dir
+        self.chunks: list[TextIO] = []
+
+    def add(self, chunks: Iterable[list[str]]) -> None:
+        for chunk in chunks:
+            path = self.tmp_dir / f"chunk-{len(self.chunks)}"
+            path.write_text("".join(chunk))
+            self.chunks.append(self.stack.enter_context(path.open()))
+
+    def merge(self) -> Iterable[str]:
+        return heapq.merge(*self.chunks)
+
+
+def merge_traces(
+    paths: list[Path],
+    output: Path,
+    chunk_traces: int = CHUNK_TRACES,
+) -> None:
+    """Merge the object traces and name maps of the runs at paths into output."""
+    with ExitStack() as stack:
+        tmp_dir = Path(
+            stack.enter_context(tempfile.TemporaryDirectory(dir=output.parent))
+        )
+
+        traces = _Spill(stack, tmp_dir / "traces")
+        names = _Spill(stack, tmp_dir / "names")
+        traces.tmp_dir.mkdir()
+        names.tmp_dir.mkdir()
+
+        for run, path in enumerate(paths):
+            with path.open() as f:
+                traces.add(_trace_chunks(run, f, chunk_traces))
+            if name_map_path(path).exists():
+                with name_map_path(path).open() as f:
+                    names.add(_name_chunks(run, f, chunk_traces))
+            else:
+                LOGGER.warning("%s has no name map", path)
+
+        run_totals = [0] * len(paths)
+        distinct = 0
+        with output.open("w") as out, runs_path(output).open("w") as runs_out:
+            for digest, records in groupby(traces.merge(), key=lambda x: x[:32]):
+                counts = [0] * len(paths)
+                for record in records:
+                    _, run, count, entries = record.rstrip("\n").split(" ", 3)
+                    counts[int(run)] += int(count)
+
+                out.write(entries.replace(",", "\n") + "\n\n")
+                runs_out.write(" ".join([digest, *map(str, counts)]) + "\n")
+
+                distinct += 1
+                for run, count in enumerate(counts):
+                    run_totals[run] += count
+
+        conflicts = 0
+        with name_map_path(output).open("w") as out:
+            for addr, records in groupby(names.merge(), key=lambda x: x[:16]):
+                names_of_addr = [x.rstrip("\n").split(" ", 2)[2] for x in records]
+                out.write(f"{int(addr, 16):x} {names_of_addr[0]}\n")
+                if any(x != names_of_addr[0] for x in names_of_addr):
+                    conflicts += 1
+
+    for path, total in zip(paths, run_totals):
+        LOGGER.info("%s: %i traces", path, total)
+    LOGGER.info(
+        "Merged %i traces of %i runs into %i distinct traces",
+        sum(run_totals),
+        len(paths),
+        distinct,
+    )
+    if conflicts:
+        LOGGER.warning(
+            "%i addresses have different names in different runs, kept the names"
+            " of the first run listing them",
+            conflicts,
+        )
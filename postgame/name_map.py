@@ -0,0 +1,99 @@
+"""
+Lazily loaded object-traces name maps.
+
+A name map has one "<hex address> <name>" line per method. Only the names of
+the methods in the results are needed, so rather than reading every name up
+front NameMap memory maps the file and indexes it by address: an array of
+addresses sorted alongside the offsets of their lines. Names are decoded when
+they are looked up, with a binary search.
+"""
+
+from __future__ import annotations
+
+import mmap
+from array import array
+from bisect import bisect_right
+from pathlib import Path
+from typing import Any, Iterable
+
+
+class NameMap:
+    """
+    A name map indexed by address. Where an address is listed more than once,
+    its last name is used.
+    """
+
+    def __init__(self, path: Path):
+        self.__addrs = array("Q")
+        self.__offsets = array("Q")
+        self.__mmap: mmap.mmap | None = None
+
+        with path.open("rb") as f:
+            # Empty files can't be memory mapped.
+            if path.stat().st_size == 0:
+                return
+            self.__mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        entries: list[tuple[int, int]] = []
+        offset = 0
+        size = len(self.__mmap)
+        while offset < size:
+            end = self.__line_end(offset)
+            sep = self.__mmap.find(b" ", offset, end)
+            if sep != -1:
+                entries.append((int(self.__mmap[offset:sep], 16), offset))
+            offset = end + 1
+
+        # The sort is stable, so duplicate addresses keep their file order.
+        entries.sort(key=lambda x: x[0])
+        self.__addrs.extend(x for x, _ in entries)
+        self.__offsets.extend(x for _, x in entries)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args: Any):
+        self.close()
+
+    def close(self) -> None:
+        if self.__mmap is not None:
+            self.__mmap.close()
+
+    def __len__(self) -> int:
+        return len(self.__addrs)
+
+    def __contains__(self, addr: int) -> bool:
+        return self.__index(addr) is not None
+
+    def get(self, addr: int) -> str | None:
+        """The name of the method at addr, or None if it isn't in the map."""
+        i = self.__index(addr)
+        if i is None:
+            return None
+
+        return self.__line(self.__offsets[i]).split(" ", 1)[1].strip()
+
+    def lines(self, addrs: Iterable[int]) -> list[str]:
+        """The lines of the given addresses that are in the map, in file order."""
+        offsets: set[int] = set()
+        for addr in addrs:
+            i = self.__index(addr)
+            if i is not None:
+                offsets.add(self.__offsets[i])
+
+        return [self.__line(x) for x in sorted(offsets)]
+
+    def __index(self, addr: int) -> int | None:
+        i = bisect_right(self.__addrs, addr) - 1
+        if i >= 0 and self.__addrs[i] == addr:
+            return i
+        return None
+
+    def __line(self, offset: int) -> str:
+        assert self.__mmap is not None
+        return self.__mmap[offset : self.__line_end(offset)].decode().rstrip("\r")
+
+    def __line_end(self, offset: int) -> int:
+        assert self.__mmap is not None
+        end = self.__mmap.find(b"\n", offset)
+        return len(self.__mmap) if end == -1 else end
@@ -1,3 +1,4 @@
+import hashlib
 import logging
 from dataclasses import dataclass
 from enum import StrEnum, auto
@@ -35,6 +36,14 @@ class TraceEntry:
         return self.method.address | (int(self.is_call) << 31)
 
 
+def trace_digest(entries: Iterable[tuple[int, bool]]) -> bytes:
+    """Digest of the (address, is_call) entries of a trace."""
+    h = hashlib.blake2b(digest_size=16)
+    for addr, is_call in entries:
+        h.update(addr.to_bytes(8, "little") + bytes([is_call]))
+    return h.digest()
+
+
 class ObjectTrace:
     """
     Class that contains an object trace. An object trace is a list of trace
@@ -198,6 +207,12 @@ class ObjectTrace:
 
         return map(ObjectTrace, split_traces)
 
+    def digest(self) -> bytes:
+        """Digest of the trace's contents, stable across runs and processes."""
+        return trace_digest(
+            (te.method.address, te.is_call) for te in self.__trace_entries
+        )
+
     def __str__(self) -> str:
         return "\n".join(map(str, self.__trace_entries))
 
@@ -209,3 +224,49 @@ class ObjectTrace:
 
     def __eq__(self, other: Self) -> bool:
         return self.__trace_entries == other.__trace_entries
+
+
+class TraceGroup:
+    """
+    Object traces sharing a destructor fingerprint: the addresses of their tail
+    returns. Passes that only depend on the fingerprint or the head and tail of
+    traces run once per group and per distinct pattern instead of once per
+    trace.
+    """
+
+    def __init__(self, fingerprint: tuple[int, ...], tail_returns: list[TraceEntry]):
+        self.fingerprint = fingerprint
+        self.tail_returns = tail_returns
+
+        self.traces: list[ObjectTrace] = []
+
+        # A representative trace of each distinct list of head calls, and of
+        # each distinct head and tail (with the number of head calls).
+        self.head_call_patterns: dict[tuple[TraceEntry, ...], ObjectTrace] = {}
+        self.head_tail_patterns: dict[
+            tuple[int, tuple[TraceEntry, ...], tuple[TraceEntry, ...]],
+            ObjectTrace,
+        ] = {}
+
+    def add(self, ot: ObjectTrace) -> None:
+        self.traces.append(ot)
+
+        head_calls = tuple(ot.head_calls())
+        self.head_call_patterns.setdefault(head_calls, ot)
+        self.head_tail_patterns.setdefault(
+            (len(head_calls), tuple(ot.head()), tuple(ot.tail())), ot
+        )
+
+
+def group_traces(traces: Iterable[ObjectTrace]) -> list[TraceGroup]:
+    """Group traces by fingerprint, in the order fingerprints are first seen."""
+    groups: dict[tuple[int, ...], TraceGroup] = {}
+
+    for ot in traces:
+        tail_returns = ot.tail_returns()
+        fingerprint = tuple(x.method.address for x in tail_returns)
+        if fingerprint not in groups:
+            groups[fingerprint] = TraceGroup(fingerprint, tail_returns)
+        groups[fingerprint].add(ot)
+
+    return list(groups.values())
@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import Container, Generator, Iterable
 
 from parseconfig import Config
 from postgame.method_store import MethodStore
@@ -14,12 +15,14 @@ def get_base_offset(config: Config) -> int:
 def parse_input(
     config: Config,
     method_store: MethodStore,
+    lines: Iterable[str] | None = None,
 ) -> tuple[int, set[ObjectTrace]]:
     """Parse object-trace related data.
 
     Args:
         config: Config data, pointing to files that must be parsed.
         method_store: MethodStore that will be updated during parsing.
+        lines: Object trace lines to parse instead of the object traces file.
 
     Returns:
         Tuple whose first element is a base address offset, and whose
@@ -28,14 +31,81 @@ def parse_input(
     traces: set[ObjectTrace] = set()
     base_offset = get_base_offset(config)
 
-    # parse blacklisted methods
+    if lines is not None:
+        # The pintool writes the blacklisted methods when the game exits, so
+        # they are only removed from the traces once all have been read.
+        entries = dict.fromkeys(
+            tuple(map(parse_entry, block)) for block in iter_trace_blocks(lines)
+        )
+        traces.update(build_traces(entries, method_store, get_blacklist(config)))
+    else:
+        with config.object_traces_path.open() as f:
+            traces.update(parse_traces(f, method_store, get_blacklist(config)))
+
+    return base_offset, traces
+
+
+def get_blacklist(config: Config) -> set[int]:
     blacklisted_methods: set[int] = set()
     for line in config.blacklisted_methods_path.open():
         blacklisted_methods.add(int(line, 16))
+    return blacklisted_methods
+
+
+def parse_entry(line: str) -> tuple[int, bool]:
+    """The address of an object trace line and whether it is a call."""
+    split_line = line.split(" ", 2)
+    # the trace entry being a call is identified by a trailing "1" after the
+    # address
+    return int(split_line[0], 16), len(split_line) == 2 and split_line[1][0] == "1"
+
+
+def iter_trace_blocks(lines: Iterable[str]) -> Generator[list[str], None, None]:
+    """The lines of each object trace, which are separated by empty lines."""
+    cur_trace: list[str] = []
+    for line in lines:
+        # each line ends with \n, empty line indicates new trace
+        if line == "\n":
+            if cur_trace != []:
+                yield cur_trace
+            cur_trace = []
+        else:
+            cur_trace.append(line)
+
+    # finish the last trace
+    if cur_trace != []:
+        yield cur_trace
+
+
+def parse_traces(
+    lines: Iterable[str],
+    method_store: MethodStore,
+    blacklisted_methods: set[int],
+) -> Generator[ObjectTrace, None, None]:
+    """Parse the object traces in lines, see build_traces."""
+    yield from build_traces(
+        (map(parse_entry, block) for block in iter_trace_blocks(lines)),
+        method_store,
+        blacklisted_methods,
+    )
+
+
+def build_traces(
+    traces: Iterable[Iterable[tuple[int, bool]]],
+    method_store: MethodStore,
+    blacklisted_methods: Container[int],
+) -> Generator[ObjectTrace, None, None]:
+    """
+    Build object traces from their (address, is call) entries, skipping
+    blacklisted methods and traces whose calls and returns don't match.
+    """
+    for entries in traces:
+        trace_entries: list[TraceEntry] = []
+        for addr, is_call in entries:
+            if addr not in blacklisted_methods:
+                method = method_store.find_or_insert_method(addr)
+                trace_entries.append(TraceEntry(method, is_call))
 
-    def add_if_valid(trace_entries: list[TraceEntry]):
-        # Adds the list of trace entries to set of collected traces, assuming
-        # the list of entries isn't empty.
         if trace_entries != []:
             ot_stack_len = 0
             for trace in trace_entries:
@@ -48,25 +118,4 @@ def parse_input(
                     break
 
             if ot_stack_len == 0:
-                traces.add(ObjectTrace(trace_entries))
-
-    cur_trace: list[TraceEntry] = []
-    for line in config.object_traces_path.open():
-        # each line ends with \n, empty line indicates new trace
-        if line == "\n":
-            add_if_valid(cur_trace)
-            cur_trace = []
-        else:
-            split_line = line.split(" ", 2)
-            addr = int(split_line[0], 16)
-            if addr not in blacklisted_methods:
-                method = method_store.find_or_insert_method(addr)
-                # the trace entry being a call is identified by a trailing "1" after the
-                # address
-                is_call = len(split_line) == 2 and split_line[1][0] == "1"
-                cur_trace.append(TraceEntry(method, is_call))
-
-    # finish the last trace
-    add_if_valid(cur_trace)
-
-    return base_offset, traces
+                yield ObjectTrace(trace_entries)
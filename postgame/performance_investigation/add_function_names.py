@@ -1,32 +1,22 @@
 import shutil
-import subprocess
 from pathlib import Path
 
-
-def get_demangled_name(mangled_name: str) -> str:
-    try:
-        p1 = subprocess.Popen(["undname", mangled_name], stdout=subprocess.PIPE)
-        assert p1.stdout is not None
-        demangled_name = str(p1.stdout.read())
-        demangled_name = demangled_name.split("\\n")
-        demangled_name = demangled_name[4]
-        demangled_name = demangled_name[
-            demangled_name.find('"') + 1 : demangled_name.rfind('"')
-        ]
-    except FileNotFoundError as _:
-        demangled_name = mangled_name
-
-    return demangled_name
+from postgame.demangle import Demangler
 
 
 def add_function_names(ot_file: Path):
     fn_file = ot_file.with_name(ot_file.name + "-functions")
 
-    functions: dict[int, str] = {}
+    mangled_names: dict[int, str] = {}
 
     for line in ot_file.with_name(ot_file.name + "-name-map").open():
         split_line = line.split(" ")
-        functions[int(split_line[0], 16)] = get_demangled_name(split_line[1].strip())
+        mangled_names[int(split_line[0], 16)] = split_line[1].strip()
+
+    demangler = Demangler()
+    demangled = demangler.demangle_all(mangled_names.values())
+    demangler.save()
+    functions = {addr: demangled[name] for addr, name in mangled_names.items()}
 
     fn_names_added = False
 
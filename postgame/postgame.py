@@ -1,23 +1,30 @@
 import hashlib
-import json
 import logging
 import sys
 import time
 import uuid
 from collections import defaultdict
-from dataclasses import dataclass
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Callable, Generator, cast
-
-import pygtrie  # pyright: ignore[reportMissingTypeStubs]
+from typing import Callable, Generator, Iterable, Mapping, cast
 
 import postgame.analysis_results as ar
+import postgame.live_traces as live_traces
+import postgame.merge_traces as merge_traces
 import postgame.parse_object_trace as parse_object_trace
+import postgame.swim as swim
+import postgame.tracing as tracing
+import postgame.trie_export as trie_export
 from parseconfig import AnalysisTool
+from postgame.incremental import CONSTRUCT, PostgameState
 from postgame.method import Method
 from postgame.method_store import MethodStore
-from postgame.object_trace import ObjectTrace, TraceEntry
+from postgame.name_map import NameMap
+from postgame.object_trace import ObjectTrace, TraceEntry, TraceGroup, group_traces
 from postgame.static_trace import StaticTrace, StaticTraceEntry
+from postgame.tracing import SWIM
 from postgame.trie import Node, Trie
 
 SCRIPT_PATH = Path(__file__).parent.absolute()
@@ -81,54 +88,45 @@ class KreoClass:
 
 
 # =============================================================================
-class TriePrinter:
-    def __init__(
-        self,
-        kreo_class_to_method_set_map: dict[KreoClass, set[Method]],
-        trie: pygtrie.Trie,
-    ):
-        self.__indent = ""
-        self.__class_to_method_set = kreo_class_to_method_set_map
-        trie.traverse(self.print_trie)  # pyright: ignore[reportUnknownMemberType]
-
-    def print_trie(
-        self,
-        path_conv: Callable[[tuple[str, ...]], str],
-        path: tuple[str, ...],
-        children: Generator[Any, None, None],
-        cls: KreoClass | None = None,
-    ) -> None:
-        if cls is None:
-            LOGGER.info(f"{self.__indent}n/a")
-        else:
-            LOGGER.info("%s%s", self.__indent, path_conv(path))
-            if cls in self.__class_to_method_set:
-                for method in sorted(
-                    self.__class_to_method_set[cls],
-                    key=lambda x: x.type,
-                ):
-                    LOGGER.info(
-                        "%s* %s | %s (%s, %s, %s)",
-                        self.__indent,
-                        method,
-                        method.type,
-                        method.seen_in_head,
-                        method.seen_in_tail,
-                        method.seen_count,
-                    )
+@dataclass
+class PostgameInputs:
+    """
+    The inputs of a postgame held in memory, in place of the files a Config
+    points to. Object traces are (address, is call) entries and static traces
+    are addresses, one iterable per trace. Run with Postgame(inputs=...).analyze().
+    """
 
-        self.__indent += "    "
-        list(children)
-        self.__indent = self.__indent[0:-4]
+    object_traces: Iterable[Iterable[tuple[int, bool]]]
+    analysis_tool: AnalysisTool = AnalysisTool.KREO
+    base_offset: int = 0
+    blacklisted_methods: set[int] = field(default_factory=set)
+    method_candidates: set[int] = field(default_factory=set)
+    static_traces: Iterable[Iterable[int]] = ()
+    names: Mapping[int, str] = field(default_factory=dict)
+    filename: str = ""
+    filemd5: str = ""
+    workers: int = 1
 
 
 # =============================================================================
 class Postgame:
-    def __init__(self, cfg: Config):
+    def __init__(self, cfg: Config | None = None, inputs: PostgameInputs | None = None):
+        if (cfg is None) == (inputs is None):
+            msg = "Postgame takes either a config or in-memory inputs"
+            raise ValueError(msg)
+
         self.__cfg = cfg
+        self.__inputs = inputs
+        if inputs is not None:
+            self.__analysis_tool = inputs.analysis_tool
+            self.__workers = inputs.workers
+        elif cfg is not None:
+            self.__analysis_tool = cfg.analysis_tool
+            self.__workers = cfg.postgame_workers
 
         self.traces: set[ObjectTrace] = set()
         self.static_traces: set[StaticTrace] = set()
+        self.trace_groups: list[TraceGroup] = []
         self.method_store = MethodStore()
 
         self.trie = Trie[KreoClass]()
@@ -144,6 +142,15 @@ class Postgame:
 
         self.method_candidate_addresses: set[int] = set()
 
+        # FIFO or Unix socket to read object traces from instead of
+        # object_traces_path, see postgame.live_traces.
+        self.live_traces_path: Path | None = None
+
+        # Process pool shared by the swim passes, see __swim_pool.
+        self.__pool: Executor | None = None
+
+        self.name_map: NameMap | Mapping[int, str] = {}
+
     def run_step(
         self,
         function: Callable[[], None],
@@ -160,35 +167,80 @@ class Postgame:
         end_time = time.perf_counter()
         LOGGER.info("%s (%.2fs)", end_msg, end_time - start_time)
 
-    def parse_input(self):
-        self.base_offset, self.traces = parse_object_trace.parse_input(
-            self.__cfg,
-            self.method_store,
-        )
+    def __config(self) -> Config:
+        """The config of a postgame run on files."""
+        if self.__cfg is None:
+            msg = "this step reads files, but the postgame has in-memory inputs"
+            raise ValueError(msg)
+        return self.__cfg
 
-        # parse method names
-        for line in Path(str(self.__cfg.object_traces_path) + "-name-map").open():
-            addr, name = line.strip().split(" ", 1)
-            self.method_store.insert_method_name(int(addr, 16), name)
+    def merge_runs(self):
+        cfg = self.__config()
+        merge_traces.merge_traces(cfg.object_trace_runs, cfg.object_traces_path)
 
-    def parse_static_traces(self):
-        cur_trace: list[StaticTraceEntry] = []
+    def parse_input(self):
+        if self.__inputs is not None:
+            self.base_offset = self.__inputs.base_offset
+            self.traces = set(
+                parse_object_trace.build_traces(
+                    self.__inputs.object_traces,
+                    self.method_store,
+                    self.__inputs.blacklisted_methods,
+                )
+            )
+            self.name_map = self.__inputs.names
+            return
+
+        cfg = self.__config()
+        if self.live_traces_path is not None:
+            # Traces are parsed as the game produces them.
+            with live_traces.open_live(
+                self.live_traces_path, cfg.blacklisted_methods_path
+            ) as f:
+                self.base_offset, self.traces = parse_object_trace.parse_input(
+                    cfg,
+                    self.method_store,
+                    f,
+                )
+        else:
+            self.base_offset, self.traces = parse_object_trace.parse_input(
+                cfg,
+                self.method_store,
+            )
 
-        def flush_cur_trace():
-            if len(cur_trace) > 0:
-                self.static_traces.add(StaticTrace(cur_trace))
+        # Method names are only looked up when generating the results.
+        self.name_map = NameMap(Path(str(cfg.object_traces_path) + "-name-map"))
 
-        for line in self.__cfg.static_traces_path.open():
+    def __read_static_traces(self) -> Generator[list[int], None, None]:
+        """The addresses of each static trace, which are separated by empty lines."""
+        cur_trace: list[int] = []
+        for line in self.__config().static_traces_path.open():
             if line == "\n":
-                flush_cur_trace()
+                yield cur_trace
+                cur_trace = []
             elif line[0] != "#":
-                addr = int(line.split()[0], 16)
+                cur_trace.append(int(line.split()[0], 16))
+
+        yield cur_trace
+
+    def parse_static_traces(self):
+        if self.__inputs is not None:
+            traces = self.__inputs.static_traces
+        else:
+            traces = self.__read_static_traces()
+
+        # The entries of every trace accumulate in the one list, so the static
+        # traces added all hold the same entries.
+        cur_trace: list[StaticTraceEntry] = []
+        for addrs in traces:
+            for addr in addrs:
                 if addr in self.method_candidate_addresses:
                     cur_trace.append(
-                        StaticTraceEntry(line, self.method_store.find_or_insert_method)
+                        StaticTraceEntry(addr, self.method_store.find_or_insert_method)
                     )
 
-        flush_cur_trace()
+            if len(cur_trace) > 0:
+                self.static_traces.add(StaticTrace(cur_trace))
 
     def update_all_method_statistics(self):
         self.method_store.reset_all_method_statistics()
@@ -255,18 +307,30 @@ class Postgame:
                         )
 
     def construct_trie(self):
-        for ot in self.traces:
-            tail_returns = ot.tail_returns()
-
-            # Insert class and any parents into the trie using the trace's tail
-            for i in range(len(tail_returns)):
-                self.trie.insert_value(
-                    KreoClass.to_trace(tail_returns[: i + 1]),
-                    KreoClass(tail_returns[: i + 1]),
-                )
+        # Traces are handled in digest order rather than in the arbitrary order
+        # of the set, so an incremental run (see postgame.incremental) can
+        # reproduce the order after folding in traces one run at a time.
+        ordered = sorted(self.traces, key=ObjectTrace.digest)
+
+        # Traces with the same fingerprint map to the same trie node, so the
+        # trie and the swim passes work on each fingerprint once.
+        self.trace_groups = group_traces(ordered)
+        LOGGER.info("Found %i distinct fingerprints", len(self.trace_groups))
+
+        classes: dict[tuple[int, ...], KreoClass] = {}
+        for group in self.trace_groups:
+            tail_returns = group.tail_returns
+            self.__insert_class(tail_returns)
+            classes[group.fingerprint] = self.get_cls(
+                self.trie.get_node(KreoClass.to_trace(tail_returns))
+            )
 
-            # Map all methods in the trace to the class in the trie
-            cls = self.get_cls(self.trie.get_node(KreoClass.to_trace(tail_returns)))
+        # Map all methods in the traces to the class in the trie. This goes
+        # trace by trace rather than group by group: the order of
+        # method_to_class_map and of its class sets decides how
+        # swim_methods_in_multiple_classes resolves methods in several classes.
+        for ot in ordered:
+            cls = classes[swim.addresses(ot.tail_returns())]
             for method in ot.methods():
                 self.method_to_class_map[method].add(cls)
 
@@ -321,7 +385,15 @@ class Postgame:
             lca = self.__trie_lca(cls_set)
 
             if lca:
-                LOGGER.debug(f"Found LCA for method {method}, LCA = {lca}")
+                if SWIM.enabled:
+                    SWIM.debug(
+                        "lca",
+                        "Found LCA for method %s, LCA = %s",
+                        method,
+                        lca,
+                        method=method,
+                        lca=lca,
+                    )
                 # LCA exists
                 self.method_to_class_map[method] = set([lca])
             else:
@@ -384,9 +456,18 @@ class Postgame:
                 self.update_tail_returns(new_cls_te, new_cls_node)
 
                 self.trie.insert_node([method.address], new_cls_node)
-                LOGGER.debug(
-                    f"Failed to find LCA for method {method.address}, adding node with address {new_cls_node.address} to trie. Placing nodes with base traces under new node: {traces}"
-                )
+                if SWIM.enabled:
+                    SWIM.debug(
+                        "new_class",
+                        "Failed to find LCA for method %s, adding node with address %s"
+                        " to trie. Placing nodes with base traces under new node: %s",
+                        method.address,
+                        new_cls_node.address,
+                        traces,
+                        method=method,
+                        node=new_cls_node.address,
+                        traces=traces,
+                    )
 
                 # Move method to new class in methodToKreoClassMap
                 self.method_to_class_map[method] = set(
@@ -397,6 +478,104 @@ class Postgame:
         for cls_set in self.method_to_class_map.values():
             assert len(cls_set) == 1
 
+    def __insert_class(self, tail_returns: list[TraceEntry]) -> None:
+        # Insert class and any parents into the trie using the traces' tail
+        for i in range(len(tail_returns)):
+            self.trie.insert_value(
+                KreoClass.to_trace(tail_returns[: i + 1]),
+                KreoClass(tail_returns[: i + 1]),
+            )
+
+    def ingest_traces(self):
+        """
+        Fold the traces of the run in object_traces_path into the state saved in
+        postgame_state_path (see postgame.incremental), then load the trie and
+        the classes of all the runs ingested so far.
+        """
+        cfg = self.__config()
+        state_path = cfg.postgame_state_path
+        state = PostgameState.load(state_path)
+        if state is None:
+            state = PostgameState(cfg.analysis_tool)
+        elif state.analysis_tool != cfg.analysis_tool:
+            msg = (
+                f"{state_path} was saved by {state.analysis_tool}, not"
+                f" {cfg.analysis_tool}"
+            )
+            raise ValueError(msg)
+
+        self.method_store = state.method_store
+        self.parse_input()
+        LOGGER.info("Found %i traces", len(self.traces))
+
+        flagged = self.__initializer_finalizer_addresses()
+        self.split_dynamic_traces()
+        newly_flagged = self.__initializer_finalizer_addresses() - flagged
+
+        new_traces = state.new_traces(self.traces)
+        LOGGER.info("%i traces weren't seen in earlier runs", len(new_traces))
+
+        # Every earlier run flagged some methods, so none were flagged before
+        # the first run and no earlier traces need splitting.
+        reingest = bool(flagged and newly_flagged) and state.split_traces()
+        if reingest:
+            LOGGER.info(
+                "%i methods newly identified as initializers or finalizers split"
+                " traces of earlier runs, ingesting all traces again",
+                len(newly_flagged),
+            )
+            self.traces = set(state.object_traces())
+        else:
+            self.traces = set(new_traces)
+
+        if not self.analysis_tool_lego():
+            self.remove_ots_with_no_tail()
+
+        if reingest:
+            self.update_all_method_statistics()
+        else:
+            for trace in self.traces:
+                trace.update_method_statistics()
+
+        moves = state.ingest(self.traces)
+        LOGGER.info("Found %i new class moves", moves)
+        state.save(state_path)
+
+        for fingerprint in state.ordered_groups():
+            self.__insert_class(
+                [TraceEntry(self.__get_method(addr), False) for addr in fingerprint]
+            )
+
+        classes: dict[swim.Trace, KreoClass] = {}
+
+        def get_cls(trace: swim.Trace) -> KreoClass:
+            if trace not in classes:
+                classes[trace] = self.get_cls(self.trie.get_node(list(trace)))
+            return classes[trace]
+
+        # Classes all hash the same, so the order of a class set depends on the
+        # exact adds and discards that built it. Replaying the moves of a full
+        # run gives methods and class sets the order the reorganization sees in
+        # a full run.
+        for addr in state.ordered_methods():
+            cls_set = self.method_to_class_map[self.__get_method(addr)]
+            for pass_index, _, _, _, remove_trace, add_trace in state.class_moves(addr):
+                if pass_index != CONSTRUCT:
+                    cls_set.discard(get_cls(remove_trace))
+                cls_set.add(get_cls(add_trace))
+
+    def __initializer_finalizer_addresses(self) -> set[int]:
+        return {
+            meth.address
+            for meth in self.method_store.get_methods()
+            if meth.is_initializer or meth.is_finalizer
+        }
+
+    def __get_method(self, addr: int) -> Method:
+        method = self.method_store.get_method(addr)
+        assert method is not None
+        return method
+
     def get_cls(self, node: Node[KreoClass] | None) -> KreoClass:
         assert node is not None
         cls = node.value
@@ -408,22 +587,10 @@ class Postgame:
         # possibility that a parent object was never constructed but a child was. In
         # this case we know the destructor belongs to the parent but it currently
         # belongs to the child.
-        for ot in self.traces:
-            tail_returns = ot.tail_returns()
-
-            base_cls = self.get_cls(
-                self.trie.get_node(KreoClass.to_trace(tail_returns))
-            )
-
-            for i in range(len(tail_returns)):
-                cls = self.get_cls(
-                    self.trie.get_node(KreoClass.to_trace(tail_returns[: i + 1]))
-                )
-
-                tail_return_method = tail_returns[i].method
-                if base_cls in self.method_to_class_map[tail_return_method]:
-                    self.method_to_class_map[tail_return_method].remove(base_cls)
-                self.method_to_class_map[tail_return_method].add(cls)
+        self.__swim(
+            swim.destructor_deltas,
+            [(group.fingerprint,) for group in self.trace_groups],
+        )
 
     def swim_constructors(self):
         """
@@ -433,92 +600,75 @@ class Postgame:
         the same class as the matching destructor into the correct place in the
         trie.
         """
-        for ot in self.traces:
-            head_calls = ot.head_calls()
-            tail_returns = ot.tail_returns()
-
-            cls = self.get_cls(self.trie.get_node(KreoClass.to_trace(tail_returns)))
+        self.__swim(
+            swim.constructor_deltas,
+            [
+                (group.fingerprint, swim.addresses(head_calls))
+                for group in self.trace_groups
+                for head_calls in group.head_call_patterns
+            ],
+        )
 
-            for i in range(len(tail_returns)):
-                # class that is a parent of cls
-                parent_cls = self.get_cls(
-                    self.trie.get_node(KreoClass.to_trace(tail_returns[: i + 1]))
+    def swim_methods_called_in_ctors_and_dtors(self):
+        # Traces with the same head and tail move the same methods.
+        self.__swim(
+            swim.ctor_dtor_method_deltas,
+            [
+                (
+                    group.fingerprint,
+                    swim.addresses(ot.head_calls()),
+                    swim.entries(ot.head()),
+                    swim.entries(ot.tail()),
                 )
-                # head call belonging to the parent cls
-                head_call_method = head_calls[i].method
-                # head method is associated with the class; remove it from this class
-                # and add to parent class
-                if cls in self.method_to_class_map[head_call_method]:
-                    self.method_to_class_map[head_call_method].remove(cls)
-                self.method_to_class_map[head_call_method].add(parent_cls)
+                for group in self.trace_groups
+                for ot in group.head_tail_patterns.values()
+            ],
+        )
 
-    @staticmethod
-    def __map_head_methods_to_traces(
-        head_calls: list[TraceEntry],
-        head: list[TraceEntry],
-        head_calls_to_traces: dict[Method, list[int]],
-    ) -> dict[Method, list[int]]:
-        meth_to_dtor: dict[Method, list[int]] = {}
-        for te in head[len(head_calls) :]:
-            if te.is_call:
-                meth_to_dtor[te.method] = head_calls_to_traces[head_calls[-1].method]
-            elif head_calls[-1].method == te.method:
-                head_calls = head_calls[:-1]
-        return meth_to_dtor
+    def __swim(
+        self,
+        function: Callable[..., list[swim.Delta]],
+        groups: list[tuple[object, ...]],
+    ) -> None:
+        """
+        Compute the deltas of a swim pass for each group, in worker processes if
+        postgame_workers is greater than 1, and apply them in group order.
+        """
+        with nullcontext() if self.__pool is not None else self.__swim_pool():
+            self.__apply_deltas(swim.compute_deltas(function, groups, self.__pool))
 
-    @staticmethod
-    def __map_tail_methods_to_traces(
-        tail_returns: list[TraceEntry],
-        tail: list[TraceEntry],
-        tail_returns_to_trace: dict[Method, list[int]],
-    ) -> dict[Method, list[int]]:
-        meth_to_dtor: dict[Method, list[int]] = {}
-        for te in reversed(tail[: -len(tail_returns)]):
-            if not te.is_call:
-                meth_to_dtor[te.method] = tail_returns_to_trace[tail_returns[-1].method]
-            elif tail_returns[-1].method == te.method:
-                tail_returns = tail_returns[:-1]
-        return meth_to_dtor
+    @contextmanager
+    def __swim_pool(self) -> Generator[None, None, None]:
+        """
+        Share one process pool between the swim passes run in the block, so that
+        its workers are started once, if postgame_workers is greater than 1.
+        """
+        if self.__workers <= 1:
+            yield
+            return
 
-    def swim_methods_called_in_ctors_and_dtors(self):
-        for ot in self.traces:
-            head_calls = ot.head_calls()
-            tail_returns = ot.tail_returns()
-            head = ot.head()
-            tail = ot.tail()
-
-            head_calls_to_traces: dict[Method, list[int]] = {}
-            tail_returns_to_trace: dict[Method, list[int]] = {}
-            for i in range(len(tail_returns)):
-                trace = KreoClass.to_trace(tail_returns[: i + 1])
-                head_calls_to_traces[head_calls[i].method] = trace
-                tail_returns_to_trace[tail_returns[i].method] = trace
-
-            method_to_trace_map: dict[Method, list[int]] = {}
-
-            method_to_trace_map.update(
-                Postgame.__map_head_methods_to_traces(
-                    head_calls,
-                    head,
-                    head_calls_to_traces,
-                ),
-            )
+        with ProcessPoolExecutor(self.__workers) as pool:
+            self.__pool = pool
+            try:
+                yield
+            finally:
+                self.__pool = None
 
-            method_to_trace_map.update(
-                Postgame.__map_tail_methods_to_traces(
-                    tail_returns,
-                    tail,
-                    tail_returns_to_trace,
-                ),
-            )
+    def __apply_deltas(self, deltas: Iterable[swim.Delta]) -> None:
+        classes: dict[swim.Trace, KreoClass] = {}
+
+        def get_cls(trace: swim.Trace) -> KreoClass:
+            if trace not in classes:
+                classes[trace] = self.get_cls(self.trie.get_node(list(trace)))
+            return classes[trace]
 
-            # remove method from current class and add to appropriate parent as required.
-            cls = self.get_cls(self.trie.get_node(KreoClass.to_trace(tail_returns)))
-            for method, trace in method_to_trace_map.items():
-                parent_cls = self.get_cls(self.trie.get_node(trace))
-                if cls in self.method_to_class_map[method]:
-                    self.method_to_class_map[method].remove(cls)
-                self.method_to_class_map[method].add(parent_cls)
+        for addr, remove_trace, add_trace in deltas:
+            method = self.__get_method(addr)
+
+            # remove method from current class and add to appropriate parent
+            cls_set = self.method_to_class_map[method]
+            cls_set.discard(get_cls(remove_trace))
+            cls_set.add(get_cls(add_trace))
 
     def map_trie_nodes_to_methods(self):
         # map trie nodes to methods now that method locations are fixed
@@ -536,57 +686,87 @@ class Postgame:
 
             self.class_to_method_set[cls].add(method)
 
-    def __generate_json(
+    def __structure(
         self,
-        analysis_results: ar.AnalysisResults,
         parent_node: Node[KreoClass],
         node: Node[KreoClass],
-    ):
-        if node.value:
-            analysis_results.structures[str(node.value)] = ar.Structure(
-                name=str(node.value)
+    ) -> ar.Structure:
+        assert node.value
+
+        structure = ar.Structure(name=str(node.value))
+
+        if parent_node.value:
+            structure.members["0x0"] = ar.Member(
+                name=str(parent_node.value) + "_0x0",
+                struc=str(parent_node.value),
             )
 
-            if parent_node.value:
-                analysis_results.structures[str(node.value)].members["0x0"] = ar.Member(
-                    name=str(parent_node.value) + "_0x0",
-                    struc=str(parent_node.value),
+        # If there are no methods associated with the trie node there might not
+        # be any methods in the set
+        if node.value in self.class_to_method_set:
+            for method in self.class_to_method_set[node.value]:
+                method_addr_str = hex(method.address + self.base_offset)
+                structure.methods[method_addr_str] = ar.Method(
+                    demangled_name=self.name_map.get(method.address) or "",
+                    ea=method_addr_str,
+                    name=method.type + "_" + method_addr_str,
+                    type=method.type,
                 )
 
-            # If there are no methods associated with the trie node there might not
-            # be any methods in the set
-            if node.value in self.class_to_method_set:
-                for method in self.class_to_method_set[node.value]:
-                    method_addr_str = hex(method.address + self.base_offset)
-                    analysis_results.structures[str(node.value)].methods[
-                        method_addr_str
-                    ] = ar.Method(
-                        demangled_name=method.name if method.name else "",
-                        ea=method_addr_str,
-                        name=method.type + "_" + method_addr_str,
-                        type=method.type,
-                    )
+        return structure
 
-        for child in node.children.values():
-            self.__generate_json(analysis_results, node, child)
+    def iter_structures(self) -> Generator[tuple[str, ar.Structure], None, None]:
+        """
+        Yield the (name, structure) pairs of the OOAnalyzer format results one at
+        a time, in trie order.
+        """
+        structure_nodes: dict[str, tuple[Node[KreoClass], Node[KreoClass]]] = {}
+        for entry in self.trie.walk():
+            if entry.node.value and entry.parent is not None:
+                # As when the structures were stored in a dict, a later node
+                # with the same name replaces an earlier one but keeps its
+                # position.
+                structure_nodes[str(entry.node.value)] = (
+                    entry.parent.node,
+                    entry.node,
+                )
 
-    def generate_json(self):
-        # Output json in OOAnalyzer format
+        for name, (parent_node, node) in structure_nodes.items():
+            yield name, self.__structure(parent_node, node)
+
+    def __results_header(self) -> ar.AnalysisResults:
+        if self.__inputs is not None:
+            filename, filemd5 = self.__inputs.filename, self.__inputs.filemd5
+        else:
+            binary_path = self.__config().binary_path
+            filename, filemd5 = binary_path.name, md5_file(binary_path)
 
-        final_json = ar.AnalysisResults(
-            filename=self.__cfg.binary_path.name,
-            filemd5=md5_file(self.__cfg.binary_path),
+        return ar.AnalysisResults(
+            filename=filename,
+            filemd5=filemd5,
             version="kreo-0.1.0",
         )
 
-        for child in self.trie.root.children.values():
-            self.__generate_json(final_json, self.trie.root, child)
+    def analysis_results(self) -> ar.AnalysisResults:
+        """The OOAnalyzer format results, as a model."""
+        results = self.__results_header()
+        results.structures = dict(self.iter_structures())
+        return results
 
-        with self.__cfg.results_json.open("w") as f:
-            f.write(json.dumps(final_json.model_dump(), indent=4))
+    def generate_json(self):
+        # Output json in OOAnalyzer format. Structures are generated and written
+        # one at a time rather than building the whole results model.
+        with self.__config().results_json.open("w") as f:
+            ar.write_analysis_results(
+                f, self.__results_header(), self.iter_structures()
+            )
 
     def load_method_candidates(self) -> None:
-        for line in self.__cfg.method_candidates_path.open():
+        if self.__inputs is not None:
+            self.method_candidate_addresses.update(self.__inputs.method_candidates)
+            return
+
+        for line in self.__config().method_candidates_path.open():
             self.method_candidate_addresses.add(int(line, 16))
 
     def __identify_initializer_finalizers(self) -> None:
@@ -607,15 +787,65 @@ class Postgame:
             meth.update_type()
 
     def analysis_tool_lego(self) -> bool:
-        return self.__cfg.analysis_tool == AnalysisTool.LEGO
+        return self.__analysis_tool == AnalysisTool.LEGO
 
     def analysis_tool_lego_plus(self) -> bool:
-        return self.__cfg.analysis_tool == AnalysisTool.LEGO_PLUS
+        return self.__analysis_tool == AnalysisTool.LEGO_PLUS
 
     def analysis_tool_kreo(self) -> bool:
-        return self.__cfg.analysis_tool == AnalysisTool.KREO
+        return self.__analysis_tool == AnalysisTool.KREO
 
-    def main(self):
+    def main(self, incremental: bool = False, live: Path | None = None):
+        """
+        Run the postgame. If incremental, the traces are folded into the saved
+        state and the results cover every run ingested so far. If live is given,
+        traces are read from that FIFO or Unix socket as the game writes them.
+        """
+        cfg = self.__config()
+        self.live_traces_path = live
+        tracing.configure(cfg.trace, cfg.trace_file)
+        try:
+            if cfg.object_trace_runs:
+                self.run_step(self.merge_runs, "merging runs...", "runs merged")
+
+            if incremental:
+                self.run_step(
+                    self.ingest_traces,
+                    "ingesting traces...",
+                    "traces ingested",
+                )
+            else:
+                self.__run_dynamic_steps()
+            self.__run_reorganization_steps(incremental)
+
+            self.run_step(
+                self.generate_json,
+                "generating json...",
+                "json generated",
+            )
+
+            trie_export.write_text(self.trie, sys.stdout)
+
+            LOGGER.info("Done, Kreo exiting normally.")
+        finally:
+            if isinstance(self.name_map, NameMap):
+                self.name_map.close()
+            tracing.close()
+
+    def analyze(self) -> ar.AnalysisResults:
+        """
+        Run the postgame on its in-memory inputs and return the results, without
+        reading or writing any files.
+        """
+        if self.__inputs is None:
+            msg = "analyze needs in-memory inputs, use main to run on files"
+            raise ValueError(msg)
+
+        self.__run_dynamic_steps()
+        self.__run_reorganization_steps(incremental=False)
+        return self.analysis_results()
+
+    def __run_dynamic_steps(self):
         self.run_step(self.parse_input, "parsing input...", "input parsed")
         LOGGER.info("Found %i traces", len(self.traces))
 
@@ -651,25 +881,27 @@ class Postgame:
             "trie constructed",
         )
 
-        self.run_step(
-            self.swim_destructors,
-            "moving destructors up in trie...",
-            "destructors moved up",
-        )
-
-        if not self.analysis_tool_lego():
+        with self.__swim_pool():
             self.run_step(
-                self.swim_constructors,
-                "moving constructors up in the trie...",
-                "constructors moved up",
+                self.swim_destructors,
+                "moving destructors up in trie...",
+                "destructors moved up",
             )
 
-            self.run_step(
-                self.swim_methods_called_in_ctors_and_dtors,
-                "moving methods called in ctors and dtors up in the trie...",
-                "methods moved up",
-            )
+            if not self.analysis_tool_lego():
+                self.run_step(
+                    self.swim_constructors,
+                    "moving constructors up in the trie...",
+                    "constructors moved up",
+                )
+
+                self.run_step(
+                    self.swim_methods_called_in_ctors_and_dtors,
+                    "moving methods called in ctors and dtors up in the trie...",
+                    "methods moved up",
+                )
 
+    def __run_reorganization_steps(self, incremental: bool):
         self.run_step(
             self.swim_methods_in_multiple_classes,
             "reorganizing trie...",
@@ -707,11 +939,13 @@ class Postgame:
             # self.run_step(self.reorganize_trie, '2nd reorganizing trie...', '2nd trie
             # reorganization complete')
 
-        self.run_step(
-            self.update_all_method_statistics,
-            "updating method statistics...",
-            "method statistics updated",
-        )
+        # Saved statistics cover every run, while traces only hold the new one.
+        if not incremental:
+            self.run_step(
+                self.update_all_method_statistics,
+                "updating method statistics...",
+                "method statistics updated",
+            )
 
         self.run_step(
             self.update_method_type,
@@ -724,13 +958,3 @@ class Postgame:
             "mapping trie nodes to methods...",
             "trie nodes mapped",
         )
-
-        self.run_step(
-            self.generate_json,
-            "generating json...",
-            "json generated",
-        )
-
-        print(self.trie)
-
-        LOGGER.info("Done, Kreo exiting normally.")
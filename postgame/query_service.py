@@ -0,0 +1,231 @@
+"""
+Long-lived local service answering queries about postgame analyses.
+
+Each analysis is loaded from its results json once and indexed in memory: the
+class of each method, the parent of each class and the methods of each class.
+Clients connect to a Unix socket and send batches of queries as JSON lines:
+
+    {"analysis": "four", "queries": [{"op": "class_of", "ea": "0x412560"}]}
+
+and get a {"results": [...]} line back, with one result per query, or
+{"error": "..."} if the batch can't be answered. Queries are:
+
+    {"op": "classes"}                            names of all the classes
+    {"op": "class_of", "ea": ...}                class of the method at ea
+    {"op": "ancestors", "class": ...}            parent, grandparent, ...
+    {"op": "methods", "class": ..., "type": ...} eas of the methods of the
+                                                 class, of the type if given
+
+Before answering a batch, an analysis is reloaded if its results json changed
+(its modification time or size).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import socket
+import socketserver
+import threading
+from pathlib import Path
+from typing import Any, Callable, Mapping
+
+import postgame.analysis_results as ar
+
+LOGGER = logging.getLogger(__name__)
+
+
+def _ea(value: int | str) -> int:
+    return int(value, 16) if isinstance(value, str) else value
+
+
+class Analysis:
+    """The indexed results of one analysis."""
+
+    def __init__(self, results: ar.AnalysisResults):
+        self.methods: dict[str, dict[int, ar.Method]] = {}
+        self.method_classes: dict[int, str] = {}
+        self.parents: dict[str, str] = {}
+
+        for name, structure in results.structures.items():
+            methods = {_ea(x.ea): x for x in structure.methods.values()}
+            self.methods[name] = methods
+            for ea in methods:
+                self.method_classes[ea] = name
+
+            for member in structure.members.values():
+                if member.parent and member.offset == "0x0":
+                    self.parents[name] = member.struc
+
+    def classes(self) -> list[str]:
+        return list(self.methods)
+
+    def class_of(self, ea: int | str) -> str | None:
+        return self.method_classes.get(_ea(ea))
+
+    def ancestors(self, cls: str) -> list[str]:
+        ancestors: list[str] = []
+        parent = self.parents.get(cls)
+        # Guard against cycles in hand-edited results.
+        while parent is not None and parent not in ancestors:
+            ancestors.append(parent)
+            parent = self.parents.get(parent)
+        return ancestors
+
+    def class_methods(self, cls: str, method_type: str | None = None) -> list[str]:
+        if cls not in self.methods:
+            msg = f"unknown class {cls}"
+            raise ValueError(msg)
+
+        return [
+            hex(ea)
+            for ea, method in self.methods[cls].items()
+            if method_type is None or method.type == method_type
+        ]
+
+    def query(self, query: Any) -> Any:
+        if not isinstance(query, dict):
+            msg = f"unknown query {query}"
+            raise ValueError(msg)
+
+        op = query.get("op")
+        if op == "classes":
+            return self.classes()
+        elif op == "class_of":
+            return self.class_of(query["ea"])
+        elif op == "ancestors":
+            return self.ancestors(query["class"])
+        elif op == "methods":
+            return self.class_methods(query["class"], query.get("type"))
+
+        msg = f"unknown query {op}"
+        raise ValueError(msg)
+
+
+class _LoadedAnalysis:
+    def __init__(self, path: Path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.stamp: tuple[int, int] | None = None
+        self.analysis: Analysis | None = None
+
+    def get(self) -> Analysis:
+        """The analysis, reloaded if its results json changed since last loaded."""
+        with self.lock:
+            st = self.path.stat()
+            stamp = (st.st_mtime_ns, st.st_size)
+            if self.analysis is None or stamp != self.stamp:
+                LOGGER.info("loading %s", self.path)
+                self.analysis = Analysis(ar.load_analysis_results(self.path))
+                self.stamp = stamp
+            return self.analysis
+
+
+class QueryService:
+    """Analyses by name, answering batches of queries."""
+
+    def __init__(self, results_paths: Mapping[str, Path]):
+        self.analyses = {
+            name: _LoadedAnalysis(path) for name, path in results_paths.items()
+        }
+        # Load everything up front, so the first queries are fast too.
+        for analysis in self.analyses.values():
+            analysis.get()
+
+    def answer(self, request: Any) -> dict[str, Any]:
+        # Requests are decoded json, which needn't be objects.
+        if not isinstance(request, dict):
+            return {"error": f"invalid request {request}"}
+
+        name = request.get("analysis")
+        if not isinstance(name, str) or name not in self.analyses:
+            return {"error": f"unknown analysis {name}"}
+
+        try:
+            analysis = self.analyses[name].get()
+        except (OSError, ValueError) as e:
+            return {"error": f"failed to load analysis {name}: {e}"}
+
+        queries = request.get("queries", [])
+        if not isinstance(queries, list):
+            return {"error": f"invalid queries {queries}"}
+
+        results: list[Any] = []
+        for query in queries:
+            try:
+                results.append(analysis.query(query))
+            except (KeyError, ValueError, TypeError) as e:
+                results.append({"error": str(e)})
+        return {"results": results}
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: _Server
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            try:
+                response = self.server.service.answer(json.loads(line))
+            except json.JSONDecodeError as e:
+                response = {"error": f"invalid request: {e}"}
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+
+
+class _Server(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: Path, service: QueryService):
+        self.service = service
+        super().__init__(str(socket_path), _Handler)
+
+
+def serve(
+    socket_path: Path,
+    service: QueryService,
+    ready: Callable[[socketserver.BaseServer], None] | None = None,
+) -> None:
+    """
+    Answer queries on a Unix socket at socket_path until interrupted or shut
+    down. ready is called with the server once it accepts connections.
+    """
+    # A socket left behind by an earlier service.
+    socket_path.unlink(missing_ok=True)
+
+    with _Server(socket_path, service) as server:
+        try:
+            LOGGER.info("serving %s on %s", list(service.analyses), socket_path)
+            if ready is not None:
+                ready(server)
+            server.serve_forever()
+        finally:
+            socket_path.unlink(missing_ok=True)
+
+
+class Client:
+    """A connection to a query service."""
+
+    def __init__(self, socket_path: Path):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(str(socket_path))
+        self.f = self.sock.makefile("rwb")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args: Any):
+        self.close()
+
+    def close(self) -> None:
+        self.f.close()
+        self.sock.close()
+
+    def query(self, analysis: str, queries: list[dict[str, Any]]) -> list[Any]:
+        """The results of a batch of queries, raising ValueError on errors."""
+        request = {"analysis": analysis, "queries": queries}
+        self.f.write(json.dumps(request).encode() + b"\n")
+        self.f.flush()
+
+        response = json.loads(self.f.readline())
+        if "error" in response:
+            raise ValueError(response["error"])
+        return response["results"]
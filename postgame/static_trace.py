@@ -6,11 +6,10 @@ from postgame.method import Method
 
 
 class StaticTraceEntry:
-    def __init__(self, line: str, find_or_insert_method: Callable[[int, bool], Method]):
-        assert line[0] != "#", "Tried to construct StaticTraceEntry from a comment."
-        splitLine = line.split()
-        self.method = find_or_insert_method(int(splitLine[0], 16), False)
-        # Name is in there mainly for debugging looking at the trace manually -- don't really need it.
+    def __init__(
+        self, address: int, find_or_insert_method: Callable[[int, bool], Method]
+    ):
+        self.method = find_or_insert_method(address, False)
 
     def __str__(self) -> str:
         return str(self.method)
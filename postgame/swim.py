@@ -0,0 +1,146 @@
+"""
+Class moves of the swim passes over object traces, as pure functions of the
+addresses in trace groups.
+
+Each pass computes a list of deltas per trace group: (method address, trace of
+the class to remove the method from, trace of the class to add it to), traces
+being trie paths. The deltas only depend on the group, so they can be computed
+in worker processes. Applying them in group order gives the same classes as
+applying each as soon as it is computed.
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import Executor
+from typing import Callable, Generator, Iterable, Sequence
+
+from postgame.object_trace import TraceEntry
+
+Trace = tuple[int, ...]
+
+# (method address, class to remove the method from, class to add it to)
+Delta = tuple[int, Trace, Trace]
+
+# (address, is_call) of a trace entry.
+Entry = tuple[int, bool]
+
+
+def addresses(trace_entries: Iterable[TraceEntry]) -> Trace:
+    return tuple(x.method.address for x in trace_entries)
+
+
+def entries(trace_entries: Iterable[TraceEntry]) -> tuple[Entry, ...]:
+    return tuple((x.method.address, x.is_call) for x in trace_entries)
+
+
+# Groups submitted to a worker process at once.
+GROUPS_PER_SHARD = 256
+
+
+def destructor_deltas(fingerprint: Trace) -> list[Delta]:
+    """
+    Move the destructors of a fingerprint from its class to the parent classes
+    they destroy. A parent object may never have been constructed on its own,
+    in which case its destructor is still in the child.
+    """
+    return [
+        (fingerprint[i], fingerprint, fingerprint[: i + 1])
+        for i in range(len(fingerprint))
+    ]
+
+
+def constructor_deltas(fingerprint: Trace, head_calls: Trace) -> list[Delta]:
+    """
+    Move the constructors called in the head to the class of the destructor
+    returned from in the same position of the tail.
+    """
+    return [
+        (head_calls[i], fingerprint, fingerprint[: i + 1])
+        for i in range(len(fingerprint))
+    ]
+
+
+def _head_methods_to_traces(
+    head_calls: Trace,
+    head: Sequence[Entry],
+    head_calls_to_traces: dict[int, Trace],
+) -> dict[int, Trace]:
+    meth_to_dtor: dict[int, Trace] = {}
+    for addr, is_call in head[len(head_calls) :]:
+        if is_call:
+            meth_to_dtor[addr] = head_calls_to_traces[head_calls[-1]]
+        elif head_calls[-1] == addr:
+            head_calls = head_calls[:-1]
+    return meth_to_dtor
+
+
+def _tail_methods_to_traces(
+    tail_returns: Trace,
+    tail: Sequence[Entry],
+    tail_returns_to_trace: dict[int, Trace],
+) -> dict[int, Trace]:
+    meth_to_dtor: dict[int, Trace] = {}
+    for addr, is_call in reversed(tail[: -len(tail_returns)]):
+        if not is_call:
+            meth_to_dtor[addr] = tail_returns_to_trace[tail_returns[-1]]
+        elif tail_returns[-1] == addr:
+            tail_returns = tail_returns[:-1]
+    return meth_to_dtor
+
+
+def ctor_dtor_method_deltas(
+    fingerprint: Trace,
+    head_calls: Trace,
+    head: Sequence[Entry],
+    tail: Sequence[Entry],
+) -> list[Delta]:
+    """
+    Move the methods called by constructors and destructors to the class of the
+    constructor or destructor calling them.
+    """
+    head_calls_to_traces: dict[int, Trace] = {}
+    tail_returns_to_trace: dict[int, Trace] = {}
+    for i in range(len(fingerprint)):
+        trace = fingerprint[: i + 1]
+        head_calls_to_traces[head_calls[i]] = trace
+        tail_returns_to_trace[fingerprint[i]] = trace
+
+    method_to_trace_map: dict[int, Trace] = {}
+    method_to_trace_map.update(
+        _head_methods_to_traces(head_calls, head, head_calls_to_traces)
+    )
+    method_to_trace_map.update(
+        _tail_methods_to_traces(fingerprint, tail, tail_returns_to_trace)
+    )
+
+    return [(addr, fingerprint, trace) for addr, trace in method_to_trace_map.items()]
+
+
+def _shard_deltas(
+    function: Callable[..., list[Delta]],
+    shard: list[tuple[object, ...]],
+) -> list[Delta]:
+    return [delta for args in shard for delta in function(*args)]
+
+
+def compute_deltas(
+    function: Callable[..., list[Delta]],
+    groups: list[tuple[object, ...]],
+    pool: Executor | None = None,
+) -> Generator[Delta, None, None]:
+    """
+    The deltas of function(*args) for each args in groups, in order. If a pool
+    is given, they are computed there in shards of GROUPS_PER_SHARD groups,
+    unless there is only one shard, which is cheaper to compute in process.
+    """
+    if pool is None or len(groups) <= GROUPS_PER_SHARD:
+        for args in groups:
+            yield from function(*args)
+        return
+
+    futures = [
+        pool.submit(_shard_deltas, function, groups[i : i + GROUPS_PER_SHARD])
+        for i in range(0, len(groups), GROUPS_PER_SHARD)
+    ]
+    for future in futures:
+        yield from future.result()
@@ -0,0 +1,109 @@
+"""
+Debug tracing of postgame internals, enabled per subsystem.
+
+Each subsystem has a Tracer, disabled by default. Hot paths check its enabled
+attribute before building any event, so tracing costs one attribute test when
+it is off:
+
+    if TRIE.enabled:
+        TRIE.debug("insert", "inserted node with trace %s", trace, trace=trace)
+
+Events are emitted if their level is at least the subsystem's level. Messages
+are formatted lazily by the subsystem's logger (postgame.trace.<subsystem>),
+and events are also written to an optional JSON lines sink with their fields.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Any, Mapping, TextIO
+
+# Level of disabled tracers, above any event level.
+DISABLED = logging.CRITICAL + 10
+
+_sink: TextIO | None = None
+
+
+class Tracer:
+    def __init__(self, subsystem: str):
+        self.subsystem = subsystem
+        self.logger = logging.getLogger(f"postgame.trace.{subsystem}")
+        self.level = DISABLED
+        self.enabled = False
+
+    def set_level(self, level: int) -> None:
+        self.level = level
+        self.enabled = level < DISABLED
+        self.logger.setLevel(level)
+
+    def event(
+        self,
+        level: int,
+        event: str,
+        msg: str,
+        *args: Any,
+        **fields: Any,
+    ) -> None:
+        if level < self.level:
+            return
+
+        self.logger.log(level, msg, *args)
+
+        if _sink is not None:
+            record = {
+                "time": time.time(),
+                "subsystem": self.subsystem,
+                "event": event,
+                "level": logging.getLevelName(level),
+                "message": msg % args if args else msg,
+                **fields,
+            }
+            _sink.write(json.dumps(record, default=str) + "\n")
+
+    def debug(self, event: str, msg: str, *args: Any, **fields: Any) -> None:
+        self.event(logging.DEBUG, event, msg, *args, **fields)
+
+    def info(self, event: str, msg: str, *args: Any, **fields: Any) -> None:
+        self.event(logging.INFO, event, msg, *args, **fields)
+
+
+TRIE = Tracer("trie")
+SWIM = Tracer("swim")
+
+TRACERS = {x.subsystem: x for x in (TRIE, SWIM)}
+
+
+def configure(levels: Mapping[str, str], sink_path: Path | None = None) -> None:
+    """
+    Enable the given subsystems at the given levels (logging level names) and
+    disable the others. Events are written to sink_path if given.
+    """
+    close()
+
+    level_names = logging.getLevelNamesMapping()
+    for name, level in levels.items():
+        if name not in TRACERS:
+            msg = f"unknown tracing subsystem {name}, expected one of {list(TRACERS)}"
+            raise ValueError(msg)
+        if level.upper() not in level_names:
+            msg = f"unknown tracing level {level} for {name}"
+            raise ValueError(msg)
+
+    for name, tracer in TRACERS.items():
+        level = levels.get(name)
+        tracer.set_level(DISABLED if level is None else level_names[level.upper()])
+
+    global _sink
+    if sink_path is not None and levels:
+        _sink = sink_path.open("w")
+
+
+def close() -> None:
+    """Close the sink, if any. Tracers keep their levels."""
+    global _sink
+    if _sink is not None:
+        _sink.close()
+        _sink = None
@@ -1,11 +1,9 @@
-import logging
-from typing import Generic, TypeVar
+from __future__ import annotations
 
-LOGGER = logging.getLogger()
-LOGGER.setLevel(logging.DEBUG)
-handler = logging.StreamHandler()
-handler.setLevel(logging.DEBUG)
-LOGGER.addHandler(handler)
+from dataclasses import dataclass
+from typing import Generator, Generic, TypeVar
+
+from postgame.tracing import TRIE
 
 T = TypeVar("T")
 
@@ -20,91 +18,99 @@ class Node(Generic[T]):
         return f"{self.address} - {self.value} - {self.children}"
 
 
+@dataclass(frozen=True)
+class TrieWalkEntry(Generic[T]):
+    """
+    A node visited by Trie.walk. Nodes are numbered in visiting order, starting
+    with the root at 0.
+    """
+
+    index: int
+    depth: int
+    node: Node[T]
+    parent: TrieWalkEntry[T] | None
+
+
 class Trie(Generic[T]):
     def __init__(self):
         self.root = Node[T](0, None)
 
     def __str__(self) -> str:
-        indent = ""
-        return self._str(self.root, indent)
-
-    def _str(self, node: Node[T], indent: str) -> str:
-        s = f"{indent} [{node.address}] {node.value}\n"
-
-        indent += "  "
-        for child in node.children.values():
-            s += self._str(child, indent)
-
-        return s
+        return "".join(
+            f"{'  ' * x.depth} [{x.node.address}] {x.node.value}\n" for x in self.walk()
+        )
+
+    def walk(
+        self, max_depth: int | None = None
+    ) -> Generator[TrieWalkEntry[T], None, None]:
+        """
+        Visit the nodes in depth first preorder, children in insertion order,
+        without recursing. Nodes deeper than max_depth (the root having depth 0)
+        aren't visited.
+        """
+        index = 0
+        stack: list[tuple[Node[T], TrieWalkEntry[T] | None, int]] = [
+            (self.root, None, 0)
+        ]
+        while stack:
+            node, parent, depth = stack.pop()
+            entry = TrieWalkEntry(index, depth, node, parent)
+            index += 1
+            yield entry
+
+            if max_depth is None or depth < max_depth:
+                stack.extend(
+                    (child, entry, depth + 1)
+                    for child in reversed(node.children.values())
+                )
 
     def values(self) -> list[T | None]:
-        return self._values(self.root)
-
-    def _values(self, node: Node[T]) -> list[T | None]:
-        node_values = [node.value]
-        for child in node.children.values():
-            node_values.extend(self._values(child))
-        return node_values
+        return [x.node.value for x in self.walk()]
 
     def keys(self) -> list[list[int]]:
-        return self._keys(self.root, [])
-
-    def _keys(self, node: Node[T], cur_key: list[int]) -> list[list[int]]:
-        nodes = [cur_key + [node.address]]
-        for trace, child in node.children.items():
-            nodes.extend(self._keys(child, cur_key + [trace]))
-        return nodes
+        keys: list[list[int]] = []
+        stack: list[tuple[Node[T], list[int]]] = [(self.root, [])]
+        while stack:
+            node, cur_key = stack.pop()
+            keys.append(cur_key + [node.address])
+            stack.extend(
+                (child, cur_key + [trace])
+                for trace, child in reversed(node.children.items())
+            )
+        return keys
 
     def get_node(self, trace: list[int]) -> Node[T] | None:
-        return self.__get_node(self.root, trace)
-
-    def __get_node(self, node: Node[T], trace: list[int]) -> Node[T] | None:
-        if len(trace) == 1:
-            return node.children[trace[0]]
-        else:
-            return self.__get_node(node.children[trace[0]], trace[1:])
+        node = self.root
+        for addr in trace:
+            node = node.children[addr]
+        return node
 
     def insert_value(self, trace: list[int], value: T):
-        success = self.__insert_value(self.root, trace, value)
-        if success:
-            msg = f"Inserted node with trace {[hex(x) for x in trace]} into trie"
-            LOGGER.debug(msg)
-
-    def __insert_value(self, node: Node[T], trace: list[int], value: T) -> bool:
-        if len(trace) == 1:
-            if trace[0] not in node.children:
-                node.children[trace[0]] = Node[T](trace[0], value)
-                return True
-            else:
-                return False
-        else:
-            if trace[0] not in node.children:
-                node.children[trace[0]] = Node[T](trace[0], None)
-            return self.__insert_value(node.children[trace[0]], trace[1:], value)
+        node = self.root
+        for addr in trace[:-1]:
+            if addr not in node.children:
+                node.children[addr] = Node[T](addr, None)
+            node = node.children[addr]
+
+        if trace[-1] not in node.children:
+            node.children[trace[-1]] = Node[T](trace[-1], value)
+            if TRIE.enabled:
+                TRIE.debug(
+                    "insert",
+                    "Inserted node with trace %s into trie",
+                    [hex(x) for x in trace],
+                    trace=trace,
+                )
 
     def remove_node(self, trace: list[int]):
-        self.__remove_node(trace, self.root)
-
-    def __remove_node(self, trace: list[int], cur_node: Node[T]):
-        if len(trace) == 1:
-            del cur_node.children[trace[0]]
-        else:
-            self.__remove_node(trace[1:], cur_node.children[trace[0]])
+        del self.__parent(trace).children[trace[-1]]
 
     def insert_node(self, trace: list[int], node: Node[T]):
-        self.__insert_node(trace, node, self.root)
-
-    def __insert_node(
-        self,
-        trace: list[int],
-        node_to_insert: Node[T],
-        node_in_trie: Node[T],
-    ):
-        if len(trace) == 1:
-            node_in_trie.children[trace[0]] = node_to_insert
-        else:
-            self.__insert_node(
-                trace[1:],
-                node_to_insert,
-                node_in_trie.children[trace[0]],
-            )
+        self.__parent(trace).children[trace[-1]] = node
+
+    def __parent(self, trace: list[int]) -> Node[T]:
+        """The parent of the node at trace, which must exist."""
+        node = self.root
+        for addr in trace[:-1]:
+            node = node.children[addr]
+        return node
@@ -0,0 +1,117 @@
+"""
+Streaming export of tries as indented text, JSON lines or Graphviz dot.
+
+Writers visit the trie with Trie.walk and write each node as soon as it is
+visited, so tries of any size and depth can be dumped. All of them take the
+same limits: nodes deeper than max_depth (the root having depth 0) are skipped
+and at most max_nodes nodes are written. Each returns the number of nodes it
+wrote.
+"""
+
+from __future__ import annotations
+
+import json
+from itertools import islice
+from typing import Callable, Generator, TextIO, TypeVar
+
+from postgame.trie import Trie, TrieWalkEntry
+
+T = TypeVar("T")
+
+TRUNCATED_MSG = "truncated after {} nodes"
+
+
+def _walk(
+    trie: Trie[T],
+    max_depth: int | None,
+    max_nodes: int | None,
+    on_truncated: Callable[[int], None],
+) -> Generator[TrieWalkEntry[T], None, None]:
+    """trie.walk(max_depth), calling on_truncated if max_nodes is reached."""
+    walk = trie.walk(max_depth)
+    yield from islice(walk, max_nodes)
+
+    if max_nodes is not None and next(walk, None) is not None:
+        on_truncated(max_nodes)
+
+
+def write_text(
+    trie: Trie[T],
+    f: TextIO,
+    max_depth: int | None = None,
+    max_nodes: int | None = None,
+) -> int:
+    """The nodes indented by depth, as printed by str(trie)."""
+    count = 0
+
+    def truncated(n: int):
+        f.write(f"... {TRUNCATED_MSG.format(n)}\n")
+
+    for entry in _walk(trie, max_depth, max_nodes, truncated):
+        f.write(f"{'  ' * entry.depth} [{entry.node.address}] {entry.node.value}\n")
+        count += 1
+
+    return count
+
+
+def write_jsonl(
+    trie: Trie[T],
+    f: TextIO,
+    max_depth: int | None = None,
+    max_nodes: int | None = None,
+) -> int:
+    """
+    One JSON object per node, parents before their children, referring to its
+    parent by its id. A last {"truncated": max_nodes} object is written if
+    max_nodes was reached.
+    """
+    count = 0
+
+    def truncated(n: int):
+        f.write(json.dumps({"truncated": n}) + "\n")
+
+    for entry in _walk(trie, max_depth, max_nodes, truncated):
+        node = entry.node
+        record = {
+            "id": entry.index,
+            "parent": entry.parent.index if entry.parent is not None else None,
+            "depth": entry.depth,
+            "address": hex(node.address),
+            "value": str(node.value) if node.value is not None else None,
+            "children": len(node.children),
+        }
+        f.write(json.dumps(record) + "\n")
+        count += 1
+
+    return count
+
+
+def _dot_label(s: str) -> str:
+    return '"' + s.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def write_dot(
+    trie: Trie[T],
+    f: TextIO,
+    max_depth: int | None = None,
+    max_nodes: int | None = None,
+) -> int:
+    """A Graphviz digraph with an edge from every node to each of its children."""
+    count = 0
+
+    def truncated(n: int):
+        f.write(f"  // {TRUNCATED_MSG.format(n)}\n")
+
+    f.write("digraph trie {\n")
+    for entry in _walk(trie, max_depth, max_nodes, truncated):
+        node = entry.node
+        label = hex(node.address)
+        if node.value is not None:
+            label += f"\n{node.value}"
+        f.write(f"  n{entry.index} [label={_dot_label(label)}];\n")
+        if entry.parent is not None:
+            f.write(f"  n{entry.parent.index} -> n{entry.index};\n")
+        count += 1
+    f.write("}\n")
+
+    return count
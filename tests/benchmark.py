@@ -0,0 +1,365 @@
+"""
+Benchmark the postgame and evaluation over inputs of increasing size.
+
+Each Postgame step (see Postgame.main) and evaluation.run_evaluation is timed
+and its peak memory recorded. Runs over synthetic inputs of several sizes are
+used to fit a power law (time = c * size^k) per step, and the fitted exponents
+are compared against a stored baseline so that a change that makes a step
+asymptotically slower is caught.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import math
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+from pydantic import BaseModel, Field
+from typer import Exit, Typer
+
+import evaluation.evaluation
+from parseconfig import AnalysisTool, Config
+from postgame.postgame import Postgame
+from tests.synthetic_project import SyntheticProjectSpec, generate_project
+
+APP = Typer()
+
+SCRIPT_PATH = Path(__file__).parent.absolute()
+REPO_PATH = SCRIPT_PATH.parent
+BASELINE_PATH = SCRIPT_PATH / "benchmark-baseline.json"
+
+DEFAULT_SIZES = [500, 1000, 2000, 4000]
+
+# Synthetic traces generated per class; the number of classes grows with the
+# number of traces so that both the trie and the trace set grow.
+TRACES_PER_CLASS = 20
+
+# Steps that never take longer than this are not checked against the
+# baseline, since their fitted exponent is dominated by noise.
+NOISE_FLOOR_SECONDS = 0.01
+NOISE_FLOOR_BYTES = 256 * 1024
+
+# How much a step's fitted exponent may exceed the baseline exponent before it
+# is reported as a regression.
+DEFAULT_TOLERANCE = 0.4
+
+EVALUATION_STEP = "run_evaluation"
+
+# Checked-in inputs, relative to the repository root, with the analysis tool
+# that matches the files present in each directory.
+CHECKED_IN_INPUTS: dict[str, tuple[Path, AnalysisTool]] = {
+    "tests-data": (Path("tests") / "data", AnalysisTool.LEGO_PLUS),
+    "example-four": (Path("examples") / "four", AnalysisTool.LEGO_PLUS),
+    "example-5": (Path("examples") / "example-5", AnalysisTool.LEGO_PLUS),
+}
+
+
+class StepMeasurement(BaseModel):
+    seconds: float = 0.0
+    peak_bytes: int = 0
+
+
+class BenchmarkRun(BaseModel):
+    name: str
+    size: int
+    steps: dict[str, StepMeasurement] = Field(default_factory=dict)
+
+
+class ScalingCurve(BaseModel):
+    """Power law time = coefficient * size^exponent fitted to a step."""
+
+    exponent: float
+    coefficient: float
+    memory_exponent: float
+    max_seconds: float
+    max_peak_bytes: int
+
+
+class BenchmarkReport(BaseModel):
+    synthetic: list[BenchmarkRun] = Field(default_factory=list)
+    checked_in: list[BenchmarkRun] = Field(default_factory=list)
+    curves: dict[str, ScalingCurve] = Field(default_factory=dict)
+
+
+class _Measurer:
+    """Records time and tracemalloc peak of named steps into a BenchmarkRun."""
+
+    def __init__(self, run: BenchmarkRun):
+        self.run = run
+
+    def measure(self, name: str, function: Callable[[], None]) -> None:
+        start_memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        start_time = time.perf_counter()
+        function()
+        end_time = time.perf_counter()
+        peak_memory = tracemalloc.get_traced_memory()[1] - start_memory
+
+        # Steps that run more than once (e.g. update_method_type) accumulate.
+        step = self.run.steps.setdefault(name, StepMeasurement())
+        step.seconds += end_time - start_time
+        step.peak_bytes = max(step.peak_bytes, peak_memory)
+
+
+class ProfilingPostgame(Postgame):
+    """Postgame that records each step it runs instead of only logging it."""
+
+    def __init__(self, cfg: Config, measurer: _Measurer):
+        super().__init__(cfg)
+        self.__measurer = measurer
+
+    def run_step(
+        self,
+        function: Callable[[], None],
+        start_msg: str,
+        end_msg: str,
+    ) -> None:
+        self.__measurer.measure(function.__name__, function)
+
+
+def _benchmark_cfg(
+    base_directory: Path,
+    out_directory: Path,
+    analysis_tool: AnalysisTool,
+) -> Config:
+    # Outputs are redirected to out_directory so checked-in inputs are never
+    # overwritten.
+    return Config(
+        config_fname=base_directory / "config.json",
+        analysis_tool=analysis_tool,
+        base_directory=Path("."),
+        results_path=out_directory / "evaluation.json",
+        results_instrumented_path=out_directory / "evaluation-instrumented.json",
+        results_json=out_directory / "results.json",
+        pdb_file=Path("benchmark.pdb"),
+        binary_path=Path("benchmark.exe"),
+    )
+
+
+def count_traces(object_traces: Path) -> int:
+    with object_traces.open() as f:
+        return sum(1 for line in f if line == "\n") + 1
+
+
+def benchmark_project(
+    name: str,
+    size: int,
+    cfg: Config,
+    instrumented: bool = True,
+) -> BenchmarkRun:
+    """
+    Run the whole postgame and (if a ground truth exists) the evaluation. The
+    instrumented evaluation writes statistics next to the instrumented ground
+    truth, so it should be disabled for checked-in inputs.
+    """
+    run = BenchmarkRun(name=name, size=size)
+    measurer = _Measurer(run)
+
+    tracemalloc.start()
+    try:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            ProfilingPostgame(cfg, measurer).main()
+
+        if cfg.gt_results_json.exists():
+            instrumented = instrumented and cfg.gt_methods_instrumented_path.exists()
+            measurer.measure(
+                EVALUATION_STEP,
+                lambda: evaluation.evaluation.run_evaluation(
+                    cfg.gt_results_json,
+                    cfg.results_json,
+                    cfg.results_path,
+                    cfg.results_instrumented_path if instrumented else None,
+                    cfg.gt_methods_instrumented_path if instrumented else None,
+                ),
+            )
+    finally:
+        tracemalloc.stop()
+
+    return run
+
+
+def synthetic_spec(size: int, seed: int = 0) -> SyntheticProjectSpec:
+    """Spec of a synthetic project containing size object traces."""
+    classes = max(1, size // TRACES_PER_CLASS)
+    # Hierarchies of 7 classes (depth 3, fan-out 2).
+    return SyntheticProjectSpec(
+        roots=max(1, classes // 7),
+        depth=3,
+        fan_out=2,
+        traces=size,
+        seed=seed,
+    )
+
+
+def fit_power_law(sizes: list[int], values: list[float]) -> tuple[float, float]:
+    """
+    Least-squares fit of log(value) = log(coefficient) + exponent * log(size).
+    Returns (exponent, coefficient).
+    """
+    points = [(math.log(s), math.log(max(v, 1e-9))) for s, v in zip(sizes, values)]
+    if len(points) < 2:
+        return 0.0, math.exp(points[0][1]) if points else 0.0
+
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    var_x = sum((x - mean_x) ** 2 for x, _ in points)
+    if var_x == 0.0:
+        return 0.0, math.exp(mean_y)
+
+    exponent = sum((x - mean_x) * (y - mean_y) for x, y in points) / var_x
+    return exponent, math.exp(mean_y - exponent * mean_x)
+
+
+def fit_curves(runs: list[BenchmarkRun]) -> dict[str, ScalingCurve]:
+    curves: dict[str, ScalingCurve] = {}
+    step_names = {name for run in runs for name in run.steps}
+    for name in sorted(step_names):
+        measured = [run for run in runs if name in run.steps]
+        sizes = [run.size for run in measured]
+        seconds = [run.steps[name].seconds for run in measured]
+        exponent, coefficient = fit_power_law(sizes, seconds)
+        peak_bytes = [run.steps[name].peak_bytes for run in measured]
+        memory_exponent, _ = fit_power_law(sizes, [float(x) for x in peak_bytes])
+        curves[name] = ScalingCurve(
+            exponent=exponent,
+            coefficient=coefficient,
+            memory_exponent=memory_exponent,
+            max_seconds=max(seconds),
+            max_peak_bytes=max(peak_bytes),
+        )
+    return curves
+
+
+def run_benchmarks(
+    sizes: list[int],
+    checked_in: bool = True,
+    seed: int = 0,
+) -> BenchmarkReport:
+    report = BenchmarkReport()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+
+        for size in sizes:
+            project_dir = tmp_path / f"synthetic-{size}"
+            generate_project(synthetic_spec(size, seed), project_dir)
+            cfg = _benchmark_cfg(project_dir, project_dir, AnalysisTool.KREO)
+            report.synthetic.append(benchmark_project("synthetic", size, cfg))
+
+        if checked_in:
+            for name, (directory, tool) in CHECKED_IN_INPUTS.items():
+                base_directory = REPO_PATH / directory
+                out_directory = tmp_path / name
+                out_directory.mkdir()
+                cfg = _benchmark_cfg(base_directory, out_directory, tool)
+                size = count_traces(cfg.object_traces_path)
+                report.checked_in.append(
+                    benchmark_project(name, size, cfg, instrumented=False)
+                )
+
+    report.curves = fit_curves(report.synthetic)
+    return report
+
+
+def compare_to_baseline(
+    report: BenchmarkReport,
+    baseline: BenchmarkReport,
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> list[str]:
+    """
+    Returns a description of every step whose time or memory scales worse than
+    in the baseline. An empty list means no regressions.
+    """
+    regressions: list[str] = []
+    for name, curve in report.curves.items():
+        if name not in baseline.curves:
+            continue
+        expected = baseline.curves[name]
+        if (
+            curve.max_seconds >= NOISE_FLOOR_SECONDS
+            and curve.exponent > expected.exponent + tolerance
+        ):
+            regressions.append(
+                f"{name}: time scales as size^{curve.exponent:.2f}, "
+                f"baseline size^{expected.exponent:.2f}"
+            )
+        if (
+            curve.max_peak_bytes >= NOISE_FLOOR_BYTES
+            and curve.memory_exponent > expected.memory_exponent + tolerance
+        ):
+            regressions.append(
+                f"{name}: memory scales as size^{curve.memory_exponent:.2f}, "
+                f"baseline size^{expected.memory_exponent:.2f}"
+            )
+    return regressions
+
+
+def print_report(report: BenchmarkReport) -> None:
+    for run in report.synthetic + report.checked_in:
+        print(f"{run.name} (size {run.size})")
+        for name, step in run.steps.items():
+            print(
+                f"    {name:45} {step.seconds:9.4f}s "
+                f"{step.peak_bytes / 1024 / 1024:9.2f} MiB"
+            )
+    print("scaling (time ~ size^k)")
+    for name, curve in report.curves.items():
+        print(
+            f"    {name:45} k={curve.exponent:5.2f} "
+            f"memory k={curve.memory_exponent:5.2f}"
+        )
+
+
+@APP.command()
+def run(
+    sizes: list[int] = DEFAULT_SIZES,
+    output: Path | None = None,
+    checked_in: bool = True,
+):
+    """Run the benchmarks and print (and optionally save) the report."""
+    report = run_benchmarks(sizes, checked_in)
+    print_report(report)
+    if output:
+        output.write_text(report.model_dump_json(indent=4))
+
+
+@APP.command()
+def update_baseline(
+    sizes: list[int] = DEFAULT_SIZES,
+    baseline: Path = BASELINE_PATH,
+):
+    """Run the benchmarks and store the result as the new baseline."""
+    report = run_benchmarks(sizes)
+    print_report(report)
+    baseline.write_text(report.model_dump_json(indent=4))
+
+
+@APP.command()
+def compare(
+    sizes: list[int] = DEFAULT_SIZES,
+    baseline: Path = BASELINE_PATH,
+    tolerance: float = DEFAULT_TOLERANCE,
+):
+    """Run the benchmarks and fail if any step scales worse than the baseline."""
+    report = run_benchmarks(sizes)
+    print_report(report)
+
+    regressions = compare_to_baseline(
+        report,
+        BenchmarkReport.model_validate_json(baseline.read_text()),
+        tolerance,
+    )
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    if regressions:
+        raise Exit(1)
+
+
+if __name__ == "__main__":
+    APP()
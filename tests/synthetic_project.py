@@ -0,0 +1,370 @@
+"""
+Generate synthetic KreO inputs from a model C++ class hierarchy.
+
+The generated project directory contains everything the postgame and the
+evaluation need (object traces, name map, blacklist, method candidates, static
+traces, base address) along with a ground truth (gt-results.json) describing
+the model hierarchy, so both the speed and the accuracy of the analysis can be
+checked on inputs much larger than the checked-in projects.
+
+The helpers after generate_project are shared by the tests that run on
+synthetic projects.
+"""
+
+from __future__ import annotations
+
+import random
+import shutil
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Iterator
+
+from pydantic import BaseModel
+from typer import Typer
+
+import postgame.analysis_results as ar
+from parseconfig import AnalysisTool, Config
+from postgame.postgame import Postgame
+
+APP = Typer()
+
+# Distance between consecutive synthetic procedures.
+PROCEDURE_ALIGNMENT = 0x10
+
+
+class SyntheticProjectSpec(BaseModel):
+    """Knobs controlling the size and shape of a synthetic project."""
+
+    # Number of independent class hierarchies.
+    roots: int = 2
+    # Number of levels in each hierarchy (a depth of 1 means no inheritance).
+    depth: int = 3
+    # Number of subclasses of each non-leaf class.
+    fan_out: int = 2
+    # Ordinary methods per class that are called dynamically.
+    methods_per_class: int = 3
+    # Methods per class that are never called dynamically and can only be
+    # discovered from the static traces.
+    uncalled_methods_per_class: int = 1
+    # Number of object traces (object instances) to generate.
+    traces: int = 100
+    # Number of method calls in the body of each object trace.
+    body_length: int = 5
+    # Probability that a call in an object trace is accompanied by a call to a
+    # blacklisted (non-method) procedure.
+    noise: float = 0.1
+    # Probability that an object is allocated at the same address as the
+    # previous one, so that the pintool emits both objects as one trace that
+    # has to be split by the postgame.
+    address_reuse: float = 0.05
+    # Number of blacklisted helper procedures that noise calls are drawn from.
+    noise_procedures: int = 8
+    seed: int = 0
+    base_address: int = 0x400000
+    first_procedure: int = 0x11000
+
+
+@dataclass
+class SyntheticClass:
+    name: str
+    parent: SyntheticClass | None
+    ctor: int = 0
+    dtor: int = 0
+    methods: list[int] = field(default_factory=list)
+    uncalled_methods: list[int] = field(default_factory=list)
+
+    @property
+    def unique_name(self) -> str:
+        return f".?AV{self.name}@@"
+
+    def chain(self) -> list[SyntheticClass]:
+        """Return this class followed by all its ancestors, most derived first."""
+        chain: list[SyntheticClass] = []
+        cls: SyntheticClass | None = self
+        while cls is not None:
+            chain.append(cls)
+            cls = cls.parent
+        return chain
+
+    def all_methods(self) -> list[int]:
+        return [self.ctor, self.dtor] + self.methods + self.uncalled_methods
+
+
+@dataclass
+class SyntheticProject:
+    """Model of a synthetic project, as written by generate_project."""
+
+    spec: SyntheticProjectSpec
+    classes: list[SyntheticClass] = field(default_factory=list)
+    noise_procedures: list[int] = field(default_factory=list)
+    names: dict[int, str] = field(default_factory=dict)
+    instrumented: set[int] = field(default_factory=set)
+
+    def analysis_results(self) -> ar.AnalysisResults:
+        """Ground truth of the model in the same format pdb_parser generates."""
+        results = ar.AnalysisResults()
+        for cls in self.classes:
+            structure = ar.Structure(name=cls.unique_name, demangled_name=cls.name)
+            if cls.parent is not None:
+                structure.members["0"] = ar.Member(
+                    name=cls.parent.name,
+                    struc=cls.parent.unique_name,
+                )
+
+            for addr in cls.all_methods():
+                if addr == cls.ctor:
+                    method_type = ar.MethodType.ctor
+                elif addr == cls.dtor:
+                    method_type = ar.MethodType.dtor
+                else:
+                    method_type = ar.MethodType.meth
+                ea = hex(addr + self.spec.base_address)
+                name = self.names[addr].split(" __thiscall ")[-1].split("(")[0]
+                structure.methods[ea] = ar.Method(
+                    demangled_name=name,
+                    ea=ea,
+                    name=name,
+                    type=method_type,
+                )
+
+            results.structures[cls.unique_name] = structure
+        return results
+
+
+def build_model(spec: SyntheticProjectSpec) -> SyntheticProject:
+    """Lay out the class hierarchy and assign addresses to every procedure."""
+    project = SyntheticProject(spec)
+    next_addr = spec.first_procedure
+
+    def new_procedure(name: str) -> int:
+        nonlocal next_addr
+        addr = next_addr
+        next_addr += PROCEDURE_ALIGNMENT
+        project.names[addr] = name
+        return addr
+
+    def add_class(parent: SyntheticClass | None, level: int) -> None:
+        cls = SyntheticClass(f"Class{len(project.classes)}", parent)
+        project.classes.append(cls)
+
+        cls.ctor = new_procedure(f"public: __thiscall {cls.name}::{cls.name}(void)")
+        cls.dtor = new_procedure(f"public: __thiscall {cls.name}::~{cls.name}(void)")
+        for i in range(spec.methods_per_class):
+            cls.methods.append(
+                new_procedure(f"public: void __thiscall {cls.name}::method{i}(void)")
+            )
+        for i in range(spec.uncalled_methods_per_class):
+            cls.uncalled_methods.append(
+                new_procedure(f"public: void __thiscall {cls.name}::uncalled{i}(void)")
+            )
+
+        if level + 1 < spec.depth:
+            for _ in range(spec.fan_out):
+                add_class(cls, level + 1)
+
+    for _ in range(spec.roots):
+        add_class(None, 0)
+
+    for i in range(spec.noise_procedures):
+        project.noise_procedures.append(new_procedure(f"_noise_procedure_{i}"))
+
+    return project
+
+
+def _object_trace(
+    project: SyntheticProject,
+    cls: SyntheticClass,
+    rng: random.Random,
+) -> Iterator[tuple[int, bool]]:
+    """
+    Yield the (address, is_call) entries of one object's lifetime: nested
+    constructor calls (most derived first), a body of method calls on any class
+    in the object's hierarchy and nested destructor calls.
+    """
+    spec = project.spec
+    chain = cls.chain()
+
+    def noise() -> Iterator[tuple[int, bool]]:
+        if project.noise_procedures and rng.random() < spec.noise:
+            addr = rng.choice(project.noise_procedures)
+            yield addr, True
+            yield addr, False
+
+    for c in chain:
+        yield c.ctor, True
+    yield from noise()
+    for c in reversed(chain):
+        yield c.ctor, False
+
+    callable_methods = [m for c in chain for m in c.methods]
+    if callable_methods:
+        for _ in range(spec.body_length):
+            method = rng.choice(callable_methods)
+            yield method, True
+            yield from noise()
+            yield method, False
+
+    for c in chain:
+        yield c.dtor, True
+    yield from noise()
+    for c in reversed(chain):
+        yield c.dtor, False
+
+
+def _write_object_traces(
+    project: SyntheticProject,
+    rng: random.Random,
+    f: IO[str],
+) -> None:
+    spec = project.spec
+    for i in range(spec.traces):
+        cls = rng.choice(project.classes)
+        for addr, is_call in _object_trace(project, cls, rng):
+            if is_call:
+                project.instrumented.add(addr)
+            f.write(f"{addr:x} 1\n" if is_call else f"{addr:x}\n")
+
+        # Objects allocated at the same address are emitted as a single trace.
+        if i + 1 == spec.traces or rng.random() >= spec.address_reuse:
+            f.write("\n")
+
+
+def _write_static_traces(project: SyntheticProject, f: IO[str]) -> None:
+    for cls in project.classes:
+        f.write(f"# Analysis from procedure  @ {cls.ctor:x} (1 many traces):\n")
+        for addr in [cls.ctor] + cls.methods + cls.uncalled_methods:
+            f.write(f"{addr:x}\n")
+        f.write("\n")
+
+
+def generate_project(spec: SyntheticProjectSpec, out_dir: Path) -> SyntheticProject:
+    """
+    Write a synthetic project into out_dir, using the default file names from
+    parseconfig.Config. Returns the model the project was generated from.
+    """
+    rng = random.Random(spec.seed)
+    project = build_model(spec)
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    with (out_dir / "base-address").open("w") as f:
+        f.write(f"{spec.base_address:x}\n")
+
+    with (out_dir / "object-traces").open("w") as f:
+        _write_object_traces(project, rng, f)
+
+    with (out_dir / "object-traces-name-map").open("w") as f:
+        for addr, name in project.names.items():
+            f.write(f"{addr:x} {name}\n")
+
+    with (out_dir / "blacklisted-methods").open("w") as f:
+        for addr in project.noise_procedures:
+            f.write(f"{addr:x}\n")
+
+    with (out_dir / "method-candidates").open("w") as f:
+        for addr in project.names:
+            f.write(f"{addr:x}\n")
+
+    with (out_dir / "static-traces").open("w") as f:
+        _write_static_traces(project, f)
+
+    with (out_dir / "gt-methods-instrumented").open("w") as f:
+        for addr in sorted(project.instrumented - set(project.noise_procedures)):
+            f.write(f"{addr:x}\n")
+
+    with (out_dir / "gt-results.json").open("w") as f:
+        f.write(project.analysis_results().model_dump_json(indent=4))
+
+    return project
+
+
+def synthetic_cfg(base_directory: Path) -> Config:
+    return Config(
+        config_fname=base_directory / "config.json",
+        analysis_tool=AnalysisTool.KREO,
+        base_directory=Path("."),
+        results_path=Path("evaluation.json"),
+        results_instrumented_path=Path("evaluation-instrumented.json"),
+        pdb_file=Path("synthetic.pdb"),
+        binary_path=Path("synthetic.exe"),
+    )
+
+
+def split_runs(base_directory: Path, runs: int) -> list[Path]:
+    """Split the object traces of a project into the traces of several runs."""
+    traces = (base_directory / "object-traces").read_text().split("\n\n")
+    size = len(traces) // runs + 1
+
+    paths: list[Path] = []
+    for i in range(runs):
+        path = base_directory / f"object-traces-{i}"
+        path.write_text("\n\n".join(traces[i * size : (i + 1) * size]) + "\n")
+        shutil.copy(base_directory / "object-traces-name-map", f"{path}-name-map")
+        paths.append(path)
+    return paths
+
+
+def class_traces(dut: Postgame) -> dict[int, set[tuple[int, ...]]]:
+    return {
+        method.address: {
+            tuple(x.method.address for x in cls.tail_returns) for cls in cls_set
+        }
+        for method, cls_set in dut.method_to_class_map.items()
+    }
+
+
+def shuffled_results(
+    gt: ar.AnalysisResults,
+    rng: random.Random,
+) -> ar.AnalysisResults:
+    """Generated results whose classes contain random subsets of gt methods."""
+    methods = gt.get_methods()
+    gen = ar.AnalysisResults()
+    for i in range(len(gt.structures)):
+        cls = ar.Structure(name=f"gen{i}", demangled_name=f"gen{i:03}")
+        for method in rng.sample(methods, rng.randint(0, 8)):
+            cls.methods[method.ea] = method
+        if i > 0 and rng.random() < 0.5:
+            parent = f"gen{rng.randrange(i)}"
+            cls.members["0x0"] = ar.Member(name=parent + "_0x0", struc=parent)
+        gen.structures[cls.name] = cls
+    return gen
+
+
+@APP.command()
+def main(
+    out_dir: Path,
+    roots: int = 2,
+    depth: int = 3,
+    fan_out: int = 2,
+    methods_per_class: int = 3,
+    uncalled_methods_per_class: int = 1,
+    traces: int = 100,
+    body_length: int = 5,
+    noise: float = 0.1,
+    address_reuse: float = 0.05,
+    seed: int = 0,
+):
+    project = generate_project(
+        SyntheticProjectSpec(
+            roots=roots,
+            depth=depth,
+            fan_out=fan_out,
+            methods_per_class=methods_per_class,
+            uncalled_methods_per_class=uncalled_methods_per_class,
+            traces=traces,
+            body_length=body_length,
+            noise=noise,
+            address_reuse=address_reuse,
+            seed=seed,
+        ),
+        out_dir,
+    )
+    print(
+        f"Generated {len(project.classes)} classes and {len(project.names)} "
+        f"procedures in {out_dir}"
+    )
+
+
+if __name__ == "__main__":
+    APP()
@@ -0,0 +1,84 @@
+import io
+import json
+from pathlib import Path
+
+import postgame.analysis_results as ar
+from postgame.name_map import NameMap
+from postgame.postgame import Postgame
+from tests.synthetic_project import (
+    SyntheticProjectSpec,
+    build_model,
+    generate_project,
+    synthetic_cfg,
+)
+
+
+def written(
+    analysis_results: ar.AnalysisResults,
+    structures: list[tuple[str, ar.Structure]] | None = None,
+) -> str:
+    f = io.StringIO()
+    ar.write_analysis_results(f, analysis_results, structures)
+    return f.getvalue()
+
+
+def test_write_analysis_results_matches_json_dumps():
+    gt = build_model(SyntheticProjectSpec()).analysis_results()
+    gt.filename = "synthetic.exe"
+    gt.vcalls = {"0x1": {"0x2": ["0x3"]}}
+
+    assert written(gt) == json.dumps(gt.model_dump(), indent=4)
+
+
+def test_write_analysis_results_empty():
+    results = ar.AnalysisResults(version="kreo-0.1.0")
+
+    assert written(results) == json.dumps(results.model_dump(), indent=4)
+
+
+def test_write_analysis_results_escapes_like_json_dumps():
+    structure = ar.Structure(name='aé\n"\x01\x7f', demangled_name="☃")
+    results = ar.AnalysisResults(structures={structure.name: structure})
+
+    assert written(results) == json.dumps(results.model_dump(), indent=4)
+
+
+def test_write_analysis_results_from_iterable():
+    gt = build_model(SyntheticProjectSpec(roots=1)).analysis_results()
+    header = ar.AnalysisResults(filename="x")
+
+    expected = gt.model_copy(update={"filename": "x"})
+    assert written(header, list(gt.structures.items())) == json.dumps(
+        expected.model_dump(), indent=4
+    )
+
+
+def test_load_analysis_results(tmp_path: Path):
+    gt = build_model(SyntheticProjectSpec()).analysis_results()
+    path = tmp_path / "results.json"
+    path.write_text(written(gt))
+
+    assert ar.load_analysis_results(path) == gt
+    assert ar.load_analysis_results(path) == ar.AnalysisResults(
+        **json.loads(path.read_text())
+    )
+
+
+def test_postgame_generate_json_streams_structures(tmp_path: Path):
+    generate_project(SyntheticProjectSpec(traces=200, seed=5), tmp_path)
+    cfg = synthetic_cfg(tmp_path)
+
+    dut = Postgame(cfg)
+    dut.main()
+
+    # main closes the name map once the json is written.
+    with NameMap(Path(f"{cfg.object_traces_path}-name-map")) as dut.name_map:
+        structures = dict(dut.iter_structures())
+
+    expected = ar.AnalysisResults(
+        filename=cfg.binary_path.name,
+        filemd5="na",
+        structures=structures,
+        version="kreo-0.1.0",
+    )
+    assert cfg.results_json.read_text() == json.dumps(expected.model_dump(), indent=4)
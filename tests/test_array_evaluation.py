@@ -0,0 +1,201 @@
+import random
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import evaluation.evaluation as ev
+import postgame.analysis_results as ar
+from evaluation.array_evaluation import ArrayEvaluation, MethodTable
+from tests.synthetic_project import (
+    SyntheticProjectSpec,
+    build_model,
+    generate_project,
+    shuffled_results,
+)
+
+
+def reference_results(
+    gt: ar.AnalysisResults,
+    gen: ar.AnalysisResults,
+) -> dict[str, ev.EvaluationResult]:
+    ctx = ev.EvaluationContext(gt, gen)
+    return {
+        "Methods Assigned to Correct Class": ev.evaluate_methods_assigned_correct_class(
+            gt, gen, ctx
+        ),
+        "Individual Classes": ev.evaluate_classes(gt, gen, ctx),
+        "Constructors": ev.evaluate_constructors(gt, gen, ctx),
+        "Destructors": ev.evaluate_destructors(gt, gen, ctx),
+        "Methods": ev.evaluate_methods(gt, gen, ctx),
+        "Class Graph Edges": ev.evaluate_class_graph_edges(gt, gen, ctx),
+    }
+
+
+def array_evaluation(gt: ar.AnalysisResults, gen: ar.AnalysisResults):
+    return ArrayEvaluation(
+        MethodTable.from_analysis_results(gt),
+        MethodTable.from_analysis_results(gen),
+    )
+
+
+def test_method_table():
+    gt = build_model(SyntheticProjectSpec(roots=1, depth=2)).analysis_results()
+    table = MethodTable.from_analysis_results(gt)
+
+    assert table.cls_names == list(gt.structures)
+    assert len(table.addrs) == sum(len(x.methods) for x in gt.structures.values())
+    assert set(table.method_addrs().tolist()) == {
+        int(x, 16) for x in ev.get_method_ea_set_by_type(gt, None)
+    }
+    assert set(table.method_addrs(ar.MethodType.ctor).tolist()) == {
+        int(x, 16) for x in ev.get_method_ea_set_by_type(gt, ar.MethodType.ctor)
+    }
+    assert table.cls_parents[1] == [gt.structures[table.cls_names[0]].name]
+
+
+def test_deduplicated_large_addresses():
+    # x86_64 addresses reach past 2**32, where class 0 at 0x140001000 and
+    # class 1 at 0x40001000 would pack to the same 64-bit key.
+    addrs = [0x140001000, 0x40001000, 0x140001000]
+    table = MethodTable(
+        np.array(addrs, dtype=np.int64),
+        np.array([0, 1, 0], dtype=np.int64),
+        np.zeros(3, dtype=np.int64),
+        ["a", "b"],
+        ["a", "b"],
+        [[], []],
+    ).deduplicated()
+
+    assert table.addrs.tolist() == addrs[:2]
+    assert table.cls_ids.tolist() == [0, 1]
+
+
+def test_matching_matches_reference():
+    rng = random.Random(0)
+    for seed in range(5):
+        gt = build_model(SyntheticProjectSpec(seed=seed)).analysis_results()
+        gen = shuffled_results(gt, rng)
+
+        evaluation = array_evaluation(gt, gen)
+        expected = ev.match_gen_to_gt_classes(gt, gen)
+
+        assert [
+            (evaluation.gen.cls_names[x], evaluation.gt.cls_names[y])
+            for x, y in evaluation.matched_classes
+        ] == [(x.name, y.name) for x, y in expected]
+
+
+def test_metrics_match_reference():
+    rng = random.Random(2)
+    for seed in range(5):
+        gt = build_model(SyntheticProjectSpec(seed=seed)).analysis_results()
+        for gen in [shuffled_results(gt, rng), gt]:
+            actual = array_evaluation(gt, gen).run_all_tests().result_mapping
+            assert actual == reference_results(gt, gen)
+
+
+def test_metrics_empty_results():
+    gt = build_model(SyntheticProjectSpec()).analysis_results()
+    empty = ar.AnalysisResults()
+
+    for a, b in [(gt, empty), (empty, gt), (empty, empty)]:
+        actual = array_evaluation(a, b).run_all_tests().result_mapping
+        assert actual == reference_results(a, b)
+
+
+def test_class_graph_duplicate_gen_names():
+    def method(ea: str) -> ar.Method:
+        return ar.Method(demangled_name="", ea=ea, name="", type=ar.MethodType.meth)
+
+    def structure(name: str, ea: str, parent: str | None = None) -> ar.Structure:
+        members = {"0x0": ar.Member(name="", struc=parent)} if parent else {}
+        return ar.Structure(name=name, methods={ea: method(ea)}, members=members)
+
+    gt = ar.AnalysisResults(
+        structures={
+            "a": structure("a", "0x1"),
+            "b": structure("b", "0x2"),
+            "c": structure("c", "0x3", "a"),
+            "d": structure("d", "0x4"),
+        }
+    )
+    # Two generated classes are named x, but only the parent of y is looked up.
+    gen = ar.AnalysisResults(
+        structures={
+            "w": structure("w", "0x1"),
+            "x1": structure("x", "0x2"),
+            "x2": structure("x", "0x4"),
+            "y": structure("y", "0x3", "w"),
+        }
+    )
+    assert array_evaluation(gt, gen).class_graph_edges().true_positives == 4
+    assert reference_results(gt, gen)["Class Graph Edges"].true_positives == 4
+
+    gen.structures["y"] = structure("y", "0x3", "x")
+    with pytest.raises(RuntimeError):
+        array_evaluation(gt, gen).class_graph_edges()
+
+
+def test_run_evaluation_matches_reference(tmp_path: Path):
+    generate_project(SyntheticProjectSpec(traces=200, seed=3), tmp_path)
+    gt_path = tmp_path / "gt-results.json"
+    gen_path = tmp_path / "gen-results.json"
+    gen = shuffled_results(
+        ar.AnalysisResults.model_validate_json(gt_path.read_text()),
+        random.Random(3),
+    )
+    gen_path.write_text(gen.model_dump_json())
+
+    for reference in [False, True]:
+        ev.run_evaluation(
+            gt_path,
+            gen_path,
+            tmp_path / f"results-{reference}.json",
+            tmp_path / f"results-instrumented-{reference}.json",
+            tmp_path / "gt-methods-instrumented",
+            reference,
+        )
+
+    for name in ["results", "results-instrumented"]:
+        assert (tmp_path / f"{name}-False.json").read_text() == (
+            tmp_path / f"{name}-True.json"
+        ).read_text()
+
+
+def test_restricted_to_matches_instrumented_gt():
+    project = build_model(SyntheticProjectSpec(seed=4))
+    gt = project.analysis_results()
+    gen = shuffled_results(gt, random.Random(4))
+
+    rng = random.Random(4)
+    instrumented = [int(x.ea, 16) for x in gt.get_methods() if rng.random() < 0.5]
+    gt_instrumented = ev.get_gt_analysis_results_instrumented(
+        {hex(x) for x in instrumented}, gt
+    )
+
+    gt_table = MethodTable.from_analysis_results(gt).restricted_to(
+        np.array(sorted(instrumented), dtype=np.int64)
+    )
+    actual = ArrayEvaluation(gt_table, MethodTable.from_analysis_results(gen))
+
+    assert actual.run_all_tests().result_mapping == reference_results(
+        gt_instrumented, gen
+    )
+
+
+def test_instrumented_gt_does_not_copy():
+    gt = build_model(SyntheticProjectSpec(roots=1, depth=2)).analysis_results()
+    cls = next(iter(gt.structures.values()))
+    method = next(iter(cls.methods.values()))
+    methods_before = dict(cls.methods)
+
+    gt_instrumented = ev.get_gt_analysis_results_instrumented({method.ea}, gt)
+
+    assert list(gt_instrumented.structures) == [cls.name]
+    instrumented_cls = gt_instrumented.structures[cls.name]
+    assert list(instrumented_cls.methods.values()) == [method]
+    assert instrumented_cls.methods[method.ea] is method
+    # The ground truth itself is left untouched.
+    assert cls.methods == methods_before
+    assert len(gt.structures) == 3
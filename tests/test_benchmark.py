@@ -0,0 +1,62 @@
+from tests.benchmark import (
+    BASELINE_PATH,
+    BenchmarkReport,
+    BenchmarkRun,
+    StepMeasurement,
+    compare_to_baseline,
+    fit_curves,
+    fit_power_law,
+    run_benchmarks,
+)
+
+
+def test_fit_power_law():
+    sizes = [100, 200, 400, 800]
+
+    exponent, coefficient = fit_power_law(sizes, [3.0 * s**2 for s in sizes])
+
+    assert abs(exponent - 2.0) < 1e-6
+    assert abs(coefficient - 3.0) < 1e-6
+
+
+def scaled_report(exponent: float) -> BenchmarkReport:
+    runs = [
+        BenchmarkRun(
+            name="synthetic",
+            size=size,
+            steps={
+                "swim_methods_in_multiple_classes": StepMeasurement(
+                    seconds=1e-6 * size**exponent, peak_bytes=1024
+                )
+            },
+        )
+        for size in [500, 1000, 2000, 4000]
+    ]
+    return BenchmarkReport(synthetic=runs, curves=fit_curves(runs))
+
+
+def test_compare_to_baseline_detects_quadratic_step():
+    baseline = scaled_report(1.0)
+
+    assert compare_to_baseline(scaled_report(1.0), baseline) == []
+    regressions = compare_to_baseline(scaled_report(2.0), baseline)
+    assert len(regressions) == 1
+    assert "swim_methods_in_multiple_classes" in regressions[0]
+
+
+def test_run_benchmarks():
+    report = run_benchmarks([50, 100])
+
+    assert [run.size for run in report.synthetic] == [50, 100]
+    assert len(report.checked_in) == 3
+    for run in report.synthetic:
+        assert "construct_trie" in run.steps
+        assert "run_evaluation" in run.steps
+    assert "swim_methods_in_multiple_classes" in report.curves
+
+
+def test_baseline_covers_all_steps():
+    baseline = BenchmarkReport.model_validate_json(BASELINE_PATH.read_text())
+    report = run_benchmarks([50, 100], checked_in=False)
+
+    assert set(report.curves) <= set(baseline.curves)
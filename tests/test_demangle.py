@@ -0,0 +1,86 @@
+from pathlib import Path
+
+import pytest
+
+from postgame import demangle
+from postgame.demangle import DemangleError, Demangler
+
+# Public symbols of examples/Project3.pdb as undecorated by undname.
+UNDNAME_PAIRS = [
+    ("??0foo@@QAE@XZ", "public: __thiscall foo::foo(void)"),
+    ("??1bar@@QAE@XZ", "public: __thiscall bar::~bar(void)"),
+    ("?three@foo@@QAEXXZ", "public: void __thiscall foo::three(void)"),
+    (
+        "?set_commode@__scrt_file_policy@@SAXXZ",
+        "public: static void __cdecl __scrt_file_policy::set_commode(void)",
+    ),
+    (
+        "??1sentry@?$basic_ostream@DU?$char_traits@D@std@@@std@@QAE@XZ",
+        "public: __thiscall std::basic_ostream<char,struct std::char_traits<char> >"
+        "::sentry::~sentry(void)",
+    ),
+    (
+        "??0sentry@?$basic_ostream@DU?$char_traits@D@std@@@std@@QAE@AAV12@@Z",
+        "public: __thiscall std::basic_ostream<char,struct std::char_traits<char> >"
+        "::sentry::sentry(class std::basic_ostream<char,struct std::char_traits<char> >"
+        " &)",
+    ),
+    (
+        "??$?6U?$char_traits@D@std@@@std@@YAAAV?$basic_ostream@DU?$char_traits@D@std"
+        "@@@0@AAV10@PBD@Z",
+        "class std::basic_ostream<char,struct std::char_traits<char> > & __cdecl "
+        "std::operator<<<struct std::char_traits<char> >(class std::basic_ostream<char"
+        ",struct std::char_traits<char> > &,char const *)",
+    ),
+    (
+        "??Bsentry@?$basic_ostream@DU?$char_traits@D@std@@@std@@QBE_NXZ",
+        "public: __thiscall std::basic_ostream<char,struct std::char_traits<char> >"
+        "::sentry::operator bool(void)const ",
+    ),
+    ("@_RTC_CheckStackVars@8", "@_RTC_CheckStackVars@8"),
+    ("___security_init_cookie", "___security_init_cookie"),
+]
+
+
+@pytest.mark.parametrize(("mangled", "demangled"), UNDNAME_PAIRS)
+def test_demangle(mangled: str, demangled: str):
+    assert demangle.demangle(mangled) == demangled
+
+
+def test_demangle_constructor_template():
+    assert demangle.demangle(
+        "??$?0D@?$allocator@U_Container_proxy@std@@@std@@QAE@ABV?$allocator@D@1@@Z"
+    ) == (
+        "public: __thiscall std::allocator<struct std::_Container_proxy>"
+        "::allocator<struct std::_Container_proxy><char>"
+        "(class std::allocator<char> const &)"
+    )
+
+
+def test_demangle_unsupported():
+    with pytest.raises(DemangleError):
+        demangle.demangle("??_R0?AVfoo@@@8")
+    with pytest.raises(DemangleError):
+        demangle.demangle("?three@foo@@QAEXXZtrailing")
+
+
+def test_demangler_cache(tmp_path: Path, monkeypatch):
+    cache_path = tmp_path / "demangle.tsv"
+    names = [x for x, _ in UNDNAME_PAIRS]
+
+    demangler = Demangler(cache_path)
+    assert demangler.demangle_all(names) == dict(UNDNAME_PAIRS)
+    demangler.save()
+
+    # Names are read back from the cache rather than demangled again.
+    monkeypatch.setattr(demangle, "demangle", lambda _: pytest.fail("demangled"))
+    assert Demangler(cache_path).demangle_all(names) == dict(UNDNAME_PAIRS)
+
+
+def test_demangler_unsupported(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(demangle, "undname", lambda names: {})
+
+    demangler = Demangler(tmp_path / "demangle.tsv")
+
+    # Names neither demangle() nor undname can demangle are left unchanged.
+    assert demangler.demangle("??_R0?AVfoo@@@8") == "??_R0?AVfoo@@@8"
@@ -0,0 +1,273 @@
+import random
+from collections import defaultdict
+
+import pytest
+
+import evaluation.evaluation as ev
+import postgame.analysis_results as ar
+from tests.synthetic_project import SyntheticProjectSpec, build_model, shuffled_results
+
+
+def reference_match_gen_to_gt_classes(
+    gt_analysis_results: ar.AnalysisResults,
+    gen_analysis_results: ar.AnalysisResults,
+) -> list[tuple[ar.Structure, ar.Structure]]:
+    """Brute force matching that compares every gen class to every gt class."""
+    gt_nonempty_classes = sorted(
+        ev.nonempty_classes(gt_analysis_results),
+        key=lambda x: x.demangled_name,
+        reverse=True,
+    )
+    gen_nonempty_classes = sorted(
+        ev.nonempty_classes(gen_analysis_results),
+        key=lambda x: x.demangled_name,
+        reverse=True,
+    )
+
+    matched_classes: list[tuple[ar.Structure, ar.Structure]] = []
+    gt_classes_referenced: set[int] = set()
+
+    for gen_cls in gen_nonempty_classes:
+        sizes: dict[int, list[ar.Structure]] = defaultdict(list)
+        gen_eas = set(x.ea for x in gen_cls.methods.values())
+
+        for gt_cls in gt_nonempty_classes:
+            if id(gt_cls) in gt_classes_referenced:
+                continue
+            gt_eas = set(x.ea for x in gt_cls.methods.values())
+            size = len(gen_eas & gt_eas)
+            if size != 0:
+                sizes[size].append(gt_cls)
+
+        if sizes:
+            gt_cls = sizes[max(sizes)][0]
+            gt_classes_referenced.add(id(gt_cls))
+            matched_classes.append((gen_cls, gt_cls))
+
+    return matched_classes
+
+
+def test_match_gen_to_gt_classes_matches_reference():
+    rng = random.Random(0)
+    for seed in range(5):
+        gt = build_model(SyntheticProjectSpec(seed=seed)).analysis_results()
+        gen = shuffled_results(gt, rng)
+
+        expected = reference_match_gen_to_gt_classes(gt, gen)
+        actual = ev.match_gen_to_gt_classes(gt, gen)
+
+        assert [(x.name, y.name) for x, y in actual] == [
+            (x.name, y.name) for x, y in expected
+        ]
+
+
+def test_match_gen_to_gt_classes_tie_break():
+    method = ar.Method(demangled_name="", ea="0x1", name="", type=ar.MethodType.meth)
+    gt = ar.AnalysisResults(
+        structures={
+            "a": ar.Structure(name="a", demangled_name="a", methods={"0x1": method}),
+            "b": ar.Structure(name="b", demangled_name="b", methods={"0x1": method}),
+        }
+    )
+    gen = ar.AnalysisResults(
+        structures={
+            "x": ar.Structure(name="x", demangled_name="x", methods={"0x1": method}),
+            "y": ar.Structure(name="y", demangled_name="y", methods={"0x1": method}),
+        }
+    )
+
+    matched = ev.match_gen_to_gt_classes(gt, gen)
+
+    # Classes are visited in reverse order of demangled name.
+    assert [(x.name, y.name) for x, y in matched] == [("y", "b"), ("x", "a")]
+
+
+METRICS = [
+    ev.evaluate_methods_assigned_correct_class,
+    ev.evaluate_classes,
+    ev.evaluate_constructors,
+    ev.evaluate_destructors,
+    ev.evaluate_methods,
+    ev.evaluate_class_graph_edges,
+    ev.evaluate_class_graph_ancestors,
+]
+
+
+def test_evaluation_context_shared_across_metrics(monkeypatch):
+    gt = build_model(SyntheticProjectSpec()).analysis_results()
+    gen = shuffled_results(gt, random.Random(1))
+
+    expected = [metric(gt, gen) for metric in METRICS]
+
+    calls = 0
+    match = ev.match_gen_to_gt_classes
+
+    def counting_match(*args):
+        nonlocal calls
+        calls += 1
+        return match(*args)
+
+    monkeypatch.setattr(ev, "match_gen_to_gt_classes", counting_match)
+
+    ctx = ev.EvaluationContext(gt, gen)
+    assert [metric(gt, gen, ctx) for metric in METRICS] == expected
+    assert calls == 1
+
+
+def test_class_graph_duplicate_gen_names():
+    def method(ea: str) -> ar.Method:
+        return ar.Method(demangled_name="", ea=ea, name="", type=ar.MethodType.meth)
+
+    def structure(name: str, ea: str, parent: str | None = None) -> ar.Structure:
+        members = {"0x0": ar.Member(name="", struc=parent)} if parent else {}
+        return ar.Structure(name=name, methods={ea: method(ea)}, members=members)
+
+    gt = ar.AnalysisResults(
+        structures={
+            "a": structure("a", "0x1"),
+            "b": structure("b", "0x2"),
+            "c": structure("c", "0x3", "a"),
+            "d": structure("d", "0x4"),
+        }
+    )
+    # Two generated classes are named x.
+    gen = ar.AnalysisResults(
+        structures={
+            "w": structure("w", "0x1"),
+            "x1": structure("x", "0x2"),
+            "x2": structure("x", "0x4"),
+            "y": structure("y", "0x3", "w"),
+        }
+    )
+    metrics = [ev.evaluate_class_graph_edges, ev.evaluate_class_graph_ancestors]
+
+    # Only the parent of y is looked up, not x.
+    for metric in metrics:
+        assert metric(gt, gen).true_positives == 4
+
+    gen.structures["y"] = structure("y", "0x3", "x")
+    for metric in metrics:
+        with pytest.raises(RuntimeError):
+            metric(gt, gen)
+
+
+def reference_evaluate_class_graph_edges(
+    gt_analysis_results: ar.AnalysisResults,
+    gen_analysis_results: ar.AnalysisResults,
+) -> ev.EvaluationResult:
+    """Edge metric that searches the matched class list for every parent."""
+    matched_classes = reference_match_gen_to_gt_classes(
+        gt_analysis_results, gen_analysis_results
+    )
+
+    tp = 0
+    gt_size = 0
+    gen_size = 0
+
+    for gen_cls, gt_cls in matched_classes:
+        gen_cls_parents = [x.struc for x in gen_cls.members.values() if x.parent]
+        gt_cls_parents = [x.struc for x in gt_cls.members.values() if x.parent]
+
+        if gen_cls_parents == [] and gt_cls_parents == []:
+            tp += 1
+            gen_size += 1
+            gt_size += 1
+        else:
+            for gen_parent_name in gen_cls_parents:
+                pairs = [x for x in matched_classes if x[0].name == gen_parent_name]
+                if pairs != [] and pairs[0][1].name in gt_cls_parents:
+                    tp += 1
+
+            gen_size += len(gen_cls_parents)
+            gt_size += len(gt_cls_parents)
+
+    return ev.EvaluationResult(
+        true_positives=tp,
+        false_positives=gen_size - tp,
+        false_negatives=gt_size - tp,
+    )
+
+
+def test_evaluate_class_graph_edges_matches_reference():
+    rng = random.Random(2)
+    for seed in range(5):
+        gt = build_model(SyntheticProjectSpec(seed=seed)).analysis_results()
+        gen = shuffled_results(gt, rng)
+
+        assert ev.evaluate_class_graph_edges(
+            gt, gen
+        ) == reference_evaluate_class_graph_edges(gt, gen)
+
+
+def reference_evaluate_class_graph_ancestors(
+    gt_analysis_results: ar.AnalysisResults,
+    gen_analysis_results: ar.AnalysisResults,
+) -> ev.EvaluationResult:
+    """Ancestor metric that searches the structures for every ancestor."""
+
+    def get_gen_cls(name: str) -> ar.Structure | None:
+        for cls in gen_analysis_results.structures.values():
+            if cls.name == name:
+                return cls
+        return None
+
+    matched_classes = reference_match_gen_to_gt_classes(
+        gt_analysis_results, gen_analysis_results
+    )
+
+    tp = 0
+    gt_size = 0
+    gen_size = 0
+
+    for gen_cls, gt_cls in matched_classes:
+        gen_parents = [x.struc for x in gen_cls.members.values() if x.parent]
+        gt_parents = [x.struc for x in gt_cls.members.values() if x.parent]
+
+        if gen_parents == [] and gt_parents == []:
+            tp += 1
+            gen_size += 1
+            gt_size += 1
+        else:
+            gen_ancestors: set[str] = set()
+            worklist = list(gen_parents)
+            while worklist:
+                parent_cls = get_gen_cls(worklist.pop())
+                if parent_cls is not None and parent_cls.name not in gen_ancestors:
+                    gen_ancestors.add(parent_cls.name)
+                    worklist.extend(
+                        x.name for x in parent_cls.members.values() if x.parent
+                    )
+
+            for gen_ancestor in gen_ancestors:
+                if any(x[0].name == gen_ancestor for x in matched_classes):
+                    tp += 1
+
+            gen_size += len(gen_ancestors)
+            gt_size += len(gt_parents)
+
+    return ev.EvaluationResult(
+        true_positives=tp,
+        false_positives=gen_size - tp,
+        false_negatives=gt_size - tp,
+    )
+
+
+def test_evaluate_class_graph_ancestors_matches_reference():
+    rng = random.Random(3)
+    for seed in range(5):
+        gt = build_model(SyntheticProjectSpec(seed=seed)).analysis_results()
+        gen = shuffled_results(gt, rng)
+
+        assert ev.evaluate_class_graph_ancestors(
+            gt, gen
+        ) == reference_evaluate_class_graph_ancestors(gt, gen)
+
+
+def test_ancestors_follow_parent_member_names():
+    gt = build_model(SyntheticProjectSpec(roots=1, depth=3, fan_out=1))
+    index = ev.AnalysisResultsIndex(gt.analysis_results())
+
+    leaf = index.classes_by_name[gt.classes[2].unique_name]
+
+    # Parents of parents are looked up by member name, not by structure.
+    assert index.ancestors(leaf) == {gt.classes[1].unique_name}
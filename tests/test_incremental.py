@@ -0,0 +1,83 @@
+from pathlib import Path
+
+import pytest
+
+from parseconfig import AnalysisTool
+from postgame.incremental import PostgameState
+from postgame.postgame import Postgame
+from tests.synthetic_project import (
+    SyntheticProjectSpec,
+    class_traces,
+    generate_project,
+    split_runs,
+    synthetic_cfg,
+)
+
+
+def ingest(base_directory: Path, object_traces_path: Path) -> Postgame:
+    cfg = synthetic_cfg(base_directory)
+    cfg.object_traces_path = object_traces_path
+
+    dut = Postgame(cfg)
+    dut.ingest_traces()
+    return dut
+
+
+def statistics(dut: Postgame) -> dict[int, tuple[int, int, int]]:
+    return {
+        x.address: (x.seen_in_head, x.seen_in_tail, x.seen_count)
+        for x in dut.method_store.get_methods()
+    }
+
+
+def test_incremental_matches_full_run(tmp_path: Path):
+    spec = SyntheticProjectSpec(
+        roots=3,
+        depth=5,
+        traces=800,
+        address_reuse=0.3,
+        noise=0.3,
+        seed=2,
+    )
+    generate_project(spec, tmp_path)
+
+    cfg = synthetic_cfg(tmp_path)
+    cfg.results_json = tmp_path / "full.json"
+    Postgame(cfg).main()
+
+    for path in split_runs(tmp_path, 3):
+        cfg = synthetic_cfg(tmp_path)
+        cfg.object_traces_path = path
+        cfg.results_json = tmp_path / "incremental.json"
+        Postgame(cfg).main(incremental=True)
+
+    assert cfg.postgame_state_path.exists()
+    assert cfg.results_json.read_text() == (tmp_path / "full.json").read_text()
+
+
+def test_ingest_seen_traces(tmp_path: Path):
+    generate_project(SyntheticProjectSpec(roots=2, traces=200, seed=3), tmp_path)
+    (path,) = split_runs(tmp_path, 1)
+
+    first = ingest(tmp_path, path)
+    state_path = synthetic_cfg(tmp_path).postgame_state_path
+    state = PostgameState.load(state_path)
+    assert state is not None
+    assert len(state.traces) > 0
+
+    # Traces of earlier runs are skipped.
+    second = ingest(tmp_path, path)
+    assert len(second.traces) == 0
+    assert class_traces(second) == class_traces(first)
+    assert statistics(second) == statistics(first)
+
+
+def test_state_of_other_analysis_tool(tmp_path: Path):
+    generate_project(SyntheticProjectSpec(roots=2, traces=50, seed=5), tmp_path)
+
+    cfg = synthetic_cfg(tmp_path)
+    assert PostgameState.load(cfg.postgame_state_path) is None
+    PostgameState(AnalysisTool.LEGO).save(cfg.postgame_state_path)
+
+    with pytest.raises(ValueError):
+        Postgame(cfg).ingest_traces()
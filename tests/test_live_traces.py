@@ -0,0 +1,123 @@
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+from parseconfig import Config
+from postgame import live_traces
+from postgame.postgame import Postgame
+from tests.synthetic_project import (
+    SyntheticProjectSpec,
+    generate_project,
+    synthetic_cfg,
+)
+
+
+def start_thread(target: Callable[..., object], *args: object) -> threading.Thread:
+    thread = threading.Thread(target=target, args=args)
+    thread.start()
+    return thread
+
+
+def start_replay(cfg: Config, traces_path: Path, target: Path) -> threading.Thread:
+    return start_thread(
+        live_traces.replay,
+        traces_path,
+        target,
+        cfg.blacklisted_methods_path,
+        0.0,
+        # Several batches, so a FIFO is opened and closed several times.
+        16,
+    )
+
+
+def parse_live_input(cfg: Config, target: Path) -> Postgame:
+    dut = Postgame(cfg)
+    dut.live_traces_path = target
+    dut.parse_input()
+    return dut
+
+
+@pytest.mark.parametrize("fifo", [True, False])
+def test_parse_live_input(tmp_path: Path, fifo: bool):
+    generate_project(SyntheticProjectSpec(roots=2, traces=200, seed=7), tmp_path)
+    cfg = synthetic_cfg(tmp_path)
+
+    expected = Postgame(cfg)
+    expected.parse_input()
+
+    target = tmp_path / "live"
+    if fifo:
+        os.mkfifo(target)
+
+    thread = start_replay(cfg, cfg.object_traces_path, target)
+    dut = parse_live_input(cfg, target)
+    thread.join()
+
+    assert {str(x) for x in dut.traces} == {str(x) for x in expected.traces}
+    assert dut.base_offset == expected.base_offset
+    # The reader removes its socket once the producer is done.
+    assert target.exists() == fifo
+
+
+def write_like_pintool(
+    traces: list[str], fifo: Path, blacklisted_methods_path: Path, blacklist: str
+) -> None:
+    """Write traces to fifo in batches of 10, then write the blacklist."""
+    fifo.open("w").close()
+    for i in range(0, len(traces), 10):
+        with fifo.open("a") as f:
+            f.write("".join(x + "\n\n" for x in traces[i : i + 10]))
+        time.sleep(0.01)
+
+    blacklisted_methods_path.write_text(blacklist)
+
+
+def test_live_blacklist_written_on_exit(tmp_path: Path):
+    spec = SyntheticProjectSpec(roots=2, traces=200, noise=0.5, seed=9)
+    generate_project(spec, tmp_path)
+    cfg = synthetic_cfg(tmp_path)
+
+    expected = Postgame(cfg)
+    expected.parse_input()
+
+    # The blacklist of the run is only written after its traces.
+    blacklist = cfg.blacklisted_methods_path.read_text()
+    assert blacklist != ""
+    cfg.blacklisted_methods_path.write_text("")
+
+    fifo = tmp_path / "live"
+    os.mkfifo(fifo)
+    traces = cfg.object_traces_path.read_text().strip().split("\n\n")
+    thread = start_thread(
+        write_like_pintool, traces, fifo, cfg.blacklisted_methods_path, blacklist
+    )
+    dut = parse_live_input(cfg, fifo)
+    thread.join()
+
+    assert {str(x) for x in dut.traces} == {str(x) for x in expected.traces}
+
+
+def test_live_main(tmp_path: Path):
+    generate_project(SyntheticProjectSpec(roots=2, traces=200, seed=8), tmp_path)
+    cfg = synthetic_cfg(tmp_path)
+    recorded = tmp_path / "recorded-traces"
+    cfg.object_traces_path.rename(recorded)
+
+    thread = start_replay(cfg, recorded, tmp_path / "live")
+    Postgame(cfg).main(live=tmp_path / "live")
+    thread.join()
+
+    assert cfg.results_json.exists()
+
+
+def test_open_live_regular_file(tmp_path: Path):
+    path = tmp_path / "object-traces"
+    path.write_text("")
+
+    with pytest.raises(ValueError):
+        with live_traces.open_live(path, tmp_path / "blacklisted-methods"):
+            pass
@@ -0,0 +1,84 @@
+from pathlib import Path
+
+from postgame.merge_traces import merge_traces, name_map_path, runs_path
+from postgame.method_store import MethodStore
+from postgame.object_trace import trace_digest
+from postgame.parse_object_trace import parse_traces
+from postgame.postgame import Postgame
+from tests.synthetic_project import (
+    SyntheticProjectSpec,
+    generate_project,
+    split_runs,
+    synthetic_cfg,
+)
+
+A = "10 1\n20 1\n20\n10\n"
+B = "30 1\n30\n"
+C = "10 1\n40 1\n40\n10\n"
+
+
+def write_run(path: Path, traces: list[str], names: str) -> Path:
+    path.write_text("\n".join(traces))
+    name_map_path(path).write_text(names)
+    return path
+
+
+def test_parse_traces():
+    traces = list(
+        parse_traces(
+            [*A.splitlines(keepends=True), "\n", "30 1\n"], MethodStore(), {0x20}
+        )
+    )
+
+    # Blacklisted methods are skipped, and the second trace's calls and
+    # returns don't match.
+    assert [str(x) for x in traces] == ["10 1\n10"]
+
+
+def test_merge_traces(tmp_path: Path):
+    runs = [
+        write_run(tmp_path / "a", [A, B, A], "10 A::A\n20 A::f\n"),
+        write_run(tmp_path / "b", [C, A, A, A], "40 A::g\n10 A::A\n20 A::other\n"),
+    ]
+    output = tmp_path / "object-traces"
+
+    # Spill a chunk per distinct trace.
+    merge_traces(runs, output, chunk_traces=1)
+
+    traces = output.read_text().split("\n\n")
+    assert traces[-1] == ""
+    assert sorted(x + "\n" for x in traces[:-1]) == sorted([A, B, C])
+
+    def digest(trace: str) -> str:
+        return trace_digest(
+            (int(x.split()[0], 16), x.endswith(" 1")) for x in trace.splitlines()
+        ).hex()
+
+    counts = {
+        x.split()[0]: x.split()[1:] for x in runs_path(output).read_text().splitlines()
+    }
+    assert counts == {
+        digest(A): ["2", "3"],
+        digest(B): ["1", "0"],
+        digest(C): ["0", "1"],
+    }
+
+    # The first run's names win.
+    assert name_map_path(output).read_text() == "10 A::A\n20 A::f\n40 A::g\n"
+
+
+def test_postgame_merges_runs(tmp_path: Path):
+    generate_project(SyntheticProjectSpec(roots=2, traces=200, seed=6), tmp_path)
+
+    expected = Postgame(synthetic_cfg(tmp_path))
+    expected.parse_input()
+
+    cfg = synthetic_cfg(tmp_path)
+    cfg.object_trace_runs = split_runs(tmp_path, 3)
+    cfg.object_traces_path = tmp_path / "merged-traces"
+    dut = Postgame(cfg)
+    dut.merge_runs()
+    dut.parse_input()
+
+    assert {str(x) for x in dut.traces} == {str(x) for x in expected.traces}
+    assert len(dut.name_map) == len(expected.name_map)
@@ -0,0 +1,55 @@
+from pathlib import Path
+
+import pytest
+
+from postgame.name_map import NameMap
+from postgame.postgame import Postgame
+from tests.synthetic_project import (
+    SyntheticProjectSpec,
+    generate_project,
+    synthetic_cfg,
+)
+
+
+def test_name_map(tmp_path: Path):
+    path = tmp_path / "object-traces-name-map"
+    path.write_text(
+        "129f0 public: void __thiscall foo::three(void)\n"
+        "12560 public: __thiscall foo::~foo(void)\r\n"
+        "14b60 @_guard_check_icall_nop@4\n"
+        "12560 ??1foo@@QAE@XZ"
+    )
+
+    with NameMap(path) as names:
+        assert len(names) == 4
+        assert names.get(0x129F0) == "public: void __thiscall foo::three(void)"
+        # The last name of an address listed more than once.
+        assert names.get(0x12560) == "??1foo@@QAE@XZ"
+        assert names.get(0x14B60) == "@_guard_check_icall_nop@4"
+        assert names.get(0x1) is None
+        assert 0x14B60 in names
+        assert 0x14B61 not in names
+
+        assert names.lines([0x12560, 0x129F0, 0x1]) == [
+            "129f0 public: void __thiscall foo::three(void)",
+            "12560 ??1foo@@QAE@XZ",
+        ]
+
+
+def test_name_map_empty(tmp_path: Path):
+    path = tmp_path / "object-traces-name-map"
+    path.write_text("")
+
+    with NameMap(path) as names:
+        assert len(names) == 0
+        assert names.get(0x12560) is None
+        assert names.lines([0x12560]) == []
+
+
+def test_postgame_closes_name_map(tmp_path: Path):
+    project = generate_project(SyntheticProjectSpec(traces=50, seed=3), tmp_path)
+    dut = Postgame(synthetic_cfg(tmp_path))
+    dut.main()
+
+    with pytest.raises(ValueError):
+        dut.name_map.get(next(iter(project.names)))
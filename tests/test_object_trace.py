@@ -3,6 +3,7 @@
 from postgame.method import Method
 from postgame.object_trace import ObjectTrace as OT
 from postgame.object_trace import TraceEntry as TE
+from postgame.object_trace import group_traces
 
 
 def test_trace_entry_construct():
@@ -394,3 +395,42 @@ def test_update_method_statistics_2():
     assert 0 == methods[0].seen_in_tail
     assert 0 == methods[1].seen_in_tail
     assert 1 == methods[2].seen_in_tail
+
+
+def test_group_traces():
+    ctor, dtor, meth, other_dtor = Method(0), Method(1), Method(2), Method(3)
+
+    def ot(*head_body: TE) -> OT:
+        return OT(
+            [
+                TE(ctor, True),
+                *head_body,
+                TE(ctor, False),
+                TE(dtor, True),
+                TE(dtor, False),
+            ]
+        )
+
+    traces = [
+        ot(),
+        # Calls meth in the constructor, so has a different head.
+        ot(TE(meth, True), TE(meth, False)),
+        ot(),
+        OT(
+            [
+                TE(ctor, True),
+                TE(ctor, False),
+                TE(other_dtor, True),
+                TE(other_dtor, False),
+            ]
+        ),
+    ]
+
+    groups = group_traces(traces)
+
+    assert [x.fingerprint for x in groups] == [(1,), (3,)]
+    assert groups[0].traces == traces[:3]
+    # The identical first and third traces share their patterns.
+    assert list(groups[0].head_call_patterns.values()) == traces[:2]
+    assert list(groups[0].head_tail_patterns.values()) == traces[:2]
+    assert groups[1].traces == traces[3:]
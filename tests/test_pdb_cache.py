@@ -0,0 +1,85 @@
+import gzip
+from pathlib import Path
+
+import pytest
+
+from evaluation import pdb_parser, pdb_reader
+from evaluation.pdb_cache import PdbCache
+from evaluation.pdb_parser import PdbParser
+
+REPO_PATH = Path(__file__).parent.parent
+EXAMPLE_DUMP = REPO_PATH / "examples" / "four" / "project.dump"
+EXAMPLE_PDB = REPO_PATH / "examples" / "Project3.pdb"
+
+
+def fail_parse():
+    pytest.fail("parsed despite a cache hit")
+
+
+def test_ground_truth_cached(tmp_path: Path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    expected = tmp_path / "expected.json"
+    pdb_parser.main(EXAMPLE_DUMP, expected)
+
+    first = tmp_path / "first.json"
+    pdb_parser.main(EXAMPLE_DUMP, first, cache_dir=cache_dir)
+    assert first.read_text() == expected.read_text()
+
+    # Repeat runs neither parse the dump nor generate the ground truth.
+    monkeypatch.setattr(
+        PdbParser, "model_validate_dumpfile", lambda *args, **kwargs: fail_parse()
+    )
+    monkeypatch.setattr(pdb_parser, "generate_ground_truth", lambda _: fail_parse())
+    second = tmp_path / "second.json"
+    pdb_parser.main(EXAMPLE_DUMP, second, cache_dir=cache_dir)
+    assert second.read_text() == expected.read_text()
+
+
+def test_parser_cached(tmp_path: Path):
+    expected = pdb_reader.read_pdb(EXAMPLE_PDB)
+
+    parser = pdb_parser.load_pdb_parser(
+        EXAMPLE_PDB, lambda: pdb_reader.read_pdb(EXAMPLE_PDB), tmp_path
+    )
+    cached = pdb_parser.load_pdb_parser(EXAMPLE_PDB, fail_parse, tmp_path)
+
+    assert parser == expected
+    # TypeData subclasses survive the round trip.
+    assert [repr(x) for x in cached.type_to_typedata_map.values()] == [
+        repr(x) for x in expected.type_to_typedata_map.values()
+    ]
+    assert cached == expected
+
+
+def test_cache_keyed_by_digest(tmp_path: Path):
+    a = tmp_path / "a.dump"
+    b = tmp_path / "b.dump"
+    a.write_text("a")
+    b.write_text("b")
+
+    assert PdbCache(tmp_path, a).key != PdbCache(tmp_path, b).key
+
+    PdbCache(tmp_path, a).store_ground_truth("{}")
+    assert PdbCache(tmp_path, a).load_ground_truth() == "{}"
+    assert PdbCache(tmp_path, b).load_ground_truth() is None
+
+    # Renaming or copying the file keeps the entry.
+    c = tmp_path / "c.dump"
+    c.write_text("a")
+    assert PdbCache(tmp_path, c).load_ground_truth() == "{}"
+
+
+def test_corrupt_cache_entry_ignored(tmp_path: Path):
+    cache = PdbCache(tmp_path, EXAMPLE_PDB)
+
+    cache.parser_path.write_bytes(b"not gzip")
+    assert cache.load_parser() is None
+
+    cache.parser_path.write_bytes(gzip.compress(b"\x80not a pickle"))
+    assert cache.load_parser() is None
+
+    # The corrupt entry is replaced.
+    parser = pdb_parser.load_pdb_parser(
+        EXAMPLE_PDB, lambda: pdb_reader.read_pdb(EXAMPLE_PDB), tmp_path
+    )
+    assert cache.load_parser() == parser
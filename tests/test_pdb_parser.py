@@ -0,0 +1,253 @@
+from pathlib import Path
+
+import pytest
+
+import postgame.analysis_results as ar
+from evaluation import pdb_parser
+from evaluation.pdb_parser import (
+    ClassTypeData,
+    FieldListTypeData,
+    FuncAttr,
+    MethodTypeData,
+    PdbParser,
+    TypeId,
+    UnionTypeData,
+    iter_dump_records,
+)
+
+REPO_PATH = Path(__file__).parent.parent
+EXAMPLE_DUMP = REPO_PATH / "examples" / "four" / "project.dump"
+
+SMALL_DUMP = """\
+Microsoft (R) Debugging Information Dumper
+
+*** TYPES
+
+0x1000 : Length = 42, Leaf = 0x1504 LF_CLASS
+\t# members = 0,  field list type 0x0000, FORWARD REF,
+\tDerivation list type 0x0000, VT shape type 0x0000
+\tSize = 0, class name = MyClass, unique name = .?AVMyClass@@, UDT(0x00001005)
+
+0x1002 : Length = 6, Leaf = 0x1201 LF_ARGLIST argument count = 0
+
+*** TYPES Mismatch Warnings
+
+*** SYMBOLS
+
+** Module: "main.obj"
+
+(000098) S_GPROC32: [0002:00000890], Cb: 00000095, Type:             0x1003, MyClass::CallMe
+(0000FC)  S_FRAMEPROC:
+(000120) S_GPROC32: [0002:00000900], Cb: 00000010, Type:     T_NOTYPE(0000), helper
+
+*** GLOBALS
+(000098) S_GPROC32: [0002:00000990], Cb: 00000095, Type:             0x1004, Global
+"""
+
+
+def test_iter_dump_records():
+    records = list(iter_dump_records(SMALL_DUMP.splitlines(keepends=True)))
+
+    assert [section for section, _ in records] == ["TYPES"] * 2 + ["SYMBOLS"] * 3
+    assert len(records[0][1]) == 4
+    assert records[1][1] == [
+        "0x1002 : Length = 6, Leaf = 0x1201 LF_ARGLIST argument count = 0"
+    ]
+    assert records[2][1][0].startswith("(000098) S_GPROC32")
+
+
+def test_parse_small_dump():
+    types = PdbParser.parse_types(SMALL_DUMP)
+    symbols = PdbParser.parse_symbols(SMALL_DUMP)
+
+    # LF_ARGLIST records are not parsed.
+    assert list(types) == [0x1000]
+    assert types[0x1000].forward_ref
+
+    assert symbols == [
+        pdb_parser.ProcedureSymbolData(
+            type_id=0x1003,
+            section_header=2,
+            relative_addr=0x890,
+            name="MyClass::CallMe",
+            length=0x95,
+        )
+    ]
+
+
+def test_parse_dumpfile():
+    parser = PdbParser.model_validate_dumpfile(EXAMPLE_DUMP)
+
+    assert len(parser.section_header_map) == 8
+    assert len(parser.procedure_list) == 153
+    assert len(parser.type_to_typedata_map) == 980
+    assert parser.section_header_map[2].virtual_addr == 0x11000
+    assert any(
+        isinstance(x, MethodTypeData) for x in parser.type_to_typedata_map.values()
+    )
+
+    # The streaming parser produces the same results as the per-section
+    # parsers of the whole file's contents.
+    contents = EXAMPLE_DUMP.read_text()
+    assert parser.type_to_typedata_map == PdbParser.parse_types(contents)
+    assert parser.procedure_list == PdbParser.parse_symbols(contents)
+    assert parser.section_header_map == PdbParser.parse_section_headers(contents)
+
+
+def test_main(tmp_path: Path):
+    results_file = tmp_path / "gt-results.json"
+    pdb_parser.main(EXAMPLE_DUMP, results_file)
+
+    results = ar.load_analysis_results(results_file)
+
+    assert {x: len(y.methods) for x, y in results.structures.items()} == {
+        ".?AVMyClass@@": 1,
+        ".?AVtype_info@@": 2,
+        ".?AVbad_alloc@std@@": 5,
+        ".?AVbad_array_new_length@std@@": 4,
+        ".?AVexception@std@@": 5,
+    }
+
+
+def test_parse_class_record():
+    class_data = PdbParser.parse_type_record(
+        [
+            "0x1013 : Length = 62, Leaf = 0x1505 LF_STRUCTURE",
+            "\t# members = 0,  field list type 0x0000, FORWARD REF, ",
+            "\tDerivation list type 0x0000, VT shape type 0x0000",
+            "\tSize = 0, class name = _TP_POOL, unique name = .?AU_TP_POOL@@",
+        ]
+    )
+
+    assert isinstance(class_data, ClassTypeData)
+    assert class_data.type == 0x1013
+    assert class_data.forward_ref
+    assert class_data.class_name == "_TP_POOL"
+    assert class_data.unique_name == ".?AU_TP_POOL@@"
+
+
+def test_parse_class_record_large_type_indices():
+    class_data = PdbParser.parse_type_record(
+        [
+            "0x12345 : Length = 42, Leaf = 0x1504 LF_CLASS",
+            "\t# members = 3,  field list type 0x12344, ",
+            "\tDerivation list type 0x0000, VT shape type 0x10001",
+            "\tSize = 8, class name = A, unique name = .?AVA@@, UDT(0x00012345)",
+        ]
+    )
+
+    assert isinstance(class_data, ClassTypeData)
+    assert class_data.type == 0x12345
+    assert class_data.field_list_type == 0x12344
+    assert class_data.vt_shape_type == 0x10001
+    assert not class_data.forward_ref
+    assert class_data.unique_name == ".?AVA@@"
+
+
+def test_parse_union_record():
+    union_data = PdbParser.parse_type_record(
+        [
+            "0x1029 : Length = 46, Leaf = 0x1506 LF_UNION",
+            "\t# members = 2,  field list type 0x1028, SEALED, Size = 4\t,"
+            "class name = <unnamed-tag>, unique name = .?AT<unnamed-tag>@@",
+        ]
+    )
+
+    assert isinstance(union_data, UnionTypeData)
+    assert union_data.field_list_type == 0x1028
+    assert union_data.size == 4
+    assert union_data.class_name == "<unnamed-tag>"
+    assert union_data.unique_name == ".?AT<unnamed-tag>@@"
+
+
+def test_parse_member_function_record():
+    method_data = PdbParser.parse_type_record(
+        [
+            "0x10cb : Length = 26, Leaf = 0x1009 LF_MFUNCTION",
+            "\tReturn type = T_INT4(0074), Class type = 0x10CA, "
+            "This type = T_NOTYPE(0000), ",
+            "\tCall type = C Near, Func attr = ****Warning**** unused field non-zero!",
+            "\tParms = 0, Arg list type = 0x1002, This adjust = 12",
+        ]
+    )
+
+    assert isinstance(method_data, MethodTypeData)
+    assert method_data.return_type == "T_INT4(0074)"
+    assert method_data.class_type_ref == 0x10CA
+    assert method_data.this_type is None
+    assert method_data.call_type == "C Near"
+    assert method_data.func_attr == FuncAttr.UNUSED_NONZERO
+    assert method_data.arg_list_type == 0x1002
+    assert method_data.this_adjust == 12
+
+
+def test_parse_field_list_record():
+    field_list = PdbParser.parse_type_record(
+        [
+            "0x1152 : Length = 182, Leaf = 0x1203 LF_FIELDLIST",
+            "\tlist[0] = LF_BCLASS, public, type = 0x113A, offset = 0",
+            "\tlist[1] = LF_METHOD, count = 4, list = 0x1149, name = 'bad_cast'",
+            "\tlist[2] = LF_BCLASS, public, type = 0x10113A,",
+            "\t\t offset = 4",
+        ]
+    )
+
+    assert isinstance(field_list, FieldListTypeData)
+    assert field_list.base_classes == {0x113A, 0x10113A}
+
+
+def test_parse_type_record_dispatch():
+    assert (
+        PdbParser.parse_type_record(
+            ["0x1002 : Length = 6, Leaf = 0x1201 LF_ARGLIST argument count = 0"]
+        )
+        is None
+    )
+    assert TypeId.from_str("LF_MFUNCTION") == TypeId.MEMBER_FUNCTION
+
+    with pytest.raises(ValueError):
+        PdbParser.parse_type_record(["0x1002 : Length = 6, Leaf = 0x1 LF_UNKNOWN x"])
+
+
+def test_parse_dumpfile_parallel(monkeypatch):
+    expected = PdbParser.model_validate_dumpfile(EXAMPLE_DUMP)
+
+    # Many small ranges, so that more are submitted than can be pending.
+    monkeypatch.setattr(pdb_parser, "TYPE_BYTES_PER_CHUNK", 20000)
+    actual = PdbParser.model_validate_dumpfile(EXAMPLE_DUMP, workers=2)
+
+    assert actual == expected
+    assert list(actual.type_to_typedata_map) == list(expected.type_to_typedata_map)
+    assert [repr(x) for x in actual.type_to_typedata_map.values()] == [
+        repr(x) for x in expected.type_to_typedata_map.values()
+    ]
+
+
+def test_parse_dumpfile_parallel_crlf(tmp_path: Path, monkeypatch):
+    dumpfile = tmp_path / "project.dump"
+    dumpfile.write_bytes(EXAMPLE_DUMP.read_bytes().replace(b"\n", b"\r\n"))
+    expected = PdbParser.model_validate_dumpfile(dumpfile)
+
+    monkeypatch.setattr(pdb_parser, "TYPE_BYTES_PER_CHUNK", 20000)
+    actual = PdbParser.model_validate_dumpfile(dumpfile, workers=2)
+
+    assert actual == expected
+    assert len(actual.type_to_typedata_map) > 0
+
+
+def test_parse_type_records_compact():
+    lines = [
+        "0x1005 : Length = 42, Leaf = 0x1504 LF_CLASS",
+        "\t# members = 1,  field list type 0x1004, ",
+        "\tDerivation list type 0x0000, VT shape type 0x0000",
+        "\tSize = 1, class name = MyClass, unique name = .?AVMyClass@@, UDT(0x00001005)",
+    ]
+    arglist = ["0x1002 : Length = 6, Leaf = 0x1201 LF_ARGLIST argument count = 0"]
+
+    compact = pdb_parser.parse_type_records_compact([lines, arglist])
+
+    assert len(compact) == 1
+    assert pdb_parser.TYPE_DATA_CLASSES[compact[0][0]] is ClassTypeData
+    assert ClassTypeData.model_validate(
+        dict(zip(ClassTypeData.model_fields, compact[0][1]))
+    ) == PdbParser.parse_type_record(lines)
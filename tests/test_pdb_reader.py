@@ -0,0 +1,167 @@
+import struct
+from pathlib import Path
+
+import pytest
+
+import postgame.analysis_results as ar
+from evaluation import pdb_parser, pdb_reader
+from evaluation.pdb_parser import ClassTypeData, FuncAttr, MethodTypeData, PdbParser
+
+REPO_PATH = Path(__file__).parent.parent
+EXAMPLE_PDB = REPO_PATH / "examples" / "Project3.pdb"
+LIBBMP_PDB = REPO_PATH / "data" / "libbmp" / "libbmp.pdb"
+TINYXML2_PDB = REPO_PATH / "data" / "tinyxml2" / "tinyxml2.pdb"
+
+
+def type_record(leaf: int, data: bytes) -> bytes:
+    return struct.pack("<HH", len(data) + 2, leaf) + data
+
+
+def tpi_stream(*records: bytes) -> bytes:
+    contents = b"".join(records)
+    header = struct.pack("<5I", 20040203, 56, 0x1000, 0x1000 + len(records), 0)
+    header = header[:16] + struct.pack("<I", len(contents)) + bytes(36)
+    return header + contents
+
+
+def test_read_types_matches_dump():
+    class_record = type_record(
+        pdb_reader.LF_CLASS,
+        struct.pack("<HHIII", 0, 0x280, 0, 0, 0)
+        + struct.pack("<H", 0)
+        + b"MyClass\0.?AVMyClass@@\0",
+    )
+    mfunction_record = type_record(
+        pdb_reader.LF_MFUNCTION,
+        struct.pack("<IIIBBHIi", 0x74, 0x10CA, 0, 0, 0x10, 0, 0x1002, 12),
+    )
+
+    types = pdb_reader.read_types(tpi_stream(class_record, mfunction_record))
+
+    # The same records as printed by cvdump.
+    assert types[0x1000] == PdbParser.parse_type_record(
+        [
+            "0x1000 : Length = 42, Leaf = 0x1504 LF_CLASS",
+            "\t# members = 0,  field list type 0x0000, FORWARD REF, ",
+            "\tDerivation list type 0x0000, VT shape type 0x0000",
+            "\tSize = 0, class name = MyClass, unique name = .?AVMyClass@@, UDT(0x00001005)",
+        ]
+    )
+    assert types[0x1001] == PdbParser.parse_type_record(
+        [
+            "0x1001 : Length = 26, Leaf = 0x1009 LF_MFUNCTION",
+            "\tReturn type = T_INT4(0074), Class type = 0x10CA, "
+            "This type = T_NOTYPE(0000), ",
+            "\tCall type = C Near, Func attr = ****Warning**** unused field non-zero!",
+            "\tParms = 0, Arg list type = 0x1002, This adjust = 12",
+        ]
+    )
+
+
+def test_read_field_list():
+    data = (
+        struct.pack("<HHI", pdb_reader.LF_BCLASS, 3, 0x1010)
+        + struct.pack("<HH", 0x8003, 0)
+        + b"\xf2\xf1"
+        + struct.pack("<HHIH", pdb_reader.LF_MEMBER, 3, 0x74, 4)
+        + b"x\0\xf1"
+        + struct.pack("<HHI", pdb_reader.LF_ONEMETHOD, 3 | (4 << 2), 0x1011)
+        + struct.pack("<I", 0)
+        + b"f\0\xf2\xf1"
+        + struct.pack("<HHI", pdb_reader.LF_BCLASS, 3, 0x1012)
+        + struct.pack("<H", 8)
+    )
+
+    assert pdb_reader.read_field_list(data) == {"base_classes": {0x1010, 0x1012}}
+
+    with pytest.raises(ValueError):
+        pdb_reader.read_field_list(struct.pack("<H", 0x1234))
+
+
+def test_read_numeric():
+    assert pdb_reader.read_numeric(struct.pack("<H", 0x10), 0) == (0x10, 2)
+    assert pdb_reader.read_numeric(struct.pack("<Hl", 0x8003, -2), 0) == (-2, 6)
+    assert pdb_reader.read_numeric(struct.pack("<HI", 0x8004, 1 << 31), 0) == (
+        1 << 31,
+        6,
+    )
+
+
+def test_primitive_type_name():
+    assert pdb_reader.primitive_type_name(0x0003) == "T_VOID(0003)"
+    assert pdb_reader.primitive_type_name(0x0403) == "T_32PVOID(0403)"
+    assert pdb_reader.primitive_type_name(0x0470) == "T_32PRCHAR(0470)"
+    assert pdb_reader.primitive_type_name(0x124E) == "0x124E"
+
+
+def test_msf_file():
+    with pdb_reader.MsfFile(EXAMPLE_PDB) as msf:
+        assert msf.num_streams > pdb_reader.DBI_STREAM
+        tpi = msf.stream(pdb_reader.TPI_STREAM)
+        _, header_size, begin, _, record_bytes = pdb_reader.TPI_HEADER.unpack_from(tpi)
+        assert begin == 0x1000
+        assert len(tpi) == header_size + record_bytes
+
+        with pytest.raises(ValueError):
+            msf.stream(msf.num_streams)
+
+
+def test_msf_file_not_a_pdb(tmp_path: Path):
+    path = tmp_path / "x.pdb"
+    path.write_bytes(bytes(64))
+
+    with pytest.raises(ValueError):
+        pdb_reader.MsfFile(path)
+
+
+def test_read_pdb():
+    parser = pdb_reader.read_pdb(EXAMPLE_PDB)
+
+    assert len(parser.section_header_map) == 8
+    assert parser.section_header_map[2].virtual_addr == 0x11000
+
+    foo = next(
+        x
+        for x in parser.type_to_typedata_map.values()
+        if isinstance(x, ClassTypeData) and x.class_name == "foo" and not x.forward_ref
+    )
+    assert foo.unique_name == ".?AVfoo@@"
+
+    procedure = next(x for x in parser.procedure_list if x.name == "foo::foo")
+    method = parser.type_to_typedata_map[procedure.type_id]
+    assert isinstance(method, MethodTypeData)
+    assert method.func_attr == FuncAttr.INSTANCE_CONSTRUCTOR
+    assert method.call_type == "ThisCall"
+
+
+def test_main(tmp_path: Path):
+    results_file = tmp_path / "gt-results.json"
+    pdb_reader.main(EXAMPLE_PDB, results_file)
+
+    results = ar.load_analysis_results(results_file)
+
+    assert {x: len(y.methods) for x, y in results.structures.items()} == {
+        ".?AV_Sentry_base@?$basic_ostream@DU?$char_traits@D@std@@@std@@": 2,
+        ".?AVbar@@": 4,
+        ".?AVbaz@@": 4,
+        ".?AVfoo@@": 4,
+        ".?AVsentry@?$basic_ostream@DU?$char_traits@D@std@@@std@@": 3,
+    }
+    bar = results.structures[".?AVbar@@"]
+    assert [x.struc for x in bar.members.values()] == [".?AVfoo@@"]
+    assert {x.type for x in bar.methods.values()} == {
+        ar.MethodType.ctor,
+        ar.MethodType.dtor,
+        ar.MethodType.meth,
+    }
+
+
+@pytest.mark.parametrize(
+    ("pdb_file", "structures", "methods"),
+    [(LIBBMP_PDB, 37, 172), (TINYXML2_PDB, 32, 438)],
+)
+def test_generate_ground_truth(pdb_file: Path, structures: int, methods: int):
+    results = pdb_parser.generate_ground_truth(pdb_reader.read_pdb(pdb_file))
+
+    assert len(results.structures) == structures
+    assert len(results.get_methods()) == methods
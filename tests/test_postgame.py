@@ -1,7 +1,16 @@
 from pathlib import Path
+from typing import Iterable
 
+import postgame.postgame
 from parseconfig import AnalysisTool, Config
+from postgame import swim
+from postgame.object_trace import ObjectTrace, TraceGroup
 from postgame.postgame import Postgame
+from tests.synthetic_project import (
+    SyntheticProjectSpec,
+    generate_project,
+    synthetic_cfg,
+)
 
 SCRIPT_PATH = Path(__file__)
 LEGO_CFG = Config(
@@ -75,3 +84,35 @@ def test_remove_ots_with_no_tail():
     dut.remove_ots_with_no_tail()
 
     assert 3 == len(dut.traces)
+
+
+def ungrouped_traces(traces: Iterable[ObjectTrace]) -> list[TraceGroup]:
+    """One group per trace, the order the trie and swims went before grouping."""
+    groups: list[TraceGroup] = []
+    for ot in traces:
+        group = TraceGroup(swim.addresses(ot.tail_returns()), ot.tail_returns())
+        group.add(ot)
+        groups.append(group)
+    return groups
+
+
+def test_grouped_results_match_ungrouped(tmp_path: Path, monkeypatch):
+    spec = SyntheticProjectSpec(
+        roots=3,
+        depth=5,
+        traces=800,
+        address_reuse=0.3,
+        noise=0.3,
+        seed=2,
+    )
+    generate_project(spec, tmp_path / "project")
+
+    def results(name: str) -> str:
+        cfg = synthetic_cfg(tmp_path / "project")
+        cfg.results_json = tmp_path / name
+        Postgame(cfg).main()
+        return cfg.results_json.read_text()
+
+    grouped = results("grouped.json")
+    monkeypatch.setattr(postgame.postgame, "group_traces", ungrouped_traces)
+    assert grouped == results("ungrouped.json")
@@ -0,0 +1,79 @@
+from pathlib import Path
+
+import pytest
+
+import postgame.analysis_results as ar
+from parseconfig import Config
+from postgame.parse_object_trace import iter_trace_blocks, parse_entry
+from postgame.postgame import Postgame, PostgameInputs
+from tests.synthetic_project import (
+    SyntheticProjectSpec,
+    generate_project,
+    synthetic_cfg,
+)
+
+
+def read_addresses(path: Path) -> set[int]:
+    return {int(line, 16) for line in path.open()}
+
+
+def read_inputs(cfg: Config) -> PostgameInputs:
+    with cfg.object_traces_path.open() as f:
+        object_traces = [list(map(parse_entry, x)) for x in iter_trace_blocks(f)]
+
+    static_traces: list[list[int]] = [[]]
+    for line in cfg.static_traces_path.open():
+        if line == "\n":
+            static_traces.append([])
+        elif line[0] != "#":
+            static_traces[-1].append(int(line.split()[0], 16))
+
+    names: dict[int, str] = {}
+    for line in Path(str(cfg.object_traces_path) + "-name-map").open():
+        addr, name = line.rstrip("\n").split(" ", 1)
+        names[int(addr, 16)] = name
+
+    return PostgameInputs(
+        object_traces=object_traces,
+        base_offset=int(cfg.base_offset_path.read_text(), 16),
+        blacklisted_methods=read_addresses(cfg.blacklisted_methods_path),
+        method_candidates=read_addresses(cfg.method_candidates_path),
+        static_traces=static_traces,
+        names=names,
+        filename=cfg.binary_path.name,
+        filemd5="na",
+    )
+
+
+def test_analyze_matches_main(tmp_path: Path):
+    generate_project(SyntheticProjectSpec(roots=2, traces=200, seed=9), tmp_path)
+    cfg = synthetic_cfg(tmp_path)
+    Postgame(cfg).main()
+    expected = ar.load_analysis_results(cfg.results_json)
+
+    results = Postgame(inputs=read_inputs(cfg)).analyze()
+
+    assert results.filename == expected.filename
+    assert results.structures == expected.structures
+
+
+def test_analyze_takes_iterators(tmp_path: Path):
+    generate_project(SyntheticProjectSpec(roots=2, traces=200, seed=10), tmp_path)
+    inputs = read_inputs(synthetic_cfg(tmp_path))
+    expected = Postgame(inputs=inputs).analyze()
+
+    # Traces may be generated as they are consumed, each only once.
+    inputs.object_traces = (iter(x) for x in inputs.object_traces)
+    inputs.static_traces = (iter(x) for x in inputs.static_traces)
+    assert Postgame(inputs=inputs).analyze() == expected
+
+
+def test_postgame_needs_config_or_inputs(tmp_path: Path):
+    with pytest.raises(ValueError):
+        Postgame()
+
+    with pytest.raises(ValueError):
+        Postgame(synthetic_cfg(tmp_path), PostgameInputs(object_traces=[]))
+
+    with pytest.raises(ValueError):
+        Postgame(synthetic_cfg(tmp_path)).analyze()
@@ -0,0 +1,92 @@
+from pathlib import Path
+
+from evaluation import pdb_reader
+from evaluation.pdb_parser import (
+    PdbParser,
+    ProcedureSymbolData,
+    SectionHeaderInfo,
+    generate_ground_truth,
+)
+from evaluation.procedure_index import (
+    ProcedureIndex,
+    annotate_object_traces,
+    describe_addr,
+)
+
+REPO_PATH = Path(__file__).parent.parent
+EXAMPLE_PDB = REPO_PATH / "examples" / "Project3.pdb"
+
+
+def procedure(name: str, relative_addr: int, length: int) -> ProcedureSymbolData:
+    return ProcedureSymbolData(
+        type_id=0x1000,
+        section_header=1,
+        relative_addr=relative_addr,
+        name=name,
+        length=length,
+    )
+
+
+def small_parser() -> PdbParser:
+    return PdbParser(
+        section_header_map={
+            1: SectionHeaderInfo(header_num=1, virtual_size=0x1000, virtual_addr=0x1000)
+        },
+        procedure_list=[
+            procedure("c", 0x200, 0x10),
+            procedure("a", 0x0, 0x10),
+            procedure("b", 0x100, 0x80),
+        ],
+    )
+
+
+def test_lookups():
+    index = ProcedureIndex.from_parser(small_parser(), base_addr=0x400000)
+
+    assert [x.name for x in index.procedures] == ["a", "b", "c"]
+    assert [x.addr for x in index.procedures] == [0x401000, 0x401100, 0x401200]
+
+    assert index.at(0x401100).name == "b"
+    assert index.at(0x401101) is None
+
+    assert index.containing(0x401000).name == "a"
+    assert index.containing(0x40117F).name == "b"
+    assert index.containing(0x401180) is None
+    assert index.containing(0x400FFF) is None
+    assert index.containing(0x401210) is None
+
+    assert [x.name for x in index.in_range(0x401001, 0x401200)] == ["b"]
+    assert [x.name for x in index.in_range(0x401000, 0x401201)] == ["a", "b", "c"]
+    assert index.in_range(0x402000, 0x403000) == []
+
+
+def test_describe_addr():
+    index = ProcedureIndex.from_parser(small_parser(), base_addr=0)
+
+    assert describe_addr(index, 0x1100) == "b"
+    assert describe_addr(index, 0x1104) == "b+0x4"
+    assert describe_addr(index, 0x1300) == "?"
+
+
+def test_annotate_object_traces():
+    index = ProcedureIndex.from_parser(small_parser(), base_addr=0x400000)
+    lines = ["1100 1\n", "1208\n", "\n", "5000 1\n"]
+
+    assert list(annotate_object_traces(lines, index, base_addr=0x400000)) == [
+        "1100 1\tb",
+        "1208\tc+0x8",
+        "",
+        "5000 1\t?",
+    ]
+
+
+def test_index_matches_ground_truth():
+    parser = pdb_reader.read_pdb(EXAMPLE_PDB)
+    index = ProcedureIndex.from_parser(parser)
+    gt = generate_ground_truth(parser)
+
+    assert len(index) == len(parser.procedure_list)
+    for method in gt.get_methods():
+        ea = int(method.ea, 16)
+        assert index.at(ea).name == method.name
+        assert describe_addr(index, ea + 1) == method.name + "+0x1"
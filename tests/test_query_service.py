@@ -0,0 +1,150 @@
+import json
+import os
+import socketserver
+import threading
+from pathlib import Path
+
+import pytest
+
+import postgame.analysis_results as ar
+from postgame.query_service import Analysis, Client, QueryService, serve
+
+
+def example_results() -> ar.AnalysisResults:
+    def method(ea: str, method_type: ar.MethodType) -> ar.Method:
+        return ar.Method(demangled_name="", ea=ea, name=ea, type=method_type)
+
+    def member(parent: str) -> dict[str, ar.Member]:
+        return {"0x0": ar.Member(name=f"{parent}_0x0", struc=parent)}
+
+    return ar.AnalysisResults(
+        structures={
+            "A": ar.Structure(
+                name="A",
+                methods={
+                    "0x10": method("0x10", ar.MethodType.ctor),
+                    "0x20": method("0x20", ar.MethodType.dtor),
+                },
+            ),
+            "B": ar.Structure(
+                name="B",
+                members=member("A"),
+                methods={"0x30": method("0x30", ar.MethodType.ctor)},
+            ),
+            "C": ar.Structure(
+                name="C",
+                members=member("B"),
+                methods={"0x40": method("0x40", ar.MethodType.meth)},
+            ),
+        }
+    )
+
+
+def write_results(path: Path, results: ar.AnalysisResults) -> None:
+    with path.open("w") as f:
+        ar.write_analysis_results(f, results)
+
+
+def test_analysis():
+    analysis = Analysis(example_results())
+
+    assert analysis.classes() == ["A", "B", "C"]
+    assert analysis.class_of("0x40") == "C"
+    assert analysis.class_of(0x10) == "A"
+    assert analysis.class_of("0x50") is None
+    assert analysis.ancestors("C") == ["B", "A"]
+    assert analysis.ancestors("A") == []
+    assert analysis.class_methods("A") == ["0x10", "0x20"]
+    assert analysis.class_methods("A", "ctor") == ["0x10"]
+
+    with pytest.raises(ValueError):
+        analysis.class_methods("D")
+
+
+def test_reload(tmp_path: Path):
+    path = tmp_path / "results.json"
+    results = example_results()
+    write_results(path, results)
+
+    service = QueryService({"x": path})
+    request = {"analysis": "x", "queries": [{"op": "class_of", "ea": "0x40"}]}
+    assert service.answer(request) == {"results": ["C"]}
+
+    del results.structures["C"]
+    write_results(path, results)
+    # Make sure the change is seen even on coarse timestamps.
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert service.answer(request) == {"results": [None]}
+
+
+def test_answer_errors(tmp_path: Path):
+    path = tmp_path / "results.json"
+    write_results(path, example_results())
+    service = QueryService({"x": path})
+
+    assert "error" in service.answer({"analysis": "y", "queries": []})
+    assert "error" in service.answer({"analysis": ["x"], "queries": []})
+    # Requests and queries that aren't json objects.
+    assert "error" in service.answer([{"analysis": "x"}])
+    assert "error" in service.answer("x")
+    assert "error" in service.answer({"analysis": "x", "queries": 1})
+
+    results = service.answer(
+        {
+            "analysis": "x",
+            "queries": [
+                {"op": "nope"},
+                {"op": "ancestors"},
+                ["classes"],
+                None,
+                {"op": "classes"},
+            ],
+        }
+    )["results"]
+    assert all("error" in x for x in results[:4])
+    assert results[4] == ["A", "B", "C"]
+
+
+def test_serve(tmp_path: Path):
+    path = tmp_path / "results.json"
+    write_results(path, example_results())
+    socket_path = tmp_path / "query.sock"
+
+    started = threading.Event()
+    servers: list[socketserver.BaseServer] = []
+
+    def ready(server: socketserver.BaseServer) -> None:
+        servers.append(server)
+        started.set()
+
+    thread = threading.Thread(
+        target=serve, args=(socket_path, QueryService({"x": path}), ready)
+    )
+    thread.start()
+    assert started.wait(10)
+
+    try:
+        with Client(socket_path) as client:
+            assert client.query(
+                "x",
+                [
+                    {"op": "class_of", "ea": "0x30"},
+                    {"op": "ancestors", "class": "C"},
+                    {"op": "methods", "class": "A", "type": "dtor"},
+                ],
+            ) == ["B", ["B", "A"], ["0x20"]]
+
+            with pytest.raises(ValueError):
+                client.query("y", [])
+
+            # A request that isn't a json object doesn't drop the connection.
+            client.f.write(b"[1, 2]\n")
+            client.f.flush()
+            assert "error" in json.loads(client.f.readline())
+            assert client.query("x", [{"op": "class_of", "ea": "0x30"}]) == ["B"]
+    finally:
+        servers[0].shutdown()
+        thread.join()
+
+    assert not socket_path.exists()
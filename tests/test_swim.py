@@ -0,0 +1,94 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import postgame.postgame
+from postgame import swim
+from postgame.postgame import Postgame
+from tests.synthetic_project import (
+    SyntheticProjectSpec,
+    class_traces,
+    generate_project,
+    synthetic_cfg,
+)
+
+
+def test_destructor_deltas():
+    assert swim.destructor_deltas((1, 2)) == [
+        (1, (1, 2), (1,)),
+        (2, (1, 2), (1, 2)),
+    ]
+
+
+def test_constructor_deltas():
+    assert swim.constructor_deltas((1, 2), (3, 4, 5)) == [
+        (3, (1, 2), (1,)),
+        (4, (1, 2), (1, 2)),
+    ]
+
+
+def test_ctor_dtor_method_deltas():
+    # ctor 3 of class (1,) calls 6, dtor 2 of class (1, 2) calls 7.
+    head = [(3, True), (4, True), (4, False), (6, True), (6, False), (3, False)]
+    tail = [(1, True), (2, True), (7, True), (7, False), (2, False), (1, False)]
+
+    assert swim.ctor_dtor_method_deltas((1, 2), (3, 4), head, tail) == [
+        (6, (1, 2), (1,)),
+        (7, (1, 2), (1, 2)),
+    ]
+
+
+def test_compute_deltas_in_pool():
+    groups = [((x, x + 1),) for x in range(swim.GROUPS_PER_SHARD * 2 + 1)]
+    expected = list(swim.compute_deltas(swim.destructor_deltas, groups))
+
+    with ProcessPoolExecutor(2) as pool:
+        assert list(swim.compute_deltas(swim.destructor_deltas, groups, pool)) == (
+            expected
+        )
+
+
+def test_compute_deltas_single_shard_in_process():
+    class NoSubmit(ThreadPoolExecutor):
+        def submit(self, *args: Any, **kwargs: Any) -> Any:
+            raise AssertionError("submitted a single shard")
+
+    groups = [((x, x + 1),) for x in range(swim.GROUPS_PER_SHARD)]
+    with NoSubmit() as pool:
+        assert list(swim.compute_deltas(swim.destructor_deltas, groups, pool)) == (
+            list(swim.compute_deltas(swim.destructor_deltas, groups))
+        )
+
+
+def test_parallel_swim_matches_sequential(tmp_path: Path, monkeypatch):
+    generate_project(SyntheticProjectSpec(roots=4, traces=600, seed=2), tmp_path)
+
+    submitted: list[object] = []
+
+    class CountingExecutor(ProcessPoolExecutor):
+        def submit(self, *args: Any, **kwargs: Any) -> Any:
+            submitted.append(args[0])
+            return super().submit(*args, **kwargs)
+
+    # Shards of a few groups, so each pass is split over the pool.
+    monkeypatch.setattr(swim, "GROUPS_PER_SHARD", 4)
+    monkeypatch.setattr(postgame.postgame, "ProcessPoolExecutor", CountingExecutor)
+
+    results: list[dict[int, set[tuple[int, ...]]]] = []
+    for workers in [1, 2]:
+        cfg = synthetic_cfg(tmp_path)
+        cfg.postgame_workers = workers
+
+        dut = Postgame(cfg)
+        dut.parse_input()
+        dut.split_dynamic_traces()
+        dut.remove_ots_with_no_tail()
+        dut.construct_trie()
+        assert len(dut.trace_groups) > swim.GROUPS_PER_SHARD
+        dut.swim_destructors()
+        dut.swim_constructors()
+        dut.swim_methods_called_in_ctors_and_dtors()
+        results.append(class_traces(dut))
+
+    assert len(submitted) > 3
+    assert results[0] == results[1]
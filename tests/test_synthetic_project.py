@@ -0,0 +1,65 @@
+from pathlib import Path
+
+import evaluation.evaluation
+from evaluation.evaluation_data import EvaluationResults
+from postgame.postgame import Postgame
+from tests.synthetic_project import (
+    SyntheticProjectSpec,
+    generate_project,
+    synthetic_cfg,
+)
+
+SPEC = SyntheticProjectSpec(roots=2, depth=3, fan_out=2, traces=200, seed=1)
+
+
+def test_generate_project(tmp_path: Path):
+    project = generate_project(SPEC, tmp_path)
+
+    for fname in [
+        "base-address",
+        "object-traces",
+        "object-traces-name-map",
+        "blacklisted-methods",
+        "method-candidates",
+        "static-traces",
+        "gt-methods-instrumented",
+        "gt-results.json",
+    ]:
+        assert (tmp_path / fname).exists()
+
+    # 2 roots, each with 1 + 2 + 4 classes
+    assert len(project.classes) == 14
+    assert len(project.analysis_results().structures) == 14
+
+    dut = Postgame(synthetic_cfg(tmp_path))
+    dut.parse_input()
+
+    assert dut.base_offset == SPEC.base_address
+    assert 0 < len(dut.traces) <= SPEC.traces
+    for addr in project.noise_procedures:
+        assert dut.method_store.get_method(addr) is None
+
+
+def test_generate_project_deterministic(tmp_path: Path):
+    generate_project(SPEC, tmp_path / "a")
+    generate_project(SPEC, tmp_path / "b")
+
+    assert (tmp_path / "a" / "object-traces").read_text() == (
+        tmp_path / "b" / "object-traces"
+    ).read_text()
+
+
+def test_synthetic_project_evaluation(tmp_path: Path):
+    project = generate_project(SPEC, tmp_path)
+    cfg = synthetic_cfg(tmp_path)
+
+    Postgame(cfg).main()
+    evaluation.evaluation.main(cfg)
+
+    results = EvaluationResults.model_validate_json(cfg.results_path.read_text())
+
+    ctors = results.result_mapping["Constructors"]
+    dtors = results.result_mapping["Destructors"]
+    assert ctors.true_positives == len(project.classes)
+    assert dtors.true_positives == len(project.classes)
+    assert results.result_mapping["Methods"].false_positives == 0
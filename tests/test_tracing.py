@@ -0,0 +1,56 @@
+import json
+import logging
+from pathlib import Path
+
+import pytest
+
+from postgame import tracing
+from postgame.trie import Trie
+
+
+@pytest.fixture(autouse=True)
+def disable_tracing():
+    yield
+    tracing.configure({})
+
+
+class Unformattable:
+    def __str__(self) -> str:
+        pytest.fail("formatted a discarded event")
+
+
+def test_disabled_by_default():
+    assert not tracing.TRIE.enabled
+    assert not tracing.SWIM.enabled
+
+    # Discarded events aren't formatted.
+    tracing.configure({"trie": "info"})
+    assert tracing.TRIE.enabled
+    tracing.TRIE.debug("x", "%s", Unformattable(), x=Unformattable())
+
+
+def test_trace_to_sink(tmp_path: Path, caplog: pytest.LogCaptureFixture):
+    sink_path = tmp_path / "trace.jsonl"
+    tracing.configure({"trie": "debug"}, sink_path)
+
+    with caplog.at_level(logging.DEBUG):
+        trie = Trie[str]()
+        trie.insert_value([0x10, 0x20], "a")
+        trie.insert_value([0x10, 0x20], "b")
+    tracing.close()
+
+    assert caplog.messages == ["Inserted node with trace ['0x10', '0x20'] into trie"]
+    records = [json.loads(x) for x in sink_path.read_text().splitlines()]
+    assert len(records) == 1
+    assert records[0]["subsystem"] == "trie"
+    assert records[0]["event"] == "insert"
+    assert records[0]["level"] == "DEBUG"
+    assert records[0]["message"] == caplog.messages[0]
+    assert records[0]["trace"] == [0x10, 0x20]
+
+
+def test_configure_errors():
+    with pytest.raises(ValueError):
+        tracing.configure({"nope": "debug"})
+    with pytest.raises(ValueError):
+        tracing.configure({"trie": "loud"})
@@ -0,0 +1,111 @@
+import io
+import json
+import sys
+
+from postgame import trie_export
+from postgame.trie import Node, Trie
+
+
+def example_trie() -> Trie[str]:
+    trie = Trie[str]()
+    trie.insert_value([1], "a")
+    trie.insert_value([1, 2], "b")
+    trie.insert_value([1, 3], "c")
+    trie.insert_value([4], "d")
+    return trie
+
+
+def test_trie():
+    trie = example_trie()
+
+    assert str(trie) == " [0] None\n   [1] a\n     [2] b\n     [3] c\n   [4] d\n"
+    assert trie.values() == [None, "a", "b", "c", "d"]
+    assert trie.keys() == [[0], [1, 1], [1, 2, 2], [1, 3, 3], [4, 4]]
+
+    node = trie.get_node([1, 3])
+    assert node is not None and node.value == "c"
+
+    trie.remove_node([1, 3])
+    assert trie.values() == [None, "a", "b", "d"]
+    trie.insert_node([4, 3], Node(3, "c"))
+    assert trie.values() == [None, "a", "b", "d", "c"]
+
+
+def test_walk():
+    trie = example_trie()
+
+    entries = list(trie.walk())
+    assert [(x.index, x.depth, x.node.value) for x in entries] == [
+        (0, 0, None),
+        (1, 1, "a"),
+        (2, 2, "b"),
+        (3, 2, "c"),
+        (4, 1, "d"),
+    ]
+    assert [x.parent.index if x.parent else None for x in entries] == [
+        None,
+        0,
+        1,
+        1,
+        0,
+    ]
+
+    assert [x.node.value for x in trie.walk(max_depth=1)] == [None, "a", "d"]
+
+
+def test_deep_trie():
+    depth = sys.getrecursionlimit() * 2
+    trie = Trie[int]()
+    trie.insert_value(list(range(1, depth + 1)), depth)
+
+    assert trie.values()[-1] == depth
+    assert len(str(trie).splitlines()) == depth + 1
+    node = trie.get_node(list(range(1, depth + 1)))
+    assert node is not None and node.value == depth
+
+
+def test_write_text():
+    trie = example_trie()
+
+    f = io.StringIO()
+    assert trie_export.write_text(trie, f) == 5
+    assert f.getvalue() == str(trie)
+
+    f = io.StringIO()
+    assert trie_export.write_text(trie, f, max_nodes=2) == 2
+    assert f.getvalue() == " [0] None\n   [1] a\n... truncated after 2 nodes\n"
+
+
+def test_write_jsonl():
+    f = io.StringIO()
+    assert trie_export.write_jsonl(example_trie(), f, max_depth=1) == 3
+
+    records = [json.loads(x) for x in f.getvalue().splitlines()]
+    assert records[1] == {
+        "id": 1,
+        "parent": 0,
+        "depth": 1,
+        "address": "0x1",
+        "value": "a",
+        "children": 2,
+    }
+    assert [x["value"] for x in records] == [None, "a", "d"]
+
+    f = io.StringIO()
+    assert trie_export.write_jsonl(example_trie(), f, max_nodes=4) == 4
+    assert json.loads(f.getvalue().splitlines()[-1]) == {"truncated": 4}
+
+
+def test_write_dot():
+    trie = Trie[str]()
+    trie.insert_value([1], 'say "hi"')
+
+    f = io.StringIO()
+    assert trie_export.write_dot(trie, f) == 2
+    assert f.getvalue() == (
+        "digraph trie {\n"
+        '  n0 [label="0x0"];\n'
+        '  n1 [label="0x1\nsay \\"hi\\""];\n'
+        "  n0 -> n1;\n"
+        "}\n"
+    )